@@ -0,0 +1,106 @@
+# benchmarks/bench_gui_logging.py
+"""
+Mede o tempo total de análise + movimentação com o log da GUI desanexado, com o
+TextWidgetHandler em lotes e com o handler antigo (um after(0, ...) por registro).
+O tempo só termina quando a interface terminou de exibir todas as mensagens.
+
+Requer um display (Tk). Uso: python benchmarks/bench_gui_logging.py [quantidade_de_arquivos]
+"""
+
+import os
+import sys
+import time
+import logging
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import tkinter as tk  # noqa: E402
+from tkinter import scrolledtext  # noqa: E402
+
+from core.organizer_logic import organize_files, execute_moves  # noqa: E402
+from utils.logger_config import TextWidgetHandler  # noqa: E402
+from utils.path_utils import get_resource_path  # noqa: E402
+
+EXTENSOES = [".jpg", ".pdf", ".mp4", ".mp3", ".zip", ".py", ".xyz"]
+
+
+class PerRecordHandler(logging.Handler):
+    """Reprodução do handler original: um after(0, ...) com inserção e rolagem por registro."""
+    def __init__(self, text_widget):
+        super().__init__()
+        self.text_widget = text_widget
+
+    def emit(self, record):
+        self.text_widget.after(0, self._update, self.format(record))
+
+    def _update(self, msg):
+        self.text_widget.config(state='normal')
+        self.text_widget.insert(tk.END, msg + '\n')
+        self.text_widget.see(tk.END)
+        self.text_widget.config(state='disabled')
+
+
+def run(root, text_widget, handler, total):
+    logger = logging.getLogger('files_organizer_py')
+    logger.handlers.clear()
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if handler is not None:
+        logger.addHandler(handler)
+
+    folder = tempfile.mkdtemp()
+    for i in range(total):
+        with open(os.path.join(folder, f"arquivo_{i}{EXTENSOES[i % len(EXTENSOES)]}"), 'w'):
+            pass
+
+    resultado = {}
+
+    def worker():
+        analise = organize_files(folder, get_resource_path('config/categories.json'))
+        execute_moves(analise["planned_moves"])
+        resultado["worker_done"] = time.perf_counter()
+
+    def wait_drained():
+        pendentes = getattr(handler, "_pending", ())
+        if "worker_done" in resultado and not pendentes:
+            resultado["end"] = time.perf_counter()
+            root.quit()
+        else:
+            root.after(10, wait_drained)
+
+    inicio = time.perf_counter()
+    threading.Thread(target=worker, daemon=True).start()
+    root.after(10, wait_drained)
+    root.mainloop()
+    if handler is not None:
+        logger.removeHandler(handler)
+    return resultado["end"] - inicio
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Sem display disponível para o benchmark da GUI: {e}")
+        return
+    text_widget = scrolledtext.ScrolledText(root)
+    text_widget.pack()
+
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    batched = TextWidgetHandler(text_widget)
+    legacy = PerRecordHandler(text_widget)
+    for handler in (batched, legacy):
+        handler.setFormatter(formatter)
+
+    print(f"Arquivos: {total}")
+    print(f"GUI desanexada:          {run(root, text_widget, None, total):.2f}s")
+    print(f"Handler em lotes:        {run(root, text_widget, batched, total):.2f}s")
+    print(f"Handler por registro:    {run(root, text_widget, legacy, total):.2f}s")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# benchmarks/bench_parallel_moves.py
+"""
+Compara execute_moves serial com o modo concorrente (max_workers) em um sistema de arquivos
+de alta latência simulado: cada os.replace espera LATENCIA segundos antes de mover,
+imitando a ida e volta de um compartilhamento SMB/NFS.
+
+Uso: python benchmarks/bench_parallel_moves.py [quantidade_de_arquivos] [latencia_ms] [workers]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import logging
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.organizer_logic import iter_planned_moves, execute_moves  # noqa: E402
+from core.classifier import ExtensionClassifier  # noqa: E402
+
+CATEGORIAS = {"Imagens": [".jpg"], "Documentos": [".pdf"], "Videos": [".mp4"],
+              "Audios": [".mp3"], "Compactados": [".zip"], "Programacao": [".py"], "Outros": []}
+EXTENSOES = [".jpg", ".pdf", ".mp4", ".mp3", ".zip", ".py", ".xyz"]
+
+
+def run(total, latencia, max_workers):
+    with tempfile.TemporaryDirectory() as folder:
+        for i in range(total):
+            # Nomes repetidos entre extensões garantem colisões dentro de cada categoria
+            with open(os.path.join(folder, f"arquivo_{i % (total // 2 or 1)}_{i}{EXTENSOES[i % len(EXTENSOES)]}"), 'w'):
+                pass
+        plano = list(iter_planned_moves(folder, ExtensionClassifier(CATEGORIAS), {}, {}))
+
+        start = time.perf_counter()
+        resultado = execute_moves(plano, max_workers=max_workers)
+        return time.perf_counter() - start, resultado
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 700
+    latencia = (float(sys.argv[2]) if len(sys.argv) > 2 else 5.0) / 1000
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    logging.getLogger('files_organizer_py').disabled = True
+
+    replace_original = os.replace
+
+    def slow_replace(src, dst, *args, **kwargs):
+        time.sleep(latencia)
+        return replace_original(src, dst, *args, **kwargs)
+
+    os.replace = slow_replace
+    try:
+        serial_time, serial = run(total, latencia, None)
+        parallel_time, parallel = run(total, latencia, workers)
+    finally:
+        os.replace = replace_original
+
+    print(f"Arquivos: {total}, latência simulada: {latencia * 1000:.1f} ms/move")
+    print(f"Serial:               {serial['moved']} movidos em {serial_time:.2f}s ({total / serial_time:.0f} arquivos/s)")
+    print(f"Concorrente ({workers} thr): {parallel['moved']} movidos em {parallel_time:.2f}s ({total / parallel_time:.0f} arquivos/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+# benchmarks/bench_pipeline.py
+"""
+Benchmark do pipeline completo do organizador sobre uma pasta sintética (veja dataset.py).
+Mede separadamente cada fase:
+- planning: organize_files (carga da configuração, varredura recursiva e classificação);
+- naming_legacy: get_unique_filename + criação do arquivo, como o código antigo fazia;
+- naming_allocator: NameAllocator.reserve (snapshot em memória + reserva O_EXCL);
+- moving: execute_moves do plano, com ou sem threads.
+Para cada fase: segundos, arquivos/s, chamadas ao sistema feitas pelo código Python
+(os.*, open) e o pico de memória alocada (tracemalloc, que deixa as fases um pouco mais lentas;
+use --no-tracemalloc para tempos puros). O resultado é gravado em JSON para comparar execuções.
+
+Uso: python benchmarks/bench_pipeline.py [--files N] [--duplicates 0.2] [--depth 2] [--tmpfs | --dir PASTA]
+                                         [--threads 8] [--repeat 3] [--output arquivo.json] [--compare antigo.json]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import platform
+import argparse
+import builtins
+import tempfile
+import functools
+import subprocess
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.organizer_logic import organize_files, execute_moves, get_unique_filename, CATEGORIES_CONFIG_PATH  # noqa: E402
+from core.name_allocator import NameAllocator  # noqa: E402
+from dataset import generate_dataset, parse_ext_mix  # noqa: E402
+
+RESULTADOS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+# Funções de os que chegam ao kernel; makedirs/path.exists aparecem pelas chamadas internas a mkdir/stat
+CHAMADAS_OS = ("stat", "lstat", "scandir", "listdir", "open", "close", "read", "write", "mkdir", "rmdir",
+               "rename", "replace", "link", "remove", "unlink", "fsync", "utime", "chmod", "sendfile",
+               "copy_file_range")
+
+
+class SyscallCounter:
+    """
+    Substitui temporariamente as funções de os (e o open embutido) por versões que contam as chamadas.
+    Conta apenas chamadas feitas pelo código Python: DirEntry.stat e as chamadas internas de C
+    (ex: o os.stat em cache do scandir) não aparecem.
+    """
+    def __init__(self):
+        self.counts = {}
+        self._originais = []
+
+    def _wrap(self, modulo, nome, rotulo):
+        original = getattr(modulo, nome, None)
+        if original is None:
+            return
+        counts = self.counts
+
+        @functools.wraps(original)
+        def contando(*args, **kwargs):
+            counts[rotulo] = counts.get(rotulo, 0) + 1
+            return original(*args, **kwargs)
+
+        self._originais.append((modulo, nome, original))
+        setattr(modulo, nome, contando)
+
+    def __enter__(self):
+        for nome in CHAMADAS_OS:
+            self._wrap(os, nome, nome)
+        self._wrap(builtins, "open", "open")
+        return self
+
+    def __exit__(self, *exc):
+        for modulo, nome, original in reversed(self._originais):
+            setattr(modulo, nome, original)
+        self._originais = []
+        return False
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+
+def measure(fase, arquivos, funcao, usar_tracemalloc):
+    """Executa 'funcao' contando chamadas ao sistema e memória; retorna (resultado, métricas da fase)."""
+    if usar_tracemalloc:
+        tracemalloc.start()
+    with SyscallCounter() as contador:
+        inicio = time.perf_counter()
+        resultado = funcao()
+        segundos = time.perf_counter() - inicio
+    pico = None
+    if usar_tracemalloc:
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    metricas = {"seconds": round(segundos, 6), "files": arquivos,
+                "files_per_second": round(arquivos / segundos, 1) if segundos else None,
+                "syscalls": contador.total, "syscalls_per_file": round(contador.total / arquivos, 2) if arquivos else None,
+                "syscalls_by_call": dict(sorted(contador.counts.items())), "peak_memory_bytes": pico}
+    return resultado, metricas
+
+
+def _naming_legacy(plano, destino_raiz):
+    """Resolve nomes como o código antigo: sonda o disco até achar um nome livre e o ocupa."""
+    for indice in range(len(plano)):
+        pasta = os.path.join(destino_raiz, plano.category(indice))
+        os.makedirs(pasta, exist_ok=True)
+        nome = get_unique_filename(pasta, plano.name(indice))
+        with open(os.path.join(pasta, nome), 'wb'):
+            pass
+
+
+def _naming_allocator(plano, destino_raiz):
+    alocadores = {}
+    for indice in range(len(plano)):
+        categoria = plano.category(indice)
+        alocador = alocadores.get(categoria)
+        if alocador is None:
+            alocador = alocadores[categoria] = NameAllocator(os.path.join(destino_raiz, categoria))
+        alocador.reserve(plano.name(indice))
+
+
+def run_once(args, base):
+    """Gera a pasta sintética em 'base', executa as fases e retorna as métricas desta execução."""
+    raiz = os.path.join(base, "origem")
+    manifesto = generate_dataset(raiz, args.files, args.ext_mix, args.duplicates, args.depth, args.fanout,
+                                 args.size, args.seed)
+    fases = {}
+    resultado, fases["planning"] = measure("planning", args.files,
+                                           lambda: organize_files(raiz, CATEGORIES_CONFIG_PATH, recursive=True),
+                                           args.tracemalloc)
+    if resultado["status"] != "planned":
+        raise RuntimeError(f"organize_files retornou '{resultado['status']}': {resultado.get('message')}")
+    plano = resultado["planned_moves"]
+    total = len(plano)
+    fases["planning"]["planned"] = total
+
+    _, fases["naming_legacy"] = measure("naming_legacy", total,
+                                        lambda: _naming_legacy(plano, os.path.join(base, "nomes_antigo")),
+                                        args.tracemalloc)
+    _, fases["naming_allocator"] = measure("naming_allocator", total,
+                                           lambda: _naming_allocator(plano, os.path.join(base, "nomes_alocador")),
+                                           args.tracemalloc)
+    execucao, fases["moving"] = measure("moving", total,
+                                        lambda: execute_moves(plano, max_workers=args.threads),
+                                        args.tracemalloc)
+    fases["moving"].update(moved=execucao["moved"], errors=execucao["errors"])
+    plano.close()
+    return {"dataset": manifesto, "phases": fases}
+
+
+def summarize(execucoes):
+    """Melhor execução (menor tempo) de cada fase entre as repetições."""
+    resumo = {}
+    for execucao in execucoes:
+        for fase, metricas in execucao["phases"].items():
+            if fase not in resumo or metricas["seconds"] < resumo[fase]["seconds"]:
+                resumo[fase] = metricas
+    return resumo
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_report(resumo, anterior=None):
+    print(f"{'Fase':<18}{'Segundos':>10}{'Arquivos/s':>12}{'Syscalls/arq.':>15}{'Pico de memória':>17}"
+          + (f"{'vs. anterior':>14}" if anterior else ""))
+    for fase, metricas in resumo.items():
+        pico = f"{metricas['peak_memory_bytes'] / 1e6:.1f} MB" if metricas["peak_memory_bytes"] is not None else "-"
+        linha = (f"{fase:<18}{metricas['seconds']:>10.3f}{metricas['files_per_second'] or 0:>12.0f}"
+                 f"{metricas['syscalls_per_file'] or 0:>15.2f}{pico:>17}")
+        if anterior:
+            antes = anterior.get(fase)
+            if antes and antes.get("files_per_second") and metricas["files_per_second"]:
+                linha += f"{metricas['files_per_second'] / antes['files_per_second']:>13.2f}x"
+        print(linha)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline do organizador (planejar, nomear, mover).")
+    parser.add_argument("--files", type=int, default=10000, help="Quantidade de arquivos (padrão: 10000).")
+    parser.add_argument("--ext-mix", type=parse_ext_mix, default=None,
+                        help="Pesos das extensões, ex: 'jpg=30,pdf=20,xyz=5' (padrão: mistura de Downloads).")
+    parser.add_argument("--duplicates", type=float, default=0.2,
+                        help="Fração de arquivos com nome repetido em outra pasta (padrão: 0.2).")
+    parser.add_argument("--depth", type=int, default=2, help="Níveis de subpastas (padrão: 2).")
+    parser.add_argument("--fanout", type=int, default=4, help="Subpastas por pasta em cada nível (padrão: 4).")
+    parser.add_argument("--size", type=int, default=1024, help="Tamanho médio dos arquivos em bytes (padrão: 1024).")
+    parser.add_argument("--seed", type=int, default=0, help="Semente do gerador (padrão: 0).")
+    parser.add_argument("--threads", type=int, default=None, help="max_workers de execute_moves (padrão: serial).")
+    parser.add_argument("--repeat", type=int, default=1, help="Repetições; o resumo usa a melhor de cada fase.")
+    local = parser.add_mutually_exclusive_group()
+    local.add_argument("--tmpfs", action="store_true", help="Gera a pasta em /dev/shm (memória).")
+    local.add_argument("--dir", default=None, help="Pasta onde gerar os dados (padrão: diretório temporário do sistema).")
+    parser.add_argument("--no-tracemalloc", dest="tracemalloc", action="store_false",
+                        help="Não mede o pico de memória (tempos sem a sobrecarga do tracemalloc).")
+    parser.add_argument("--output", default=None,
+                        help="Arquivo JSON de saída (padrão: benchmarks/results/pipeline_<data>.json; '-' = só na tela).")
+    parser.add_argument("--compare", default=None, help="JSON de uma execução anterior para comparar arquivos/s.")
+    parser.add_argument("--keep", action="store_true", help="Mantém a pasta gerada ao final.")
+    args = parser.parse_args(argv)
+    logging.getLogger('files_organizer_py').disabled = True
+
+    if args.tmpfs:
+        if not os.path.isdir("/dev/shm"):
+            parser.error("/dev/shm não existe neste sistema; use --dir.")
+        local_dados = "/dev/shm"
+    else:
+        local_dados = args.dir or tempfile.gettempdir()
+
+    execucoes = []
+    for repeticao in range(args.repeat):
+        base = tempfile.mkdtemp(prefix="organizer_bench_", dir=local_dados)
+        try:
+            execucoes.append(run_once(args, base))
+        finally:
+            if args.keep:
+                print(f"Dados mantidos em: {base}")
+            else:
+                shutil.rmtree(base, ignore_errors=True)
+
+    resumo = summarize(execucoes)
+    relatorio = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "storage": "tmpfs" if args.tmpfs else local_dados,
+        "parameters": {"files": args.files, "ext_mix": args.ext_mix, "duplicates": args.duplicates,
+                       "depth": args.depth, "fanout": args.fanout, "size": args.size, "seed": args.seed,
+                       "threads": args.threads, "repeat": args.repeat, "tracemalloc": args.tracemalloc},
+        "summary": resumo,
+        "runs": execucoes,
+    }
+    try:
+        import resource
+        # ru_maxrss é em KB no Linux e em bytes no macOS
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        relatorio["max_rss_bytes"] = maxrss if sys.platform == "darwin" else maxrss * 1024
+    except ImportError:
+        pass # Windows
+
+    anterior = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            anterior = json.load(f).get("summary")
+
+    print(f"Arquivos: {args.files}, repetidos: {args.duplicates:.0%}, profundidade: {args.depth}, "
+          f"dados em: {relatorio['storage']}")
+    print_report(resumo, anterior)
+
+    if args.output != "-":
+        saida = args.output or os.path.join(RESULTADOS_DIR, f"pipeline_{datetime.now():%Y%m%d_%H%M%S}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+        with open(saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, indent=2, ensure_ascii=False)
+        print(f"Resultado gravado em: {saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_plan_memory.py
+"""
+Compara a memória de um plano de movimentos no formato antigo (lista de dicionários, com os
+caminhos completos de origem e destino em cada entrada) com o Plan em colunas compactas,
+em memória e com a coluna de nomes transferida para disco (spill).
+Não toca no disco além do arquivo temporário do spill: os caminhos são sintéticos.
+
+Uso: python benchmarks/bench_plan_memory.py [quantidade_de_movimentos]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.plan import Plan  # noqa: E402
+
+RAIZ = os.path.join(os.sep, "home", "usuario", "Downloads")
+CATEGORIAS = ["Imagens", "Documentos", "Videos", "Audios", "Compactados", "Programacao", "Outros"]
+EXTENSOES = [".jpg", ".pdf", ".mp4", ".mp3", ".zip", ".py", ".xyz"]
+
+
+def synthetic_moves(total):
+    """Gera (nome, origem, categoria) de 'total' arquivos espalhados em 50 subpastas."""
+    for i in range(total):
+        nome = f"arquivo_{i:09d}{EXTENSOES[i % len(EXTENSOES)]}"
+        origem = os.path.join(RAIZ, f"pasta_{i % 50:02d}", nome)
+        yield nome, origem, CATEGORIAS[i % len(CATEGORIAS)]
+
+
+def build_dicts(total):
+    return [{"arquivo": nome, "origem": origem, "destino_pasta": os.path.join(RAIZ, categoria),
+             "destino_nome_curto": categoria}
+            for nome, origem, categoria in synthetic_moves(total)]
+
+
+def build_plan(total, spill):
+    plano = Plan(spill_bytes=0 if spill else None)
+    destinos = {categoria: os.path.join(RAIZ, categoria) for categoria in CATEGORIAS}
+    for _, origem, categoria in synthetic_moves(total):
+        plano.add(origem, destinos[categoria], categoria)
+    return plano
+
+
+def measure(builder):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    plano = builder()
+    segundos = time.perf_counter() - inicio
+    atual, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Percorre o plano como execute_moves (acessores por índice) para medir o custo de leitura
+    inicio = time.perf_counter()
+    if isinstance(plano, Plan):
+        for i in range(len(plano)):
+            plano.source_path(i)
+            plano.destination_folder(i)
+    else:
+        for movimento in plano:
+            movimento["origem"]
+            movimento["destino_pasta"]
+    leitura = time.perf_counter() - inicio
+    return plano, atual, pico, segundos, leitura
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Movimentos: {total}")
+    print(f"{'Formato':<24}{'Memória':>12}{'Pico':>12}{'Bytes/mov.':>12}{'Montagem':>11}{'Leitura':>10}")
+    for rotulo, builder in (("lista de dicionários", lambda: build_dicts(total)),
+                            ("Plan (memória)", lambda: build_plan(total, spill=False)),
+                            ("Plan (spill em disco)", lambda: build_plan(total, spill=True))):
+        plano, atual, pico, segundos, leitura = measure(builder)
+        print(f"{rotulo:<24}{atual / 1e6:>10.1f}MB{pico / 1e6:>10.1f}MB{atual / total:>12.1f}"
+              f"{segundos:>10.2f}s{leitura:>9.2f}s")
+        if isinstance(plano, Plan):
+            plano.close()
+        del plano
+
+
+if __name__ == "__main__":
+    main()
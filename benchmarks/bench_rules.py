@@ -0,0 +1,121 @@
+# benchmarks/bench_rules.py
+"""
+Mede o custo por arquivo da classificação com centenas de regras (core.rules.RuleClassifier),
+comparando com uma avaliação ingênua que testa todas as regras em sequência (fnmatch/re a
+cada arquivo e stat sempre). Também conta quantas vezes o stat foi consultado.
+Não toca no disco: nomes e stat são sintéticos.
+
+Uso: python benchmarks/bench_rules.py [quantidade_de_arquivos] [quantidades_de_regras]
+     ex: python benchmarks/bench_rules.py 100000 0,10,100,500
+"""
+
+import os
+import re
+import sys
+import time
+import fnmatch
+import logging
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.classifier import ExtensionClassifier  # noqa: E402
+from core.rules import RuleClassifier, parse_size  # noqa: E402
+
+CATEGORIAS = {"Imagens": [".jpg", ".png"], "Documentos": [".pdf", ".txt"], "Videos": [".mp4"],
+              "Audios": [".mp3"], "Compactados": [".zip"], "Outros": []}
+EXTENSOES = [".jpg", ".png", ".pdf", ".txt", ".mp4", ".mp3", ".zip", ".bin"]
+AGORA = time.time()
+
+
+class FakeStat:
+    __slots__ = ("st_size", "st_mtime")
+
+    def __init__(self, i):
+        self.st_size = (i * 7919) % (4 * 1024 ** 3)
+        self.st_mtime = AGORA - (i % 400) * 86400
+
+
+def synthetic_rules(total):
+    """Mistura de regras de glob, regex, extensão, tamanho e idade; poucas casam com cada arquivo."""
+    regras = []
+    for i in range(total):
+        tipo = i % 5
+        if tipo == 0:
+            regras.append({"glob": f"projeto_{i}_*.pdf", "destination": f"Projetos/{i}"})
+        elif tipo == 1:
+            regras.append({"regex": rf"^cliente{i}[-_]", "destination": f"Clientes/{i}"})
+        elif tipo == 2:
+            regras.append({"category": "Videos", "min_size": f"{(i % 4) + 1}GB", "destination": "Arquivo/Grandes"})
+        elif tipo == 3:
+            regras.append({"extensions": [".zip"], "older_than_days": 300 + i, "destination": "Antigos/{mtime:%Y}"})
+        else:
+            regras.append({"glob": [f"*_{i}.tmp", f"backup_{i}_*"], "destination": f"Lixo/{i}"})
+    return regras
+
+
+class NaiveRules:
+    """Avaliação direta, sem compilação: cada regra é testada por inteiro para cada arquivo."""
+    def __init__(self, categorias, regras):
+        self.extensoes = ExtensionClassifier(categorias)
+        self.regras = regras
+
+    def classify(self, nome, stat):
+        base = self.extensoes.classify(nome)
+        st = stat()
+        for regra in self.regras:
+            if "category" in regra and regra["category"] != base:
+                continue
+            if "extensions" in regra and not any(nome.lower().endswith(e) for e in regra["extensions"]):
+                continue
+            globs = regra.get("glob")
+            if globs is not None:
+                globs = [globs] if isinstance(globs, str) else globs
+                if not any(fnmatch.fnmatch(nome.lower(), g.lower()) for g in globs):
+                    continue
+            if "regex" in regra and not re.search(regra["regex"], nome):
+                continue
+            if "min_size" in regra and st.st_size < parse_size(regra["min_size"]):
+                continue
+            if "older_than_days" in regra and AGORA - st.st_mtime < regra["older_than_days"] * 86400:
+                continue
+            return regra["destination"]
+        return base
+
+
+def run(classifier, nomes, stats):
+    chamadas = [0]
+
+    def stat_de(i):
+        def stat():
+            chamadas[0] += 1
+            return stats[i]
+        return stat
+
+    inicio = time.perf_counter()
+    for i, nome in enumerate(nomes):
+        classifier.classify(nome, stat_de(i))
+    return (time.perf_counter() - inicio) / len(nomes) * 1e9, chamadas[0]
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    quantidades = [int(q) for q in (sys.argv[2] if len(sys.argv) > 2 else "0,10,100,500").split(",")]
+    logging.getLogger('files_organizer_py').disabled = True
+
+    nomes = [f"arquivo_{i}{EXTENSOES[i % len(EXTENSOES)]}" for i in range(total)]
+    stats = [FakeStat(i) for i in range(total)]
+    print(f"Arquivos: {total}")
+    print(f"{'Regras':>7}{'Compilado ns/arq.':>20}{'stat':>9}{'Ingênuo ns/arq.':>18}{'stat':>9}")
+    for quantidade in quantidades:
+        regras = synthetic_rules(quantidade)
+        compilado = RuleClassifier(CATEGORIAS, regras) if regras else ExtensionClassifier(CATEGORIAS)
+        ns_compilado, stat_compilado = run(compilado, nomes, stats)
+        # A avaliação ingênua é lenta: usa uma amostra com muitas regras
+        amostra = max(1000, total // max(1, quantidade // 10))
+        ns_ingenuo, stat_ingenuo = run(NaiveRules(CATEGORIAS, regras), nomes[:amostra], stats)
+        print(f"{quantidade:>7}{ns_compilado:>20.0f}{stat_compilado:>9}{ns_ingenuo:>18.0f}"
+              f"{stat_ingenuo * total // amostra:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# benchmarks/bench_scan.py
+"""
+Compara o planejamento antigo (os.listdir + isdir/isfile) com o scanner baseado em os.scandir.
+Conta as chamadas a os.stat e a DirEntry.stat feitas pelo código Python e mede o tempo de cada
+abordagem, com e sem o registro dos tamanhos no plano (record_sizes).
+
+Uso: python benchmarks/bench_scan.py [quantidade_de_arquivos]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import logging
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import core.organizer_logic  # noqa: E402
+from core.organizer_logic import iter_planned_moves  # noqa: E402
+from core.classifier import ExtensionClassifier  # noqa: E402
+
+EXTENSOES = [".jpg", ".pdf", ".mp4", ".mp3", ".zip", ".py", ".xyz"]
+
+
+class _CountingEntry:
+    """Envolve um os.DirEntry (cujo stat não pode ser substituído) para contar as chamadas a stat()."""
+    __slots__ = ("_entry", "_counter")
+
+    def __init__(self, entry, counter):
+        self._entry = entry
+        self._counter = counter
+
+    def stat(self, *args, **kwargs):
+        self._counter.count += 1
+        return self._entry.stat(*args, **kwargs)
+
+    def __getattr__(self, nome):
+        return getattr(self._entry, nome)
+
+
+class StatCounter:
+    """
+    Substitui os.stat e o walk_directory usado pelo planejamento temporariamente para contar
+    as chamadas a os.stat e a DirEntry.stat. DirEntry.stat faz a chamada de sistema só na primeira
+    vez (no Windows, em geral nunca), então a contagem é um limite superior das chamadas de sistema.
+    """
+    def __init__(self):
+        self.count = 0
+        self._original = os.stat
+        self._walk_original = core.organizer_logic.walk_directory
+
+    def __enter__(self):
+        def counting_stat(*args, **kwargs):
+            self.count += 1
+            return self._original(*args, **kwargs)
+
+        def counting_walk(*args, **kwargs):
+            for entry, tipo, profundidade in self._walk_original(*args, **kwargs):
+                yield _CountingEntry(entry, self), tipo, profundidade
+
+        os.stat = counting_stat
+        core.organizer_logic.walk_directory = counting_walk
+        return self
+
+    def __exit__(self, *exc):
+        os.stat = self._original
+        core.organizer_logic.walk_directory = self._walk_original
+
+
+def legacy_plan(source_folder, categorias):
+    """Reproduz o laço original de organize_files (listdir + isdir + isfile)."""
+    planejados = []
+    for nome_item in os.listdir(source_folder):
+        caminho = os.path.join(source_folder, nome_item)
+        if os.path.isdir(caminho):
+            continue
+        if os.path.isfile(caminho):
+            _, extensao = os.path.splitext(nome_item)
+            destino = "Outros"
+            for categoria, extensoes in categorias.items():
+                if extensao.lower() in extensoes:
+                    destino = categoria
+                    break
+            planejados.append((nome_item, destino))
+    return planejados
+
+
+def create_dataset(folder, total):
+    for i in range(total):
+        with open(os.path.join(folder, f"arquivo_{i}{EXTENSOES[i % len(EXTENSOES)]}"), 'w'):
+            pass
+    os.makedirs(os.path.join(folder, "subpasta"), exist_ok=True)
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    logging.getLogger('files_organizer_py').disabled = True
+    categorias = {"Imagens": [".jpg"], "Documentos": [".pdf"], "Videos": [".mp4"],
+                  "Audios": [".mp3"], "Compactados": [".zip"], "Programacao": [".py"], "Outros": []}
+
+    with tempfile.TemporaryDirectory() as folder:
+        create_dataset(folder, total)
+
+        with StatCounter() as counter:
+            start = time.perf_counter()
+            legacy = legacy_plan(folder, categorias)
+            legacy_time = time.perf_counter() - start
+        legacy_stats = counter.count
+
+        resultados = []
+        for record_sizes in (False, True):
+            with StatCounter() as counter:
+                start = time.perf_counter()
+                novos = list(iter_planned_moves(folder, ExtensionClassifier(categorias), {}, {},
+                                                record_sizes=record_sizes))
+                resultados.append((len(novos), counter.count, time.perf_counter() - start))
+
+    print(f"Arquivos: {total}")
+    print(f"listdir + isdir/isfile:         {len(legacy)} planejados, {legacy_stats} chamadas stat, {legacy_time:.3f}s")
+    for rotulo, (planejados, chamadas, segundos) in zip(("scandir (DirEntry):", "scandir + record_sizes:"), resultados):
+        print(f"{rotulo:<31} {planejados} planejados, {chamadas} chamadas stat, {segundos:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# benchmarks/bench_startup.py
+"""
+Mede o tempo de inicialização em processos novos (sem módulos em cache na memória do Python):
+- o tempo de importação de cada ponto de entrada (python -X importtime), com os módulos mais caros;
+- o tempo até a janela da GUI ficar pronta (Tk criado, janela desenhada), se houver display.
+Cada medida é comparada com um orçamento (ORCAMENTO_MS); o script termina com código 1 se
+alguma mediana passar do orçamento, para ser usado em verificações automáticas.
+
+Uso: python benchmarks/bench_startup.py [--runs 7] [--json]
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Orçamento de inicialização (mediana, em milissegundos)
+ORCAMENTO_MS = {
+    "import core.organizer_logic": 50,
+    "import cli": 75,
+    "import gui_app": 45,
+    "janela da GUI": 300,
+}
+
+# Cria a janela e mede até o primeiro ciclo ocioso, quando ela já foi desenhada (antes da inicialização adiada)
+_SCRIPT_JANELA = """
+import sys, time
+inicio = time.perf_counter()
+sys.path.insert(0, {src!r})
+import tkinter as tk
+try:
+    root = tk.Tk()
+except tk.TclError:
+    print("sem-display")
+    sys.exit(0)
+import gui_app
+app = gui_app.FileOrganizerApp(root)
+def pronto():
+    print(time.perf_counter() - inicio)
+    root.destroy()
+root.after_idle(pronto)
+root.mainloop()
+"""
+
+
+def import_time(modulo):
+    """Importa 'modulo' em um processo novo; retorna (ms cumulativos, [(ms, módulo)] dos mais caros)."""
+    processo = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                               f"import sys; sys.path.insert(0, {SRC_DIR!r}); import {modulo}"],
+                              capture_output=True, text=True, check=True)
+    total = None
+    modulos = []
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "|" not in linha:
+            continue
+        _, cumulativo, nome = linha[len("import time:"):].split("|")
+        try:
+            microssegundos = int(cumulativo)
+        except ValueError:
+            continue # Cabeçalho
+        modulos.append((microssegundos / 1000, nome.strip()))
+        if nome.strip() == modulo:
+            total = microssegundos / 1000
+    return total, sorted(modulos, reverse=True)
+
+
+def window_time():
+    processo = subprocess.run([sys.executable, "-c", _SCRIPT_JANELA.format(src=SRC_DIR)],
+                              capture_output=True, text=True, check=True, cwd=SRC_DIR)
+    saida = processo.stdout.strip().splitlines()
+    if not saida or saida[-1] == "sem-display":
+        return None
+    return float(saida[-1]) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede a inicialização da GUI e do núcleo e compara com o orçamento.")
+    parser.add_argument("--runs", type=int, default=7, help="Processos por medida (padrão: 7); usa a mediana.")
+    parser.add_argument("--json", action="store_true", help="Imprime o resultado em JSON.")
+    args = parser.parse_args(argv)
+
+    resultados = {}
+    for modulo in ("core.organizer_logic", "cli", "gui_app"):
+        medidas = [import_time(modulo) for _ in range(args.runs)]
+        tempos = [total for total, _ in medidas]
+        resultados[f"import {modulo}"] = {"median_ms": statistics.median(tempos),
+                                          "slowest_imports": [{"module": nome, "ms": ms}
+                                                              for ms, nome in medidas[-1][1][1:6]]}
+    janela = [window_time() for _ in range(args.runs)]
+    if None not in janela:
+        resultados["janela da GUI"] = {"median_ms": statistics.median(janela)}
+
+    estourou = False
+    for nome, resultado in resultados.items():
+        resultado["budget_ms"] = ORCAMENTO_MS[nome]
+        resultado["ok"] = resultado["median_ms"] <= ORCAMENTO_MS[nome]
+        estourou |= not resultado["ok"]
+
+    if args.json:
+        print(json.dumps(resultados, indent=2, ensure_ascii=False))
+    else:
+        for nome, resultado in resultados.items():
+            print(f"{nome:<28}{resultado['median_ms']:>8.1f} ms  (orçamento {resultado['budget_ms']} ms)"
+                  f"  {'ok' if resultado['ok'] else 'ACIMA DO ORÇAMENTO'}")
+            for item in resultado.get("slowest_imports", []):
+                print(f"    {item['ms']:>8.1f} ms  {item['module']}")
+        if "janela da GUI" not in resultados:
+            print("janela da GUI: sem display disponível, medida ignorada.")
+    return 1 if estourou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
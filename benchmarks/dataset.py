@@ -0,0 +1,118 @@
+# benchmarks/dataset.py
+"""
+Gerador de pastas sintéticas para os benchmarks: quantidade de arquivos, mistura de
+extensões, proporção de nomes repetidos e profundidade de subpastas configuráveis.
+Os arquivos são criados de verdade (em tmpfs ou em disco), com conteúdo pseudoaleatório.
+
+Uso: python benchmarks/dataset.py PASTA [--files N] [--ext-mix jpg=30,pdf=20] [--duplicates 0.2]
+                                        [--depth 2] [--fanout 4] [--size 1024] [--seed 0]
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+
+# Mistura padrão, aproximando uma pasta de Downloads
+EXT_MIX_PADRAO = {".jpg": 25, ".png": 10, ".pdf": 15, ".docx": 5, ".txt": 5, ".mp4": 5, ".mp3": 5,
+                  ".zip": 8, ".py": 5, ".json": 2, ".xyz": 10, "": 5}
+
+
+def parse_ext_mix(texto):
+    """Converte 'jpg=30,pdf=20,=5' em {'.jpg': 30, '.pdf': 20, '': 5} (vazio = sem extensão)."""
+    mistura = {}
+    for item in texto.split(','):
+        extensao, _, peso = item.strip().partition('=')
+        extensao = extensao.strip()
+        if extensao and not extensao.startswith('.'):
+            extensao = '.' + extensao
+        try:
+            mistura[extensao.lower()] = float(peso) if peso else 1.0
+        except ValueError:
+            raise ValueError(f"peso inválido em '{item}'")
+    if not mistura or sum(mistura.values()) <= 0:
+        raise ValueError("a mistura de extensões precisa de pelo menos um peso positivo")
+    return mistura
+
+
+def _subfolders(raiz, depth, fanout):
+    """Todas as pastas da árvore (a raiz e as subpastas até 'depth' níveis, 'fanout' por nível)."""
+    pastas = [raiz]
+    nivel = [raiz]
+    for profundidade in range(1, depth + 1):
+        proximo = []
+        for pasta in nivel:
+            for i in range(fanout):
+                proximo.append(os.path.join(pasta, f"sub_{profundidade}_{i}"))
+        pastas.extend(proximo)
+        nivel = proximo
+    return pastas
+
+
+def generate_dataset(raiz, files=1000, ext_mix=None, duplicates=0.0, depth=0, fanout=4, size=1024, seed=0):
+    """
+    Cria 'files' arquivos em 'raiz', distribuídos entre a raiz e as subpastas.
+    Uma fração 'duplicates' dos arquivos reutiliza o nome de outro arquivo (em outra pasta),
+    gerando colisões de nome no destino; sem subpastas, só há nomes únicos.
+    O tamanho de cada arquivo varia entre 0 e 2 * 'size' bytes.
+    Retorna o manifesto (parâmetros e totais), o mesmo gravado pela linha de comando.
+    """
+    gerador = random.Random(seed)
+    mistura = ext_mix or EXT_MIX_PADRAO
+    extensoes = list(mistura)
+    pesos = [mistura[extensao] for extensao in extensoes]
+    pastas = _subfolders(raiz, depth, fanout)
+    for pasta in pastas:
+        os.makedirs(pasta, exist_ok=True)
+
+    usados = [set() for _ in pastas] # Nomes de cada pasta, para que repetições caiam em pastas diferentes
+    nomes_gerados = []
+    total_bytes = 0
+    repetidos = 0
+    bloco = gerador.randbytes(max(1, 2 * size)) if size else b''
+    for i in range(files):
+        indice_pasta = gerador.randrange(len(pastas))
+        nome = None
+        if nomes_gerados and len(pastas) > 1 and gerador.random() < duplicates:
+            candidato = gerador.choice(nomes_gerados)
+            if candidato not in usados[indice_pasta]:
+                nome = candidato
+                repetidos += 1
+        if nome is None:
+            extensao = gerador.choices(extensoes, pesos)[0]
+            nome = f"arquivo_{i:08d}{extensao}"
+            nomes_gerados.append(nome)
+        usados[indice_pasta].add(nome)
+        tamanho = gerador.randint(0, 2 * size) if size else 0
+        with open(os.path.join(pastas[indice_pasta], nome), 'wb') as f:
+            f.write(bloco[:tamanho])
+        total_bytes += tamanho
+
+    return {"root": raiz, "files": files, "bytes": total_bytes, "duplicate_names": repetidos,
+            "folders": len(pastas), "depth": depth, "fanout": fanout, "size": size, "seed": seed,
+            "ext_mix": mistura, "duplicates": duplicates}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera uma pasta sintética para os benchmarks do organizador.")
+    parser.add_argument("pasta", help="Pasta a ser criada (ex: /dev/shm/organizer_bench para tmpfs).")
+    parser.add_argument("--files", type=int, default=1000, help="Quantidade de arquivos (padrão: 1000).")
+    parser.add_argument("--ext-mix", type=parse_ext_mix, default=None,
+                        help="Pesos das extensões, ex: 'jpg=30,pdf=20,xyz=5,=2' (vazio = sem extensão).")
+    parser.add_argument("--duplicates", type=float, default=0.0,
+                        help="Fração de arquivos com nome repetido em outra pasta (0 a 1).")
+    parser.add_argument("--depth", type=int, default=0, help="Níveis de subpastas (padrão: 0).")
+    parser.add_argument("--fanout", type=int, default=4, help="Subpastas por pasta em cada nível (padrão: 4).")
+    parser.add_argument("--size", type=int, default=1024, help="Tamanho médio dos arquivos em bytes (padrão: 1024).")
+    parser.add_argument("--seed", type=int, default=0, help="Semente do gerador (padrão: 0).")
+    args = parser.parse_args(argv)
+
+    manifesto = generate_dataset(args.pasta, args.files, args.ext_mix, args.duplicates, args.depth,
+                                 args.fanout, args.size, args.seed)
+    json.dump(manifesto, sys.stdout, indent=2, ensure_ascii=False)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+# src/cli.py
+
+"""
+Interface de linha de comando (sem GUI) do File Organizer Py.
+
+Exemplos:
+    python src/cli.py ~/Downloads ~/Desktop --dry-run
+    python src/cli.py /srv/inbox/* --yes --jobs 4 --threads 8
+    python src/cli.py ~/Downloads --watch --yes
+    python src/cli.py ~/Downloads --undo
+    python src/cli.py ~/Downloads --yes --profile
+
+Importa apenas o núcleo (core/ e utils/), sem tkinter, para iniciar rápido em servidores.
+O resumo (movidos/erros/ignorados por pasta) é emitido em JSON no stdout; os logs vão para stderr.
+"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+from datetime import datetime
+
+from core.organizer_logic import organize_files, execute_moves, CATEGORIES_CONFIG_PATH, JOURNAL_DIR
+from core.journal import MoveJournal, list_journals, recover_interrupted, undo_journal
+# core.dedup, core.scheduling e core.metrics são importados apenas quando a opção correspondente é usada
+from utils.logger_config import setup_logging
+from utils.path_utils import get_resource_path
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HASH_CACHE_PATH = get_resource_path('config/hash_cache.sqlite3')
+SCAN_CACHE_PATH = get_resource_path('config/scan_cache.sqlite3') # O mesmo da GUI
+PROFILE_DIR = os.path.join(BASE_DIR, '..', 'logs') # Perfis do cProfile (--profile), junto dos logs
+
+
+def _init_worker(console_level, json_log):
+    """
+    Configura o logging em cada processo filho. Mesmo com fork a configuração herdada não serve:
+    a thread do QueueListener do processo pai não existe no filho.
+    """
+    setup_logging(BASE_DIR, console_stream=sys.stderr, console_level=console_level, json_log=json_log)
+
+
+def organize_folder(folder, options, analise=None):
+    """
+    Analisa (e, se não for simulação, organiza) uma pasta. Executado em um processo do pool.
+    Retorna um resumo serializável em JSON.
+    Com 'analise' (o resultado de organize_files já confirmado pelo usuário), a pasta não é
+    analisada de novo: o plano confirmado é executado. Com a opção "keep_plan", o resultado
+    da análise é devolvido na chave "analysis" do resumo (retirada antes da saída em JSON).
+    Com a opção "profile", a pasta é organizada sob o cProfile e com métricas por fase
+    (core.metrics.RunMetrics): o relatório vai para o stderr, o perfil para logs/*.prof
+    e as métricas para a chave "profile" do resumo.
+    """
+    resumo = {"folder": folder, "status": None, "planned": 0, "moved": 0, "errors": 0, "ignored": 0, "duplicates": 0}
+    if not options.get("profile"):
+        return _organize_folder(folder, options, resumo, None, analise)
+
+    import cProfile # Importados só quando necessário
+    import pstats
+    from core.metrics import RunMetrics
+    metrics = RunMetrics()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return _organize_folder(folder, options, resumo, metrics, analise)
+    finally:
+        profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        caminho = os.path.join(PROFILE_DIR, f"profile_{os.path.basename(folder) or 'raiz'}_"
+                                            f"{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}.prof")
+        profiler.dump_stats(caminho)
+        resumo["profile"] = dict(metrics.summary(), pstats=os.path.normpath(caminho))
+        print(f"\n=== Perfil de '{folder}' ===\n{metrics.report()}", file=sys.stderr)
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(20)
+        print(f"Perfil completo em: {os.path.normpath(caminho)}", file=sys.stderr)
+
+
+def _organize_folder(folder, options, resumo, metrics, analise):
+    if analise is None:
+        hash_cache = None
+        if options["dedup"]:
+            from core.dedup import HashCache # Importado só com --dedup
+            hash_cache = HashCache(HASH_CACHE_PATH)
+        scan_cache = None
+        if options.get("scan_cache") and not options["recursive"]: # O cache de análise não vale no modo recursivo
+            from core.scan_cache import ScanCache # Importado só quando o cache é usado
+            scan_cache = ScanCache(SCAN_CACHE_PATH)
+        executar = not options["dry_run"] or options.get("keep_plan", False)
+        analise = organize_files(folder, options["categories"], recursive=options["recursive"],
+                                 max_depth=options["max_depth"], dedup=options["dedup"], hash_cache=hash_cache,
+                                 sniff_content=options["sniff"], scan_cache=scan_cache, metrics=metrics,
+                                 # Tamanhos só servem à execução (agendamento e métricas por movimento)
+                                 record_sizes=executar and bool(options["schedule"] or metrics))
+        if options.get("keep_plan"):
+            resumo["analysis"] = analise
+    resumo["status"] = analise["status"]
+    resumo["ignored"] = analise.get("ignored", 0)
+    resumo["duplicates"] = len(analise.get("duplicates", []))
+    if analise["status"] != "planned":
+        resumo["message"] = analise["message"]
+        return resumo
+
+    resumo["planned"] = len(analise["planned_moves"])
+    if options["dry_run"]:
+        resumo["status"] = "dry_run"
+        return resumo
+
+    with MoveJournal.create(JOURNAL_DIR, folder) as journal:
+        execucao = execute_moves(analise["planned_moves"], max_workers=options["threads"], journal=journal,
+                                 metrics=metrics, schedule=options["schedule"])
+    resumo["journal"] = journal.path
+    resumo["status"] = execucao["status"]
+    resumo["moved"] = execucao["moved"]
+    resumo["errors"] = execucao["errors"]
+    resumo["metrics"] = execucao["metrics"]
+    return resumo
+
+
+def run_batch(folders, options, jobs, console_level, json_log=False, analises=None):
+    """
+    Organiza várias pastas em paralelo em um pool de processos, preservando a ordem dos resultados.
+    'analises' (uma por pasta, veja organize_folder) executa planos já confirmados sem nova análise.
+    """
+    analises = analises or [None] * len(folders)
+    if jobs <= 1 or len(folders) == 1:
+        return [organize_folder(folder, options, analise) for folder, analise in zip(folders, analises)]
+    from concurrent.futures import ProcessPoolExecutor # Importado só quando há várias pastas
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(console_level, json_log)) as executor:
+        return list(executor.map(organize_folder, folders, [options] * len(folders), analises))
+
+
+def undo(alvos, threads):
+    """
+    Desfaz a última organização de cada alvo. Um alvo é uma pasta organizada (usa o diário
+    mais recente dela) ou o caminho de um diário (.jsonl).
+    """
+    resultados = []
+    for alvo in alvos:
+        if os.path.isfile(alvo) and alvo.endswith('.jsonl'):
+            diarios = [alvo]
+        else:
+            diarios = list_journals(JOURNAL_DIR, alvo)[:1]
+        if not diarios:
+            print(f"Nenhuma organização registrada para '{alvo}'.", file=sys.stderr)
+            resultados.append({"target": alvo, "status": "error", "restored": 0, "errors": 0, "skipped": 0})
+            continue
+        resultado = undo_journal(diarios[0], max_workers=threads)
+        resultados.append(dict(resultado, target=alvo, journal=diarios[0]))
+    return resultados
+
+
+def summarize(resultados):
+    """Monta o resumo final em JSON com os totais de todas as pastas."""
+    totais = {"planned": 0, "moved": 0, "errors": 0, "ignored": 0, "duplicates": 0}
+    for resultado in resultados:
+        for chave in totais:
+            totais[chave] += resultado[chave]
+    return {"folders": resultados, "totals": totais}
+
+
+def _ask(pergunta):
+    resposta = input(f"{pergunta} [s/N] ")
+    return resposta.strip().lower() in ("s", "sim", "y", "yes")
+
+
+def confirm(resultados):
+    """Mostra o plano (em stderr) e pergunta se os movimentos devem ser executados."""
+    for resultado in resultados:
+        print(f"{resultado['folder']}: {resultado['planned']} arquivo(s) planejado(s), "
+              f"{resultado['ignored']} ignorado(s).", file=sys.stderr)
+    return _ask("Confirmar e organizar?")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="files-organizer",
+                                     description="Organiza arquivos em subpastas por categoria, sem interface gráfica.")
+    parser.add_argument("folders", nargs="+", help="Pastas a organizar (ou, com --undo, pastas/diários a desfazer).")
+    parser.add_argument("--categories", default=CATEGORIES_CONFIG_PATH, help="Caminho do categories.json.")
+    parser.add_argument("--recursive", action="store_true", help="Também organiza os arquivos das subpastas.")
+    parser.add_argument("--max-depth", type=int, default=None, help="Profundidade máxima no modo recursivo.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Quantas pastas organizar em paralelo (processos).")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="Threads para mover arquivos dentro de cada pasta (veja execute_moves).")
+    # Os valores de --dedup e --schedule são validados em main, sem importar os módulos na inicialização
+    parser.add_argument("--dedup", default=None,
+                        help="Detecta arquivos idênticos: 'report' apenas relata, 'skip' não move as duplicatas, "
+                             "'hardlink' as substitui por links físicos para o original.")
+    parser.add_argument("--schedule", default=None,
+                        help="Ordem dos movimentos: 'plan' (a do plano), 'small-first' (mais baratos primeiro) ou "
+                             "'interleave' (cópias grandes entre dispositivos intercaladas com os demais).")
+    parser.add_argument("--sniff", action="store_true",
+                        help="Identifica pelo conteúdo (magic bytes) os arquivos sem extensão conhecida.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Não usa o cache de análise (o mesmo da GUI), que reaproveita a classificação "
+                             "de pastas já analisadas.")
+    modo = parser.add_mutually_exclusive_group()
+    modo.add_argument("--dry-run", action="store_true", help="Apenas planeja; nenhum arquivo é movido.")
+    modo.add_argument("--yes", "-y", action="store_true", help="Executa sem pedir confirmação.")
+    modo.add_argument("--undo", action="store_true",
+                      help="Desfaz a última organização de cada pasta, devolvendo os arquivos às origens.")
+    parser.add_argument("--watch", action="store_true",
+                        help="Observa a pasta (apenas uma) e organiza os arquivos à medida que chegam. Pede "
+                             "confirmação como as demais execuções (ou use --yes); não aceita opções de análise "
+                             "como --dry-run, --recursive, --dedup, --sniff, --schedule ou --profile.")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Mostra logs INFO no stderr.")
+    parser.add_argument("--json-log", action="store_true",
+                        help="Também grava um log estruturado (JSON lines) da execução em logs/.")
+    parser.add_argument("--profile", action="store_true",
+                        help="Mede cada fase (configuração, varredura, classificação, nomes, movimentos) e "
+                             "executa sob o cProfile; relatório no stderr, perfil em logs/*.prof.")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.dedup is not None:
+        from core.dedup import DEDUP_MODES # Importado só com --dedup
+        if args.dedup not in DEDUP_MODES:
+            parser.error(f"argument --dedup: invalid choice: {args.dedup!r} (choose from {', '.join(DEDUP_MODES)})")
+    if args.schedule is not None:
+        from core.scheduling import SCHEDULE_POLICIES # Importado só com --schedule
+        if args.schedule not in SCHEDULE_POLICIES:
+            parser.error(f"argument --schedule: invalid choice: {args.schedule!r} "
+                         f"(choose from {', '.join(SCHEDULE_POLICIES)})")
+    if args.watch:
+        # O modo de observação planeja só os arquivos que chegam: as opções de análise não se aplicam
+        incompativeis = [opcao for opcao, usada in (
+            ("--dry-run", args.dry_run), ("--undo", args.undo), ("--recursive", args.recursive),
+            ("--max-depth", args.max_depth is not None), ("--dedup", args.dedup is not None),
+            ("--sniff", args.sniff), ("--schedule", args.schedule is not None), ("--profile", args.profile)) if usada]
+        if incompativeis:
+            parser.error(f"argument --watch: not allowed with {', '.join(incompativeis)}")
+        if len(args.folders) != 1:
+            parser.error("argument --watch: aceita apenas uma pasta")
+    console_level = logging.INFO if args.verbose else logging.WARNING
+    setup_logging(BASE_DIR, console_stream=sys.stderr, console_level=console_level, json_log=args.json_log)
+
+    # Execuções interrompidas (queda, encerramento forçado) são concluídas ou revertidas antes de tudo
+    recover_interrupted(JOURNAL_DIR)
+
+    folders = [os.path.abspath(folder) for folder in args.folders]
+    if args.undo:
+        resultados = undo(folders, args.threads)
+        print(json.dumps({"undo": resultados}, ensure_ascii=False))
+        return 1 if any(resultado["errors"] or resultado["status"] == "error" for resultado in resultados) else 0
+    options = {"categories": args.categories, "recursive": args.recursive, "max_depth": args.max_depth,
+               "threads": args.threads, "dry_run": args.dry_run, "dedup": args.dedup,
+               "sniff": args.sniff, "profile": args.profile, "schedule": args.schedule,
+               "scan_cache": not args.no_cache}
+
+    if args.watch:
+        if not args.yes:
+            if not sys.stdin.isatty():
+                print("Sem terminal interativo para confirmar. Use --yes para observar a pasta.", file=sys.stderr)
+                return 2
+            if not _ask(f"Observar '{folders[0]}' e organizar automaticamente os arquivos que chegarem?"):
+                return 0
+        from core.watcher import FolderWatcher # Importado só quando necessário
+        watcher = FolderWatcher(folders[0], args.categories, max_workers=args.threads, journal_dir=JOURNAL_DIR)
+        try:
+            totais = watcher.run()
+        except KeyboardInterrupt:
+            totais = watcher.totals
+        print(json.dumps({"folders": [dict(folder=folders[0], **totais)], "totals": totais}, ensure_ascii=False))
+        return 0
+
+    jobs = max(1, min(args.jobs, len(folders)))
+    analises = None
+    if not args.dry_run and not args.yes:
+        if not sys.stdin.isatty():
+            print("Sem terminal interativo para confirmar. Use --yes para executar ou --dry-run para simular.",
+                  file=sys.stderr)
+            return 2
+        # O plano mostrado é o executado: as pastas não são analisadas uma segunda vez
+        plano = run_batch(folders, dict(options, dry_run=True, keep_plan=True), jobs, console_level, args.json_log)
+        analises = [resultado.pop("analysis", None) for resultado in plano]
+        if not confirm(plano):
+            print(json.dumps(summarize(plano), ensure_ascii=False))
+            return 0
+
+    resultados = run_batch(folders, options, jobs, console_level, args.json_log, analises)
+    print(json.dumps(summarize(resultados), ensure_ascii=False))
+    return 1 if any(resultado["errors"] or resultado["status"] == "error" for resultado in resultados) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+# src/core/async_api.py
+
+import time
+import asyncio
+import inspect
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from core.organizer_logic import (organize_files, iter_planned_moves, _move_one, _group_by_destination,
+                                  _schedule_execution, _record_result, _prepare_execution, _finish_execution,
+                                  CATEGORIES_CONFIG_PATH, EXCLUDE_CONFIG_PATH)
+from core.config import get_config
+from core.rules import rules_path_for
+from core.name_allocator import NameAllocator
+from core.mover import FileMover
+from core.journal import MoveJournal
+from core.plan import Plan
+
+logger = logging.getLogger('files_organizer_py')
+
+CONCORRENCIA_PADRAO = 8 # Chamadas bloqueantes simultâneas (em todas as pastas)
+LOTE_PLANEJAMENTO = 256 # Movimentos planejados produzidos por ida à thread
+INTERVALO_PAUSA = 0.1 # Segundos entre consultas a um CancelToken pausado
+
+
+async def _deliver(destino, valor):
+    """Entrega 'valor' a uma asyncio.Queue, função ou função assíncrona, no event loop."""
+    if isinstance(destino, asyncio.Queue):
+        await destino.put(valor)
+        return
+    retorno = destino(valor)
+    if inspect.isawaitable(retorno):
+        await retorno
+
+
+def _timed_move(*args):
+    """Executa _move_one (em uma thread do executor) e retorna (nome final, segundos)."""
+    inicio = time.perf_counter()
+    nome_final = _move_one(*args)
+    return nome_final, time.perf_counter() - inicio
+
+
+def _next_batch(gerador, tamanho):
+    """Consome até 'tamanho' itens do gerador (executado em uma thread do executor)."""
+    lote = []
+    for item in gerador:
+        lote.append(item)
+        if len(lote) >= tamanho:
+            break
+    return lote
+
+
+class AsyncOrganizer:
+    """
+    API assíncrona do organizador, para serviços baseados em asyncio.
+
+    Todas as chamadas bloqueantes de sistema de arquivos (varredura, stat, movimentos, fsync)
+    passam por um único executor de threads, limitado a 'max_concurrency' chamadas simultâneas.
+    Assim um único event loop organiza várias pastas ao mesmo tempo (asyncio.gather), sem uma
+    thread do SO por pasta: o custo em threads é fixo, qualquer que seja o número de pastas.
+
+    Uso:
+        async with AsyncOrganizer(max_concurrency=8) as organizador:
+            async for movimento in organizador.iter_planned_moves(pasta):
+                ...
+            resultados = await asyncio.gather(*(organizador.organize_folder(p) for p in pastas))
+
+    Os métodos espelham o núcleo síncrono (organize_files, execute_moves) e retornam os mesmos
+    resultados. Cancelar a tarefa (asyncio) interrompe a execução depois dos movimentos em
+    andamento; para uma parada com o plano restante ("remaining"), use um CancelToken.
+    """
+    def __init__(self, max_concurrency=CONCORRENCIA_PADRAO, executor=None):
+        self.max_concurrency = max_concurrency
+        self._executor = executor
+        self._executor_proprio = executor is None
+        self._semaforo = None # Criado no event loop em uso
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+        return False
+
+    async def close(self):
+        """Encerra o executor próprio (não o executor recebido no construtor)."""
+        if self._executor_proprio and self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    async def _run(self, funcao, *args, **kwargs):
+        """Executa uma função bloqueante no executor, respeitando o limite de concorrência."""
+        if self._semaforo is None:
+            self._semaforo = asyncio.Semaphore(self.max_concurrency)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='organizer_async')
+        async with self._semaforo:
+            return await asyncio.get_running_loop().run_in_executor(self._executor,
+                                                                    functools.partial(funcao, *args, **kwargs))
+
+    async def iter_planned_moves(self, source_folder, categories_config_path=CATEGORIES_CONFIG_PATH,
+                                 recursive=False, max_depth=None, follow_symlinks=False,
+                                 batch_size=LOTE_PLANEJAMENTO):
+        """
+        Gera os movimentos planejados (PlannedMove) como um iterador assíncrono, à medida que a
+        pasta é percorrida. A varredura avança em lotes de 'batch_size' itens no executor; o
+        próximo lote só é lido quando o consumidor pede, então um consumidor lento não acumula
+        o plano inteiro em memória. Uma configuração inválida gera core.config.ConfigError.
+        """
+        config = await self._run(get_config, categories_config_path, EXCLUDE_CONFIG_PATH,
+                                 rules_path_for(categories_config_path))
+        gerador = iter_planned_moves(source_folder, config.classifier, config.exclusions, {}, recursive=recursive,
+                                     max_depth=max_depth, follow_symlinks=follow_symlinks)
+        try:
+            while True:
+                lote = await self._run(_next_batch, gerador, batch_size)
+                for movimento in lote:
+                    yield movimento
+                if len(lote) < batch_size:
+                    return
+        finally:
+            try:
+                gerador.close()
+            except ValueError:
+                pass # Um lote ainda está sendo lido em uma thread (tarefa cancelada); o gerador é descartado depois
+
+    async def organize_files(self, source_folder, categories_config_path=CATEGORIES_CONFIG_PATH, **kwargs):
+        """Versão assíncrona de organize_files (mesmos argumentos e resultado)."""
+        return await self._run(organize_files, source_folder, categories_config_path, **kwargs)
+
+    async def execute_moves(self, planned_moves, progress=None, cancel_token=None, journal=None, metrics=None,
+                            schedule=None, byte_progress=None):
+        """
+        Versão assíncrona de execute_moves (mesmo resultado).
+        Cada pasta de destino é uma corrotina que move seus arquivos em sequência, na ordem do
+        plano (nomes de colisão determinísticos); pastas diferentes avançam em paralelo, até o
+        limite de concorrência do organizador.
+        'progress' recebe (atual, total) no event loop: pode ser uma asyncio.Queue, uma função
+        ou uma função assíncrona. Com 'cancel_token' (CancelToken), a pausa suspende as corrotinas
+        (sem ocupar threads) e o cancelamento retorna o status "cancelled" com o plano restante.
+        'schedule' escolhe a ordem de execução, como em execute_moves (veja core.scheduling).
+        'byte_progress' recebe o dicionário de progresso por bytes de execute_moves, também no
+        event loop e nas mesmas formas de 'progress'.
+        """
+        plano = Plan.from_moves(planned_moves)
+        await self._run(_prepare_execution, plano, journal)
+        # O TransferProgress só acumula os snapshots; a entrega é feita pelas corrotinas
+        snapshots = []
+        ordem, custo, progresso = await self._run(_schedule_execution, plano, schedule,
+                                                  snapshots.append if byte_progress is not None else None)
+        mover = FileMover()
+        estados = bytearray(len(plano))
+        renomeados = {}
+        total_moves = len(plano)
+        contadores = {"moved": 0, "errors": 0, "done": 0}
+
+        async def notify():
+            while snapshots:
+                await _deliver(byte_progress, snapshots.pop(0))
+            if progress is None:
+                return
+            if isinstance(progress, asyncio.Queue):
+                await progress.put((contadores["done"], total_moves))
+                return
+            retorno = progress(contadores["done"], total_moves)
+            if inspect.isawaitable(retorno):
+                await retorno
+
+        async def cancelled():
+            if cancel_token is None:
+                return False
+            while cancel_token.paused and not cancel_token.cancelled:
+                await asyncio.sleep(INTERVALO_PAUSA)
+            return cancel_token.cancelled
+
+        def record(indice, resultado):
+            # Corre no event loop: não há concorrência entre os registros
+            nome_final, segundos = resultado
+            sucesso = _record_result(plano, indice, nome_final, estados, renomeados)
+            contadores["moved" if sucesso else "errors"] += 1
+            contadores["done"] += 1
+            if progresso is not None:
+                progresso.record(indice, segundos)
+
+        async def process_group(grupo):
+            allocator = NameAllocator(plano.destination_folder(grupo[0]))
+            for indice in grupo:
+                if await cancelled():
+                    return
+                movimento = asyncio.ensure_future(self._run(_timed_move, plano, indice, total_moves, allocator,
+                                                            mover, journal, metrics))
+                try:
+                    resultado = await asyncio.shield(movimento)
+                except asyncio.CancelledError:
+                    # O movimento já começou em uma thread: espera o resultado para registrá-lo
+                    record(indice, await movimento)
+                    raise
+                record(indice, resultado)
+                await notify()
+
+        try:
+            await asyncio.gather(*(process_group(grupo) for grupo in _group_by_destination(plano, ordem, custo)))
+        finally:
+            # Conclui as cópias pendentes de fsync mesmo se a tarefa foi cancelada
+            await asyncio.shield(self._run(_close_execution, mover, journal))
+
+        resultado = {"status": "done", "moved": contadores["moved"], "errors": contadores["errors"]}
+        return _finish_execution(plano, resultado, mover, estados, renomeados)
+
+    async def organize_folder(self, source_folder, categories_config_path=CATEGORIES_CONFIG_PATH, dry_run=False,
+                              progress=None, cancel_token=None, journal_dir=None, schedule=None, byte_progress=None,
+                              **kwargs):
+        """
+        Analisa e organiza uma pasta (organize_files seguido de execute_moves).
+        Com 'journal_dir', os movimentos são registrados em um diário (veja core.journal).
+        'schedule' e 'byte_progress' são repassados a execute_moves; os demais argumentos nomeados,
+        a organize_files (os tamanhos são registrados na varredura quando a execução vai usá-los).
+        Retorna o resultado da análise se não houver o que mover ou se 'dry_run', senão o da execução.
+        """
+        if not dry_run and (schedule or byte_progress is not None):
+            kwargs.setdefault("record_sizes", True)
+        analise = await self.organize_files(source_folder, categories_config_path, cancel_token=cancel_token,
+                                            **kwargs)
+        if analise["status"] != "planned" or dry_run:
+            return analise
+        journal = await self._run(MoveJournal.create, journal_dir, source_folder) if journal_dir else None
+        try:
+            return await self.execute_moves(analise["planned_moves"], progress=progress,
+                                            cancel_token=cancel_token, journal=journal, schedule=schedule,
+                                            byte_progress=byte_progress)
+        finally:
+            if journal is not None:
+                await asyncio.shield(self._run(journal.close))
+
+
+def _close_execution(mover, journal):
+    mover.close()
+    if journal:
+        journal.flush()
@@ -0,0 +1,42 @@
+# src/core/cancellation.py
+
+import threading
+
+
+class CancelToken:
+    """
+    Sinal cooperativo de cancelamento e pausa de uma organização em andamento.
+
+    A análise e a execução consultam o token entre um arquivo e outro (checkpoint), então
+    nenhum movimento é interrompido no meio. Pode ser compartilhado entre threads: a
+    interface chama cancel()/pause()/resume() enquanto a thread de trabalho (ou as threads
+    do pool de execute_moves) chamam checkpoint().
+    """
+    def __init__(self):
+        self._cancelado = threading.Event()
+        self._liberado = threading.Event() # Limpo enquanto a execução está pausada
+        self._liberado.set()
+
+    def cancel(self):
+        self._cancelado.set()
+        self._liberado.set() # Libera quem está aguardando em pausa, para que veja o cancelamento
+
+    def pause(self):
+        if not self._cancelado.is_set():
+            self._liberado.clear()
+
+    def resume(self):
+        self._liberado.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelado.is_set()
+
+    @property
+    def paused(self):
+        return not self._liberado.is_set()
+
+    def checkpoint(self):
+        """Bloqueia enquanto a execução estiver pausada. Retorna True se ela deve parar."""
+        self._liberado.wait()
+        return self._cancelado.is_set()
@@ -0,0 +1,70 @@
+# src/core/classifier.py
+
+import logging
+
+logger = logging.getLogger('files_organizer_py')
+
+CATEGORIA_PADRAO = "Outros"
+
+
+def normalize_extension(extensao):
+    """Normaliza uma extensão do categories.json: minúsculas (casefold) e com ponto inicial."""
+    extensao = extensao.strip().casefold()
+    if extensao and not extensao.startswith('.'):
+        extensao = '.' + extensao
+    return extensao
+
+
+class ExtensionClassifier:
+    """
+    Índice pré-compilado extensão -> categoria.
+    Construído uma única vez a partir do categories.json (veja core.config), resolve a categoria
+    de cada arquivo com buscas O(1) em dicionário em vez de percorrer todas as categorias.
+
+    Regras de precedência:
+    - Extensões compostas (ex: '.tar.gz') têm prioridade sobre a extensão simples ('.gz').
+    - Se a mesma extensão aparece em mais de uma categoria, vale a primeira declarada
+      (mesmo comportamento do laço original sobre categories.json).
+    """
+    def __init__(self, categorias, categoria_padrao=CATEGORIA_PADRAO):
+        self.categoria_padrao = categoria_padrao
+        self.categorias = list(categorias.keys())
+        if categoria_padrao not in self.categorias:
+            self.categorias.append(categoria_padrao)
+        self._nomes_categorias = frozenset(self.categorias)
+
+        self._index = {}
+        self._max_partes = 1
+        for categoria, extensoes_lista in categorias.items():
+            for extensao in extensoes_lista:
+                extensao = normalize_extension(extensao)
+                if not extensao or extensao == '.':
+                    continue
+                if extensao in self._index:
+                    if self._index[extensao] != categoria:
+                        logger.warning(f"Extensão '{extensao}' declarada em '{self._index[extensao]}' e '{categoria}'. "
+                                       f"Usando '{self._index[extensao]}'.")
+                    continue
+                self._index[extensao] = categoria
+                self._max_partes = max(self._max_partes, extensao.count('.'))
+
+    def __len__(self):
+        return len(self._index)
+
+    def is_category_folder(self, nome):
+        """Indica se um nome de pasta corresponde a uma das categorias."""
+        return nome in self._nomes_categorias
+
+    def classify(self, nome_arquivo, stat=None):
+        """
+        Retorna a categoria de um nome de arquivo, ou a categoria padrão se nenhuma extensão casar.
+        'stat' é aceito por compatibilidade com o RuleClassifier e não é usado.
+        """
+        partes = nome_arquivo.casefold().rsplit('.', self._max_partes)
+        # partes[0] é o radical; um radical vazio indica arquivo oculto ('.gz' não tem extensão)
+        inicio = 1 if partes[0] else 2
+        for i in range(inicio, len(partes)):
+            categoria = self._index.get('.' + '.'.join(partes[i:]))
+            if categoria is not None:
+                return categoria
+        return self.categoria_padrao
@@ -0,0 +1,273 @@
+# src/core/config.py
+
+import os
+import re
+import json
+import logging
+import threading
+
+from core.classifier import ExtensionClassifier
+
+logger = logging.getLogger('files_organizer_py')
+
+CHAVES_EXCLUSAO = ("exclude_files", "exclude_folders")
+
+_TIPOS_JSON = {dict: "objeto", list: "lista", str: "texto", bool: "booleano", int: "número", float: "número",
+               type(None): "null"}
+
+
+def _tipo(valor):
+    return _TIPOS_JSON.get(type(valor), type(valor).__name__)
+
+
+class ConfigError(ValueError):
+    """
+    Erro em um arquivo de configuração, com a posição do problema: linha e coluna quando o JSON
+    é inválido, ou o campo (ex: '"Imagens"[2]') quando o JSON é válido mas não segue o esquema.
+    """
+    def __init__(self, caminho, mensagem, campo=None, linha=None, coluna=None):
+        self.path = caminho
+        self.field = campo
+        self.line = linha
+        self.column = coluna
+        self.reason = mensagem
+        local = os.path.basename(caminho)
+        if linha is not None:
+            local += f", linha {linha}, coluna {coluna}"
+        if campo:
+            local += f", campo {campo}"
+        super().__init__(f"{local}: {mensagem}")
+
+
+class Exclusions:
+    """Listas de exclusão compiladas: nomes em minúsculas, em conjuntos imutáveis."""
+    __slots__ = ("files", "folders")
+
+    def __init__(self, files=(), folders=()):
+        self.files = frozenset(nome.lower() for nome in files)
+        self.folders = frozenset(nome.lower() for nome in folders)
+
+    def __repr__(self):
+        return f"Exclusions({len(self.files)} arquivo(s), {len(self.folders)} pasta(s))"
+
+
+def exclusion_sets(exclusions):
+    """
+    Retorna os conjuntos (arquivos, pastas) excluídos, em minúsculas. Aceita um Exclusions (já
+    compilado) ou o dicionário de exclude_list.json (compilado a cada chamada).
+    """
+    if isinstance(exclusions, Exclusions):
+        return exclusions.files, exclusions.folders
+    return ({nome.lower() for nome in exclusions.get("exclude_files", [])},
+            {nome.lower() for nome in exclusions.get("exclude_folders", [])})
+
+
+class ConfigSnapshot:
+    """
+    Configuração compilada e imutável de uma execução: o classificador, as exclusões e a
+    assinatura do conteúdo dos arquivos (invalida o cache de análise quando a configuração muda).
+    """
+    __slots__ = ("classifier", "exclusions", "signature")
+
+    def __init__(self, classifier, exclusions, signature):
+        object.__setattr__(self, "classifier", classifier)
+        object.__setattr__(self, "exclusions", exclusions)
+        object.__setattr__(self, "signature", signature)
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("ConfigSnapshot é imutável.")
+
+
+def _stat_key(caminho):
+    """Identifica a versão de um arquivo sem lê-lo: (mtime, tamanho, inode), ou None se ausente."""
+    try:
+        st = os.stat(caminho)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def read_json(caminho, obrigatorio=True):
+    """
+    Lê um arquivo JSON. Retorna (dados, conteúdo em bytes), ou (None, None) se o arquivo não
+    existir e não for obrigatório. Erros de leitura e de sintaxe viram ConfigError com a posição.
+    """
+    try:
+        with open(caminho, 'rb') as f:
+            conteudo = f.read()
+    except FileNotFoundError:
+        if not obrigatorio:
+            return None, None
+        raise ConfigError(caminho, "arquivo não encontrado.")
+    except OSError as e:
+        raise ConfigError(caminho, f"não foi possível ler o arquivo ({e.strerror}).")
+    try:
+        return json.loads(conteudo.decode('utf-8')), conteudo
+    except UnicodeDecodeError as e:
+        raise ConfigError(caminho, f"o arquivo não está em UTF-8 (byte {e.start}).")
+    except json.JSONDecodeError as e:
+        raise ConfigError(caminho, f"JSON inválido: {e.msg}.", linha=e.lineno, coluna=e.colno)
+
+
+def validate_categories(caminho, dados):
+    """Valida o categories.json: um objeto {categoria: [extensões]}, com nomes de pasta válidos."""
+    if not isinstance(dados, dict):
+        raise ConfigError(caminho, f"esperado um objeto {{categoria: [extensões]}}, encontrado {_tipo(dados)}.")
+    for categoria, extensoes in dados.items():
+        campo = json.dumps(categoria, ensure_ascii=False)
+        if not categoria.strip() or categoria in ('.', '..') or '/' in categoria or '\\' in categoria:
+            raise ConfigError(caminho, "nome de categoria inválido (é usado como nome de pasta).", campo=campo)
+        if not isinstance(extensoes, list):
+            raise ConfigError(caminho, f"esperada uma lista de extensões, encontrado {_tipo(extensoes)}.", campo=campo)
+        for i, extensao in enumerate(extensoes):
+            if not isinstance(extensao, str):
+                raise ConfigError(caminho, f"esperada uma extensão (texto), encontrado {_tipo(extensao)}.",
+                                  campo=f"{campo}[{i}]")
+    return dados
+
+
+def validate_exclusions(caminho, dados):
+    """
+    Valida o exclude_list.json: um objeto com 'exclude_files' e/ou 'exclude_folders' (listas de
+    nomes). Chaves desconhecidas são erro, para que um erro de digitação não desative as exclusões.
+    """
+    if not isinstance(dados, dict):
+        raise ConfigError(caminho, f"esperado um objeto com {' e '.join(CHAVES_EXCLUSAO)}, encontrado {_tipo(dados)}.")
+    for chave, nomes in dados.items():
+        if chave not in CHAVES_EXCLUSAO:
+            raise ConfigError(caminho, f"campo desconhecido (esperado: {', '.join(CHAVES_EXCLUSAO)}).",
+                              campo=json.dumps(chave, ensure_ascii=False))
+        if not isinstance(nomes, list):
+            raise ConfigError(caminho, f"esperada uma lista de nomes, encontrado {_tipo(nomes)}.", campo=chave)
+        for i, nome in enumerate(nomes):
+            if not isinstance(nome, str):
+                raise ConfigError(caminho, f"esperado um nome (texto), encontrado {_tipo(nome)}.", campo=f"{chave}[{i}]")
+    return dados
+
+
+def validate_rules(caminho, dados):
+    """Valida a estrutura do rules.json ({"rules": [...]} ou a lista); o conteúdo das regras é validado ao compilar."""
+    regras = dados.get("rules", []) if isinstance(dados, dict) else dados
+    if not isinstance(regras, list):
+        raise ConfigError(caminho, f"esperada uma lista de regras, encontrado {_tipo(regras)}.", campo="rules")
+    return regras
+
+
+class ConfigManager:
+    """
+    Carrega, valida e compila uma vez os arquivos de configuração (categories.json,
+    exclude_list.json e rules.json) e os mantém em cache como um ConfigSnapshot.
+
+    Antes de cada execução, get() consulta apenas o stat dos arquivos; um arquivo só é relido
+    quando muda, e só a parte que depende dele é recompilada (o classificador ou as exclusões).
+    Um arquivo inválido gera ConfigError (com arquivo, linha/coluna ou campo) em vez de ser
+    ignorado; o erro não é guardado em cache, então corrigir o arquivo basta para a próxima execução.
+    Um exclude_list.json ausente equivale a nenhuma exclusão, e um rules.json ausente a nenhuma regra.
+    """
+    def __init__(self, categories_config_path, exclude_config_path, rules_config_path=None):
+        self.categories_config_path = os.path.abspath(categories_config_path)
+        self.exclude_config_path = os.path.abspath(exclude_config_path)
+        self.rules_config_path = rules_config_path and os.path.abspath(rules_config_path)
+        self._lock = threading.Lock()
+        self._arquivos = {} # caminho -> (chave do stat, dados validados, conteúdo em bytes)
+        self._chaves = None
+        self._snapshot = None
+        self.reloads = 0
+
+    def _paths(self):
+        caminhos = [self.categories_config_path, self.exclude_config_path]
+        if self.rules_config_path:
+            caminhos.append(self.rules_config_path)
+        return caminhos
+
+    def get(self):
+        """Retorna o ConfigSnapshot atual, recarregando os arquivos que mudaram desde a última chamada."""
+        chaves = tuple(_stat_key(caminho) for caminho in self._paths())
+        with self._lock:
+            if self._snapshot is None or chaves != self._chaves:
+                self._snapshot = self._reload(chaves)
+                self._chaves = chaves
+                self.reloads += 1
+            return self._snapshot
+
+    def _load(self, caminho, chave, validar, obrigatorio):
+        """Relê e valida um arquivo, se a chave do stat mudou desde a última leitura."""
+        anterior = self._arquivos.get(caminho)
+        if anterior is not None and anterior[0] == chave:
+            return
+        dados, conteudo = read_json(caminho, obrigatorio)
+        if dados is not None:
+            dados = validar(caminho, dados)
+            logger.info(f"Configuração carregada de '{caminho}'.")
+        self._arquivos[caminho] = (chave, dados, conteudo)
+
+    def _reload(self, chaves):
+        caminhos = self._paths()
+        validadores = [validate_categories, validate_exclusions, validate_rules]
+        for caminho, chave, validar, obrigatorio in zip(caminhos, chaves, validadores, (True, False, False)):
+            self._load(caminho, chave, validar, obrigatorio)
+        # Compara com as versões usadas no snapshot atual (não com a última leitura, que pode ter falhado)
+        anteriores = self._chaves or (None,) * len(caminhos)
+        mudou = {caminho: anterior != chave or self._snapshot is None
+                 for caminho, anterior, chave in zip(caminhos, anteriores, chaves)}
+
+        classifier = self._snapshot.classifier if self._snapshot is not None else None
+        if mudou[self.categories_config_path] or (self.rules_config_path and mudou[self.rules_config_path]):
+            classifier = self._compile_classifier()
+        exclusions = self._snapshot.exclusions if self._snapshot is not None else None
+        if mudou[self.exclude_config_path]:
+            dados = self._arquivos[self.exclude_config_path][1]
+            if dados is None:
+                logger.warning(f"Aviso: O arquivo de exclusão '{self.exclude_config_path}' não foi encontrado. "
+                               f"Nenhuma exclusão será aplicada.")
+                dados = {}
+            exclusions = Exclusions(dados.get("exclude_files", []), dados.get("exclude_folders", []))
+        return ConfigSnapshot(classifier, exclusions, self._signature())
+
+    def _compile_classifier(self):
+        categorias = self._arquivos[self.categories_config_path][1]
+        regras = self._arquivos[self.rules_config_path][1] if self.rules_config_path else None
+        if regras and any(isinstance(regra, dict) and regra.get("enabled", True) for regra in regras):
+            from core.rules import RuleClassifier # Só carregado quando há regras
+            try:
+                classifier = RuleClassifier(categorias, regras)
+            except (ValueError, re.error) as e:
+                raise ConfigError(self.rules_config_path, str(e)) from e
+            except Exception as e:
+                # Valores de tipo inesperado (ex: "glob": 5) chegam como TypeError etc.: quem chama só trata ConfigError
+                raise ConfigError(self.rules_config_path, f"regra inválida ({type(e).__name__}: {e})") from e
+            logger.info(f"{len(classifier)} regra(s) ativa(s) compilada(s).")
+            return classifier
+        try:
+            return ExtensionClassifier(categorias)
+        except Exception as e:
+            raise ConfigError(self.categories_config_path, f"categorias inválidas ({type(e).__name__}: {e})") from e
+
+    def _signature(self):
+        """Assinatura (SHA-1) dos caminhos e do conteúdo já lido dos arquivos, sem relê-los."""
+        import hashlib # Importado só quando a configuração é (re)carregada
+        digest = hashlib.sha1()
+        for caminho in self._paths():
+            digest.update(caminho.encode('utf-8'))
+            conteudo = self._arquivos[caminho][2]
+            digest.update(conteudo if conteudo is not None else b'<ausente>')
+        return digest.hexdigest()
+
+
+# Gerenciadores por arquivos de configuração: {(categorias, exclusões, regras): ConfigManager}
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_config(categories_config_path, exclude_config_path, rules_config_path=None):
+    """
+    Retorna o ConfigSnapshot dos arquivos de configuração, compilado uma vez e recarregado
+    apenas quando algum arquivo muda (veja ConfigManager). Gera ConfigError se algum for inválido.
+    """
+    chave = (os.path.abspath(categories_config_path), os.path.abspath(exclude_config_path),
+             rules_config_path and os.path.abspath(rules_config_path))
+    with _managers_lock:
+        manager = _managers.get(chave)
+        if manager is None:
+            manager = _managers[chave] = ConfigManager(*chave)
+    return manager.get()
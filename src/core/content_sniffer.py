@@ -0,0 +1,166 @@
+# src/core/content_sniffer.py
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger('files_organizer_py')
+
+TAMANHO_LEITURA = 4096 # Apenas o início do arquivo é lido (o 'ustar' do tar fica no byte 257)
+TAMANHO_CACHE = 4096
+
+# Assinaturas (magic bytes) -> extensão equivalente.
+# Cada item: (prefixo no byte 0, verificações extras ((offset, bytes), ...), extensão)
+SIGNATURES = [
+    (b'\xff\xd8\xff', (), '.jpg'),
+    (b'\x89PNG\r\n\x1a\n', (), '.png'),
+    (b'GIF87a', (), '.gif'),
+    (b'GIF89a', (), '.gif'),
+    (b'II*\x00', (), '.tiff'),
+    (b'MM\x00*', (), '.tiff'),
+    (b'RIFF', ((8, b'WEBP'),), '.webp'),
+    (b'RIFF', ((8, b'WAVE'),), '.wav'),
+    (b'RIFF', ((8, b'AVI '),), '.avi'),
+    (b'%PDF-', (), '.pdf'),
+    (b'{\\rtf', (), '.rtf'),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', (), '.doc'),
+    (b'PK\x03\x04', (), '.zip'),
+    (b'Rar!\x1a\x07', (), '.rar'),
+    (b'7z\xbc\xaf\x27\x1c', (), '.7z'),
+    (b'\x1f\x8b', (), '.gz'),
+    (b'', ((257, b'ustar'),), '.tar'),
+    (b'ID3', (), '.mp3'),
+    (b'fLaC', (), '.flac'),
+    (b'OggS', (), '.ogg'),
+    (b'', ((4, b'ftypqt'),), '.mov'),
+    (b'', ((4, b'ftyp'),), '.mp4'),
+    (b'\x1aE\xdf\xa3', (), '.mkv'),
+    (b'FLV\x01', (), '.flv'),
+    (b'0&\xb2u\x8ef\xcf\x11', (), '.wmv'),
+    (b'MZ', (), '.exe'),
+]
+
+
+def compile_signatures(signatures):
+    """
+    Pré-compila as assinaturas em uma trie de prefixos: cada nó é um dicionário {byte: nó}
+    e a chave None guarda os candidatos (verificações extras, extensão) que terminam nele.
+    """
+    raiz = {}
+    for prefixo, extras, extensao in signatures:
+        no = raiz
+        for byte in prefixo:
+            no = no.setdefault(byte, {})
+        no.setdefault(None, []).append((extras, extensao))
+    return raiz
+
+
+class ContentSniffer:
+    """
+    Identifica o tipo de um arquivo pelos primeiros bytes (magic bytes), sem depender da extensão.
+    Lê no máximo TAMANHO_LEITURA bytes por arquivo em um buffer reaproveitado por thread,
+    e guarda o resultado em um cache LRU indexado por (st_dev, st_ino, tamanho, mtime).
+    """
+    def __init__(self, signatures=SIGNATURES, cache_size=TAMANHO_CACHE):
+        self._trie = compile_signatures(signatures)
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _buffer(self):
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = bytearray(TAMANHO_LEITURA)
+        return buffer
+
+    def match(self, dados):
+        """Retorna a extensão da assinatura mais longa que casa com 'dados', ou None."""
+        candidatos = []
+        no = self._trie
+        if None in no:
+            candidatos.append(no[None])
+        for byte in dados:
+            no = no.get(byte)
+            if no is None:
+                break
+            if None in no:
+                candidatos.append(no[None])
+        # Prefixos mais longos primeiro; dentro do mesmo nó, a ordem da tabela
+        for lista in reversed(candidatos):
+            for extras, extensao in lista:
+                if all(dados[offset:offset + len(magic)] == magic for offset, magic in extras):
+                    return extensao
+        return None
+
+    def sniff(self, caminho, st=None):
+        """Retorna a extensão detectada pelo conteúdo de 'caminho', ou None se não reconhecida."""
+        try:
+            st = st or os.stat(caminho)
+            chave = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+            with self._lock:
+                if chave in self._cache:
+                    self._cache.move_to_end(chave)
+                    return self._cache[chave]
+
+            buffer = self._buffer()
+            with open(caminho, 'rb', buffering=0) as f:
+                lidos = f.readinto(buffer)
+            extensao = self.match(memoryview(buffer)[:lidos])
+        except OSError as e:
+            logger.warning(f"Não foi possível ler '{caminho}' para identificar o conteúdo: {e}")
+            return None
+
+        with self._lock:
+            self._cache[chave] = extensao
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return extensao
+
+    def sniff_many(self, caminhos, max_workers=8):
+        """Identifica vários arquivos em paralelo, sobrepondo a latência de E/S. Mantém a ordem."""
+        if max_workers <= 1 or len(caminhos) < 2:
+            return [self.sniff(caminho) for caminho in caminhos]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.sniff, caminhos))
+
+
+_shared_sniffer = None
+
+
+def get_sniffer():
+    """Retorna o ContentSniffer compartilhado, para que o cache LRU valha entre execuções."""
+    global _shared_sniffer
+    if _shared_sniffer is None:
+        _shared_sniffer = ContentSniffer()
+    return _shared_sniffer
+
+
+def reclassify_by_content(planned_moves, classifier, sniffer, max_workers=8):
+    """
+    Reclassifica pelo conteúdo os movimentos do plano (Plan) que caíram na categoria padrão
+    ("Outros"): arquivos sem extensão, com extensão desconhecida ou trocada (ex: '.bin').
+    A extensão detectada é convertida em categoria pelo próprio classificador, então as
+    categorias configuradas em categories.json continuam valendo.
+    Retorna a quantidade de movimentos reclassificados.
+    """
+    plano = planned_moves
+    indices = [i for i in range(len(plano)) if plano.category(i) == classifier.categoria_padrao]
+    if not indices:
+        return 0
+
+    extensoes = sniffer.sniff_many([plano.source_path(i) for i in indices], max_workers)
+    reclassificados = 0
+    for i, extensao in zip(indices, extensoes):
+        if extensao is None:
+            continue
+        categoria = classifier.classify('arquivo' + extensao)
+        if categoria == classifier.categoria_padrao:
+            continue
+        pasta_base = os.path.dirname(plano.destination_folder(i))
+        plano.set_destination(i, os.path.join(pasta_base, categoria), categoria)
+        logger.info("  Reclassificado pelo conteúdo (%s): '%s' -> '%s'", extensao, plano.name(i), categoria)
+        reclassificados += 1
+    return reclassificados
@@ -0,0 +1,285 @@
+# src/core/dedup.py
+
+import os
+import sqlite3
+import hashlib
+import logging
+
+logger = logging.getLogger('files_organizer_py')
+
+TAMANHO_AMOSTRA = 64 * 1024 # Bytes lidos do início e do fim no hash parcial
+TAMANHO_BUFFER = 1024 * 1024
+
+# Modos de tratamento das duplicatas
+DEDUP_REPORT = "report" # Apenas relata; os arquivos são movidos normalmente
+DEDUP_SKIP = "skip" # Duplicatas não são movidas
+DEDUP_HARDLINK = "hardlink" # Duplicatas viram links físicos para o original antes de mover
+DEDUP_MODES = (DEDUP_REPORT, DEDUP_SKIP, DEDUP_HARDLINK)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    partial TEXT,
+    full TEXT,
+    PRIMARY KEY (dev, ino)
+) WITHOUT ROWID;
+"""
+
+
+class HashCache:
+    """
+    Cache persistente (SQLite) dos hashes de conteúdo, indexado por (st_dev, st_ino) e
+    validado por (tamanho, mtime). Em execuções repetidas os arquivos inalterados não são relidos.
+    Use como gerenciador de contexto: a conexão fica aberta durante uma busca de duplicatas.
+    """
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._conn = None
+        self._alterados = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.executescript(_SCHEMA)
+        except sqlite3.Error as e:
+            logger.warning(f"Não foi possível abrir o cache de hashes '{self.db_path}': {e}")
+            self._conn = None
+        return self
+
+    def __exit__(self, *exc):
+        if self._conn is not None:
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO hashes (dev, ino, size, mtime_ns, partial, full) VALUES (?, ?, ?, ?, ?, ?)",
+                        ((dev, ino, *valores) for (dev, ino), valores in self._alterados.items()))
+            except sqlite3.Error as e:
+                logger.warning(f"Não foi possível gravar o cache de hashes '{self.db_path}': {e}")
+            finally:
+                self._conn.close()
+                self._conn = None
+        self._alterados = {}
+
+    def get(self, st, campo):
+        """Retorna o hash 'partial' ou 'full' em cache para o arquivo de stat 'st', ou None."""
+        chave = (st.st_dev, st.st_ino)
+        valores = self._alterados.get(chave)
+        if valores is None and self._conn is not None:
+            valores = self._conn.execute("SELECT size, mtime_ns, partial, full FROM hashes WHERE dev = ? AND ino = ?",
+                                         chave).fetchone()
+        if valores and valores[0] == st.st_size and valores[1] == st.st_mtime_ns:
+            valor = valores[2] if campo == "partial" else valores[3]
+            if valor is not None:
+                self.hits += 1
+                return valor
+        self.misses += 1
+        return None
+
+    def put(self, st, campo, valor):
+        chave = (st.st_dev, st.st_ino)
+        atual = self._alterados.get(chave)
+        if atual is None or atual[0] != st.st_size or atual[1] != st.st_mtime_ns:
+            anterior = None
+            if self._conn is not None:
+                anterior = self._conn.execute("SELECT size, mtime_ns, partial, full FROM hashes WHERE dev = ? AND ino = ?",
+                                              chave).fetchone()
+            if anterior and anterior[0] == st.st_size and anterior[1] == st.st_mtime_ns:
+                atual = anterior
+            else:
+                atual = (st.st_size, st.st_mtime_ns, None, None)
+        if campo == "partial":
+            atual = (atual[0], atual[1], valor, atual[3])
+        else:
+            atual = (atual[0], atual[1], atual[2], valor)
+        self._alterados[chave] = atual
+
+
+def partial_hash(caminho, tamanho):
+    """Hash das primeiras e últimas TAMANHO_AMOSTRA bytes do arquivo (e do tamanho)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(tamanho.to_bytes(8, 'little'))
+    with open(caminho, 'rb') as f:
+        digest.update(f.read(TAMANHO_AMOSTRA))
+        if tamanho > 2 * TAMANHO_AMOSTRA:
+            f.seek(tamanho - TAMANHO_AMOSTRA)
+        digest.update(f.read(TAMANHO_AMOSTRA))
+    return digest.hexdigest()
+
+
+def full_hash(caminho):
+    """Hash do conteúdo completo, lido em blocos com um buffer reaproveitado (nunca carrega o arquivo inteiro)."""
+    digest = hashlib.blake2b(digest_size=32)
+    buffer = bytearray(TAMANHO_BUFFER)
+    view = memoryview(buffer)
+    with open(caminho, 'rb', buffering=0) as f:
+        while True:
+            lidos = f.readinto(buffer)
+            if not lidos:
+                break
+            digest.update(view[:lidos])
+    return digest.hexdigest()
+
+
+def _group_by(candidatos, chave_funcao):
+    """Agrupa (caminho, st) por chave, descartando grupos unitários e preservando a ordem."""
+    grupos = {}
+    for candidato in candidatos:
+        try:
+            chave = chave_funcao(candidato)
+        except OSError as e:
+            logger.warning(f"Não foi possível ler '{candidato[0]}' para detectar duplicatas: {e}")
+            continue
+        grupos.setdefault(chave, []).append(candidato)
+    return [grupo for grupo in grupos.values() if len(grupo) > 1]
+
+
+def find_duplicates(candidatos, hash_cache=None):
+    """
+    Encontra arquivos com conteúdo idêntico entre 'candidatos' (lista de (caminho, os.stat_result)).
+    Etapas, cada uma aplicada só aos grupos que sobreviveram à anterior:
+    1. mesmo tamanho (sem ler o arquivo);
+    2. hash parcial do início e do fim;
+    3. hash completo.
+    Retorna uma lista de grupos de caminhos; o primeiro de cada grupo (ordem de 'candidatos') é o original.
+    """
+    def cached(campo, calcular):
+        def chave(candidato):
+            caminho, st = candidato
+            valor = hash_cache.get(st, campo) if hash_cache else None
+            if valor is None:
+                valor = calcular(caminho, st)
+                if hash_cache:
+                    hash_cache.put(st, campo, valor)
+            return valor
+        return chave
+
+    # Arquivos vazios são todos "iguais", mas não vale a pena tratá-los como duplicatas
+    por_tamanho = _group_by([c for c in candidatos if c[1].st_size > 0], lambda c: c[1].st_size)
+    grupos = []
+    for grupo in por_tamanho:
+        for parcial in _group_by(grupo, cached("partial", lambda caminho, st: partial_hash(caminho, st.st_size))):
+            if parcial[0][1].st_size <= 2 * TAMANHO_AMOSTRA:
+                grupos.append(parcial) # O hash parcial já cobriu o arquivo inteiro
+                continue
+            grupos.extend(_group_by(parcial, cached("full", lambda caminho, st: full_hash(caminho))))
+    return [[caminho for caminho, _ in grupo] for grupo in grupos]
+
+
+def mark_duplicates(planned_moves, mode, hash_cache=None):
+    """
+    Etapa opcional de deduplicação do planejamento.
+    Compara os arquivos planejados entre si e com os arquivos já existentes nas pastas de destino.
+
+    Args:
+        planned_moves (Plan): Plano de organize_files.
+        mode (str): DEDUP_REPORT, DEDUP_SKIP ou DEDUP_HARDLINK.
+        hash_cache (HashCache, optional): Cache de hashes já aberto.
+
+    Returns:
+        tuple: (Plan com os movimentos que seguem, lista de duplicatas {"arquivo", "origem", "original"}).
+               No modo DEDUP_HARDLINK os movimentos duplicados são marcados com Plan.set_hardlink.
+    """
+    plano = planned_moves
+    candidatos = []
+    indice_de = {} # caminho de origem -> índice no plano
+    for indice in range(len(plano)):
+        origem = plano.source_path(indice)
+        try:
+            candidatos.append((origem, os.stat(origem)))
+            indice_de[origem] = indice
+        except OSError as e:
+            logger.warning(f"Não foi possível ler '{origem}' para detectar duplicatas: {e}")
+    tamanhos = {st.st_size for _, st in candidatos}
+
+    # Arquivos já organizados entram primeiro, para serem considerados os originais
+    existentes = []
+    for pasta in plano.destination_folders():
+        try:
+            with os.scandir(pasta) as iterator:
+                for entry in iterator:
+                    if entry.is_file(follow_symlinks=False):
+                        st = entry.stat(follow_symlinks=False)
+                        if st.st_size in tamanhos:
+                            existentes.append((entry.path, st))
+        except FileNotFoundError:
+            continue
+
+    stat_de = dict(existentes + candidatos)
+    duplicatas = []
+    descartados = set()
+    for grupo in find_duplicates(existentes + candidatos, hash_cache):
+        original = grupo[0]
+        for caminho in grupo[1:]:
+            indice = indice_de.get(caminho)
+            if indice is None:
+                continue # Arquivo já existente no destino
+            logger.info("  Duplicata: '%s' tem o mesmo conteúdo de '%s'", plano.name(indice), original)
+            duplicatas.append({"arquivo": plano.name(indice), "origem": caminho, "original": original})
+            if mode == DEDUP_SKIP:
+                descartados.add(indice)
+            elif mode == DEDUP_HARDLINK:
+                plano.set_hardlink(indice, original, (_version(stat_de[caminho]), _version(stat_de[original])))
+
+    if descartados:
+        plano = plano.subset(indice for indice in range(len(plano)) if indice not in descartados)
+    return plano, duplicatas
+
+
+def _version(st):
+    """Versão de um arquivo comparada antes do link físico: (tamanho, mtime_ns)."""
+    return (st.st_size, st.st_mtime_ns)
+
+
+def _changed(caminho, esperado):
+    """Indica se o arquivo mudou (ou sumiu) desde a comparação de conteúdo que gerou 'esperado'."""
+    try:
+        return _version(os.stat(caminho)) != esperado
+    except OSError:
+        return True
+
+
+def link_duplicates(planned_moves, journal=None):
+    """
+    Substitui cada origem marcada para link físico (Plan.set_hardlink) por um link para o
+    original, antes de qualquer movimento (enquanto os caminhos originais ainda são válidos).
+    O movimento em si continua normal; o espaço da cópia duplicada é liberado.
+    Imediatamente antes do link e da substituição, o tamanho e o mtime dos dois arquivos são
+    comparados com os da detecção: um arquivo alterado depois do hash não é substituído.
+    Com 'journal' (MoveJournal), cada link é registrado antes de ser criado, para que o undo
+    devolva uma cópia independente no lugar do link.
+    Falhas (ex: dispositivos diferentes, sistema sem suporte) mantêm o arquivo como está.
+    """
+    plano = planned_moves
+    for indice, original in plano.hardlinks():
+        origem = plano.source_path(indice)
+        temporario = origem + ".organizer-link"
+        verificacao = plano.hardlink_check(indice)
+        try:
+            st_original = os.stat(original)
+            if verificacao is not None and (_changed(origem, verificacao[0]) or
+                                            _version(st_original) != verificacao[1]):
+                logger.warning(f"'{origem}' ou '{original}' mudou desde a detecção de duplicatas. "
+                               f"O arquivo será movido normalmente.")
+                continue
+            if journal:
+                journal.record_link(origem, st_original)
+            os.link(original, temporario)
+            if verificacao is not None and (_changed(origem, verificacao[0]) or _changed(original, verificacao[1])):
+                os.remove(temporario)
+                logger.warning(f"'{origem}' ou '{original}' mudou durante a criação do link físico. "
+                               f"O arquivo será movido normalmente.")
+                continue
+            os.replace(temporario, origem)
+            logger.info("  '%s' substituído por link físico para '%s'", plano.name(indice), original)
+        except OSError as e:
+            logger.warning(f"Não foi possível criar link físico para '{origem}': {e}. O arquivo será movido normalmente.")
+            try:
+                os.remove(temporario)
+            except OSError:
+                pass
@@ -0,0 +1,452 @@
+# src/core/journal.py
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+
+from core.mover import FileMover
+
+logger = logging.getLogger('files_organizer_py')
+
+LOTE_FSYNC_REGISTROS = 256 # Registros gravados entre dois fsync do diário
+INTERVALO_FSYNC = 1.0 # Segundos máximos entre dois fsync do diário
+DIARIOS_MANTIDOS = 50 # Diários concluídos mantidos na pasta (os mais antigos são removidos)
+BLOCO_LEITURA_FINAL = 4096 # Bytes lidos por vez, a partir do fim, para achar a última linha de um diário
+
+# Eventos de um diário (uma linha JSON compacta por evento)
+EVENTO_INICIO = "begin"     # {"event", "folder", "pid", "ts"}
+EVENTO_PASTA = "mkdir"      # {"event", "path"}: pasta de destino criada pela execução
+EVENTO_MOVIMENTO = "move"   # {"event", "id", "src", "dst"}: gravado antes de mover
+EVENTO_CONCLUIDO = "done"   # {"event", "id"}
+EVENTO_ERRO = "error"       # {"event", "id"}
+EVENTO_DESFEITO = "undone"  # {"event", "id"}: arquivo devolvido à origem
+EVENTO_LINK = "link"        # {"event", "path", "dev", "ino"}: duplicata substituída por link físico (dedup)
+EVENTO_FIM = "end"          # {"event", "ts"} (com "recovered" se fechado pela recuperação)
+
+
+class MoveJournal:
+    """
+    Diário de movimentos de uma execução, somente de acréscimo (JSON lines).
+
+    Antes de cada movimento é gravado o par origem/destino final (já reservado pelo
+    NameAllocator) e, depois, o resultado. Cada registro é uma única chamada write() com
+    O_APPEND, então um processo interrompido deixa, no máximo, a última linha incompleta.
+    O fsync é feito em lotes (LOTE_FSYNC_REGISTROS registros ou INTERVALO_FSYNC segundos) e
+    no fechamento. Pode ser compartilhado entre as threads de execute_moves.
+    """
+    def __init__(self, path, flush_every=LOTE_FSYNC_REGISTROS, flush_seconds=INTERVALO_FSYNC):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+        self._terminate_partial_line()
+        self._lock = threading.Lock()
+        self._proximo_id = 1
+        self._nao_sincronizados = 0
+        self._ultimo_fsync = time.monotonic()
+
+    @classmethod
+    def create(cls, journal_dir, folder):
+        """Cria um diário novo em 'journal_dir' para uma execução sobre 'folder'."""
+        os.makedirs(journal_dir, exist_ok=True)
+        _prune_journals(journal_dir, DIARIOS_MANTIDOS - 1)
+        nome = datetime.now().strftime("journal_%Y%m%d_%H%M%S_%f") + f"_{os.getpid()}.jsonl"
+        journal = cls(os.path.join(journal_dir, nome))
+        journal._append({"event": EVENTO_INICIO, "folder": folder, "pid": os.getpid(), "ts": time.time()})
+        return journal
+
+    def _terminate_partial_line(self):
+        """Ao reabrir um diário interrompido no meio de uma escrita, encerra a linha incompleta."""
+        tamanho = os.fstat(self._fd).st_size
+        if tamanho:
+            with open(self.path, 'rb') as f:
+                f.seek(tamanho - 1)
+                if f.read(1) != b'\n':
+                    os.write(self._fd, b'\n')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _append(self, registro):
+        linha = (json.dumps(registro, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+        with self._lock:
+            os.write(self._fd, linha)
+            self._nao_sincronizados += 1
+            if (self._nao_sincronizados >= self.flush_every or
+                    time.monotonic() - self._ultimo_fsync >= self.flush_seconds):
+                self._fsync()
+
+    def _fsync(self):
+        os.fsync(self._fd)
+        self._nao_sincronizados = 0
+        self._ultimo_fsync = time.monotonic()
+
+    def record_mkdir(self, path):
+        self._append({"event": EVENTO_PASTA, "path": path})
+
+    def record_link(self, path, st_original):
+        """Registra que 'path' vai virar um link físico para o arquivo de stat 'st_original'."""
+        self._append({"event": EVENTO_LINK, "path": path, "dev": st_original.st_dev, "ino": st_original.st_ino})
+
+    def record_move(self, src, dst):
+        """Registra a intenção de mover 'src' para 'dst' e retorna o id do movimento."""
+        with self._lock:
+            id_movimento = self._proximo_id
+            self._proximo_id += 1
+        self._append({"event": EVENTO_MOVIMENTO, "id": id_movimento, "src": src, "dst": dst})
+        return id_movimento
+
+    def record_outcome(self, id_movimento, evento):
+        self._append({"event": evento, "id": id_movimento})
+
+    def flush(self):
+        with self._lock:
+            self._fsync()
+
+    def close(self, recovered=False):
+        """Grava o registro de fim, sincroniza e fecha o diário."""
+        if self._fd is None:
+            return
+        registro = {"event": EVENTO_FIM, "ts": time.time()}
+        if recovered:
+            registro["recovered"] = True
+        self._append(registro)
+        with self._lock:
+            self._fsync()
+            os.close(self._fd)
+            self._fd = None
+
+
+def _prune_journals(journal_dir, keep):
+    """Remove os diários concluídos mais antigos, mantendo os 'keep' mais recentes."""
+    diarios = list_journals(journal_dir)
+    for caminho in diarios[keep:]:
+        try:
+            concluido = peek_journal(caminho)["ended"]
+        except OSError:
+            continue
+        if concluido:
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+
+
+def list_journals(journal_dir, folder=None):
+    """Lista os diários de 'journal_dir' (opcionalmente só os da pasta 'folder'), do mais recente ao mais antigo."""
+    try:
+        with os.scandir(journal_dir) as iterator:
+            diarios = [(entry.stat().st_mtime_ns, entry.name, entry.path) for entry in iterator
+                       if entry.name.startswith('journal_') and entry.name.endswith('.jsonl')]
+    except FileNotFoundError:
+        return []
+    diarios.sort(reverse=True)
+    caminhos = [caminho for _, _, caminho in diarios]
+    if folder is not None:
+        pasta = os.path.normcase(os.path.abspath(folder))
+        caminhos = [caminho for caminho in caminhos
+                    if os.path.normcase(_journal_folder(caminho) or "") == pasta]
+    return caminhos
+
+
+def _journal_folder(caminho):
+    try:
+        return peek_journal(caminho)["folder"]
+    except OSError:
+        return None
+
+
+def peek_journal(path):
+    """
+    Lê só o registro de início (primeira linha) e o último registro de um diário, sem percorrer
+    os movimentos: o custo não depende do tamanho do diário.
+    Retorna {"folder", "pid", "ended"}; "ended" indica que o último registro é o de fim.
+    """
+    estado = {"folder": None, "pid": None, "ended": False}
+    with open(path, 'rb') as f:
+        registro = _parse_line(f.readline())
+        if registro is not None and registro.get("event") == EVENTO_INICIO:
+            estado["folder"] = registro.get("folder")
+            estado["pid"] = registro.get("pid")
+        registro = _parse_line(_last_line(f))
+        estado["ended"] = registro is not None and registro.get("event") == EVENTO_FIM
+    return estado
+
+
+def _parse_line(linha):
+    try:
+        registro = json.loads(linha)
+    except ValueError:
+        return None
+    return registro if isinstance(registro, dict) else None
+
+
+def _last_line(f):
+    """Retorna a última linha do arquivo 'f', lendo blocos a partir do fim."""
+    fim = f.seek(0, os.SEEK_END)
+    if fim == 0:
+        return b""
+    final = b""
+    posicao = fim
+    while posicao > 0:
+        inicio = max(0, posicao - BLOCO_LEITURA_FINAL)
+        f.seek(inicio)
+        final = f.read(posicao - inicio) + final
+        posicao = inicio
+        # Uma última linha sem '\n' está incompleta (escrita interrompida) e não é considerada
+        quebra = final.rfind(b'\n', 0, len(final) - 1)
+        if quebra >= 0:
+            return final[quebra + 1:]
+    return final
+
+
+def read_journal(path):
+    """
+    Lê um diário e reconstrói o estado de cada movimento.
+    Retorna {"folder", "pid", "ended", "folders" (pastas criadas), "links" (links físicos criados)
+    e "moves" {id: {"src", "dst", "status"}}}.
+    Uma última linha incompleta (processo interrompido durante a escrita) é ignorada.
+    """
+    estado = {"folder": None, "pid": None, "ended": False, "folders": [], "links": [], "moves": {}}
+    with open(path, 'rb') as f:
+        for linha in f:
+            try:
+                registro = json.loads(linha)
+            except ValueError:
+                continue
+            evento = registro.get("event")
+            if evento == EVENTO_INICIO:
+                estado["folder"] = registro.get("folder")
+                estado["pid"] = registro.get("pid")
+            elif evento == EVENTO_PASTA:
+                estado["folders"].append(registro["path"])
+            elif evento == EVENTO_LINK:
+                estado["links"].append(registro)
+            elif evento == EVENTO_MOVIMENTO:
+                estado["moves"][registro["id"]] = {"src": registro["src"], "dst": registro["dst"], "status": "pending"}
+            elif evento in (EVENTO_CONCLUIDO, EVENTO_ERRO, EVENTO_DESFEITO):
+                movimento = estado["moves"].get(registro["id"])
+                if movimento is not None:
+                    movimento["status"] = evento
+            elif evento == EVENTO_FIM:
+                estado["ended"] = True
+    return estado
+
+
+def _process_alive(pid):
+    """Indica se o processo 'pid' (que criou um diário) ainda está em execução."""
+    if not pid:
+        return False
+    if pid == os.getpid():
+        return True
+    if sys.platform == 'win32':
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid) # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        try:
+            codigo = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(codigo))
+            return codigo.value == 259 # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _resolve_pending(movimento):
+    """
+    Decide, pelo estado do disco, o resultado de um movimento interrompido (registrado mas sem resultado).
+    Retorna EVENTO_CONCLUIDO se o arquivo já está no destino ou EVENTO_ERRO se ficou na origem;
+    nesse caso a reserva (ou cópia parcial) no destino é removida.
+    """
+    src, dst = movimento["src"], movimento["dst"]
+    existe_origem = os.path.lexists(src)
+    existe_destino = os.path.lexists(dst)
+    if not existe_origem and existe_destino:
+        return EVENTO_CONCLUIDO
+    if existe_origem and existe_destino:
+        # Reserva vazia ou cópia entre dispositivos não concluída: a origem continua íntegra
+        try:
+            os.remove(dst)
+        except OSError as e:
+            logger.error(f"Não foi possível remover o destino incompleto '{dst}': {e}")
+    elif not existe_origem:
+        logger.error(f"Movimento interrompido de '{src}' para '{dst}': arquivo não encontrado em nenhum dos dois.")
+    return EVENTO_ERRO
+
+
+def recover_interrupted(journal_dir):
+    """
+    Executada na inicialização: encontra diários sem registro de fim cujo processo não está mais
+    em execução (queda ou encerramento forçado), resolve os movimentos que estavam em andamento
+    (concluindo-os ou revertendo-os pelo estado do disco) e fecha o diário.
+    Os arquivos já movidos continuam no destino e podem ser devolvidos com undo_journal.
+    Retorna a lista de caminhos dos diários recuperados.
+    """
+    recuperados = []
+    for caminho in list_journals(journal_dir):
+        try:
+            # Só o início e o fim são lidos: o diário inteiro apenas quando há algo a recuperar
+            resumo = peek_journal(caminho)
+            if resumo["ended"] or _process_alive(resumo["pid"]):
+                continue
+            estado = read_journal(caminho)
+        except OSError as e:
+            logger.warning(f"Não foi possível ler o diário '{caminho}': {e}")
+            continue
+        logger.warning(f"Execução interrompida encontrada em '{estado['folder']}' (diário '{caminho}'). Recuperando...")
+        journal = MoveJournal(caminho)
+        concluidos = revertidos = 0
+        for id_movimento, movimento in estado["moves"].items():
+            if movimento["status"] != "pending":
+                continue
+            resultado = _resolve_pending(movimento)
+            journal.record_outcome(id_movimento, resultado)
+            if resultado == EVENTO_CONCLUIDO:
+                concluidos += 1
+            else:
+                revertidos += 1
+        journal.close(recovered=True)
+        movidos = sum(1 for movimento in estado["moves"].values() if movimento["status"] == EVENTO_CONCLUIDO)
+        logger.warning(f"Recuperação concluída: {movidos + concluidos} arquivo(s) no destino, "
+                       f"{concluidos} movimento(s) em andamento concluído(s), {revertidos} revertido(s).")
+        recuperados.append(caminho)
+    return recuperados
+
+
+def _break_link(link):
+    """
+    Devolve uma cópia independente no lugar de um link físico criado pela deduplicação
+    (registro EVENTO_LINK), se o arquivo em 'path' ainda for esse link. Retorna True se copiou.
+    """
+    import shutil # Importado só quando há links a desfazer
+    caminho = link["path"]
+    try:
+        st = os.lstat(caminho)
+    except OSError:
+        return False # Não foi devolvido (ou já não existe)
+    if (st.st_dev, st.st_ino) != (link["dev"], link["ino"]) or st.st_nlink < 2:
+        return False # O link não chegou a ser criado ou já foi desfeito
+    temporario = caminho + ".organizer-copy"
+    try:
+        shutil.copy2(caminho, temporario)
+        os.replace(temporario, caminho)
+    except OSError as e:
+        logger.error(f"  !!! Não foi possível separar o link físico '{caminho}': {e}")
+        try:
+            os.remove(temporario)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def undo_journal(path, max_workers=None):
+    """
+    Desfaz uma execução: devolve cada arquivo movido à origem, em ordem inversa, e remove as
+    pastas de destino criadas pela execução se ficarem vazias.
+    Com 'max_workers' > 1 os arquivos são devolvidos em paralelo (origens e destinos de uma
+    execução são todos distintos). Cada arquivo devolvido é registrado no próprio diário, então
+    um undo interrompido pode ser repetido sem efeitos duplicados.
+    Um arquivo nunca sobrescreve outro que já ocupe a origem; nesse caso ele é mantido no destino.
+    Duplicatas que a execução substituiu por links físicos voltam como cópias independentes.
+
+    Returns:
+        dict: {"status": "done", "restored", "errors", "skipped"}
+    """
+    estado = read_journal(path)
+    if not estado["ended"] and _process_alive(estado["pid"]):
+        logger.error(f"O diário '{path}' pertence a uma execução em andamento.")
+        return {"status": "error", "message": "Execução em andamento.", "restored": 0, "errors": 0, "skipped": 0}
+
+    journal = MoveJournal(path)
+    # Movimentos interrompidos são resolvidos antes, como na recuperação
+    for id_movimento, movimento in estado["moves"].items():
+        if movimento["status"] == "pending":
+            movimento["status"] = _resolve_pending(movimento)
+            journal.record_outcome(id_movimento, movimento["status"])
+
+    movimentos = [(id_movimento, movimento) for id_movimento, movimento in sorted(estado["moves"].items(), reverse=True)
+                  if movimento["status"] == EVENTO_CONCLUIDO]
+    logger.info(f"Desfazendo {len(movimentos)} movimento(s) do diário '{path}'...")
+    contadores = {"restored": 0, "errors": 0, "skipped": 0}
+    lock = threading.Lock()
+    mover = FileMover()
+
+    def restore(item):
+        id_movimento, movimento = item
+        src, dst = movimento["src"], movimento["dst"]
+        if not os.path.lexists(dst):
+            logger.warning(f"  '{dst}' não existe mais. Ignorado.")
+            resultado = "skipped"
+        else:
+            try:
+                os.makedirs(os.path.dirname(src), exist_ok=True)
+                # Reserva a origem: falha se outro arquivo já ocupa o nome
+                os.close(os.open(src, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            except FileExistsError:
+                logger.warning(f"  '{src}' já existe. '{dst}' foi mantido no destino.")
+                resultado = "skipped"
+            except OSError as e:
+                logger.error(f"  !!! Não foi possível devolver '{dst}' para '{src}': {e}")
+                resultado = "errors"
+            else:
+                def desfeito(sucesso):
+                    # Como na execução, uma devolução entre dispositivos só é registrada após o fsync
+                    if sucesso:
+                        journal.record_outcome(id_movimento, EVENTO_DESFEITO)
+
+                try:
+                    mover.move(dst, src, desfeito)
+                    logger.info("  Devolvido: '%s' -> '%s'", dst, src)
+                    resultado = "restored"
+                except OSError as e:
+                    try:
+                        os.remove(src)
+                    except OSError:
+                        pass
+                    logger.error(f"  !!! Não foi possível devolver '{dst}' para '{src}': {e}")
+                    resultado = "errors"
+        with lock:
+            contadores[resultado] += 1
+
+    try:
+        if max_workers and max_workers > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(restore, movimentos))
+        else:
+            for item in movimentos:
+                restore(item)
+    finally:
+        mover.close()
+        journal.close()
+
+    # Os links só são separados depois que os arquivos voltaram à origem
+    separados = sum(_break_link(link) for link in reversed(estado["links"]))
+    if separados:
+        logger.info(f"{separados} link(s) físico(s) da deduplicação substituído(s) por cópias independentes.")
+
+    for pasta in reversed(estado["folders"]):
+        try:
+            os.rmdir(pasta)
+        except OSError:
+            pass # Não vazia (ou já removida)
+
+    logger.info(f"Desfazer concluído. Devolvidos: {contadores['restored']}, erros: {contadores['errors']}, "
+                f"ignorados: {contadores['skipped']}.")
+    return dict(status="done", **contadores)
@@ -0,0 +1,148 @@
+# src/core/metrics.py
+
+import time
+import errno
+import heapq
+import threading
+import contextlib
+
+MAIS_LENTOS_PADRAO = 10 # Quantos movimentos mais lentos RunMetrics guarda
+
+
+def error_class(erro):
+    """Classe de um erro para agregação: o tipo da exceção e, se houver, o código errno (ex: 'OSError [ENOSPC]')."""
+    nome = type(erro).__name__
+    codigo = getattr(erro, 'errno', None)
+    if codigo in errno.errorcode:
+        nome += f" [{errno.errorcode[codigo]}]"
+    return nome
+
+
+class MetricsHook:
+    """
+    Gancho de métricas aceito por organize_files e execute_moves (parâmetro 'metrics').
+    Os métodos padrão não fazem nada: basta sobrescrever os que interessam (ex: para enviar
+    as medições a um sistema de monitoramento). Sem gancho (metrics=None), o núcleo não
+    consulta o relógio nem faz nenhuma chamada extra.
+
+    Fases medidas: 'load_config', 'scan', 'classify', 'sniff', 'dedup' (organize_files) e
+    'naming', 'move', 'execute' (execute_moves). Com threads (max_workers), 'naming' e 'move'
+    somam o tempo de todas as threads; 'execute' é o tempo total da execução.
+    Os métodos podem ser chamados de várias threads ao mesmo tempo.
+    """
+    def add_time(self, fase, segundos):
+        """Acrescenta 'segundos' ao tempo acumulado da fase."""
+
+    def record_move(self, categoria, origem, tamanho, segundos):
+        """Um arquivo de 'tamanho' bytes foi movido para 'categoria' em 'segundos'."""
+
+    def record_error(self, categoria, origem, erro):
+        """O movimento de 'origem' para 'categoria' falhou com a exceção 'erro'."""
+
+    @contextlib.contextmanager
+    def phase(self, fase):
+        """Mede o bloco 'with' como tempo da fase."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(fase, time.perf_counter() - inicio)
+
+
+class RunMetrics(MetricsHook):
+    """
+    Implementação padrão do gancho: acumula as fases, a vazão por categoria, os movimentos
+    mais lentos e a contagem de erros por classe. Usada pelo --profile da CLI.
+    """
+    def __init__(self, slowest=MAIS_LENTOS_PADRAO):
+        self.slowest_count = slowest
+        self._lock = threading.Lock()
+        self._fases = {}
+        self._categorias = {}
+        self._mais_lentos = [] # Heap mínimo de (segundos, origem, categoria, tamanho)
+        self._erros = {}
+
+    def add_time(self, fase, segundos):
+        with self._lock:
+            self._fases[fase] = self._fases.get(fase, 0.0) + segundos
+
+    def record_move(self, categoria, origem, tamanho, segundos):
+        item = (segundos, origem, categoria, tamanho)
+        with self._lock:
+            self._fases["move"] = self._fases.get("move", 0.0) + segundos
+            totais = self._categorias.get(categoria)
+            if totais is None:
+                totais = self._categorias[categoria] = {"files": 0, "bytes": 0, "seconds": 0.0, "errors": 0}
+            totais["files"] += 1
+            totais["bytes"] += tamanho
+            totais["seconds"] += segundos
+            if len(self._mais_lentos) < self.slowest_count:
+                heapq.heappush(self._mais_lentos, item)
+            elif self.slowest_count and segundos > self._mais_lentos[0][0]:
+                heapq.heapreplace(self._mais_lentos, item)
+
+    def record_error(self, categoria, origem, erro):
+        classe = error_class(erro)
+        with self._lock:
+            self._erros[classe] = self._erros.get(classe, 0) + 1
+            totais = self._categorias.setdefault(categoria, {"files": 0, "bytes": 0, "seconds": 0.0, "errors": 0})
+            totais["errors"] += 1
+
+    def summary(self):
+        """Resumo serializável em JSON: fases, categorias (com arquivos/s e MB/s), mais lentos e erros."""
+        with self._lock:
+            categorias = {}
+            for categoria, totais in self._categorias.items():
+                segundos = totais["seconds"]
+                categorias[categoria] = dict(totais,
+                                             files_per_second=totais["files"] / segundos if segundos else 0.0,
+                                             mb_per_second=totais["bytes"] / segundos / 1e6 if segundos else 0.0)
+            return {
+                "phases": dict(self._fases),
+                "categories": categorias,
+                "slowest": [{"path": origem, "category": categoria, "bytes": tamanho, "seconds": segundos}
+                            for segundos, origem, categoria, tamanho in sorted(self._mais_lentos, reverse=True)],
+                "errors": dict(self._erros),
+            }
+
+    def report(self):
+        """Resumo em texto, para o terminal."""
+        resumo = self.summary()
+        linhas = ["Fases:"]
+        for fase, segundos in resumo["phases"].items():
+            linhas.append(f"  {fase:<12}{segundos:>10.3f}s")
+        if resumo["categories"]:
+            linhas.append("Categorias:")
+            for categoria, totais in sorted(resumo["categories"].items(), key=lambda item: -item[1]["seconds"]):
+                linhas.append(f"  {categoria:<20}{totais['files']:>8} arq.{totais['bytes'] / 1e6:>10.1f} MB"
+                              f"{totais['files_per_second']:>10.1f} arq./s{totais['mb_per_second']:>9.1f} MB/s"
+                              + (f"  {totais['errors']} erro(s)" if totais["errors"] else ""))
+        if resumo["slowest"]:
+            linhas.append("Movimentos mais lentos:")
+            for item in resumo["slowest"]:
+                linhas.append(f"  {item['seconds'] * 1000:>9.1f} ms  {item['bytes'] / 1e6:>8.1f} MB  {item['path']}")
+        if resumo["errors"]:
+            linhas.append("Erros:")
+            for classe, quantidade in sorted(resumo["errors"].items(), key=lambda item: -item[1]):
+                linhas.append(f"  {quantidade:>6}  {classe}")
+        return "\n".join(linhas)
+
+
+class TimedClassifier:
+    """
+    Envolve um classificador e acumula o tempo gasto em classify, para separar a
+    classificação da varredura em organize_files. Os demais atributos são do classificador original.
+    """
+    def __init__(self, classifier):
+        self._classifier = classifier
+        self.seconds = 0.0
+
+    def classify(self, nome_arquivo, stat=None):
+        inicio = time.perf_counter()
+        try:
+            return self._classifier.classify(nome_arquivo, stat=stat)
+        finally:
+            self.seconds += time.perf_counter() - inicio
+
+    def __getattr__(self, nome):
+        return getattr(self._classifier, nome)
@@ -0,0 +1,215 @@
+# src/core/mover.py
+
+import os
+import sys
+import time
+import errno
+import logging
+import threading
+
+logger = logging.getLogger('files_organizer_py')
+
+TAMANHO_BLOCO_COPIA = 8 * 1024 * 1024 # Blocos grandes reduzem o número de chamadas em cópias entre dispositivos
+LOTE_FSYNC_ARQUIVOS = 64
+LOTE_FSYNC_BYTES = 256 * 1024 * 1024
+
+# Erros que indicam que a chamada de cópia acelerada não é suportada para este par de arquivos
+_ERROS_SEM_SUPORTE = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF, errno.ENOTSUP}
+
+
+class FileMover:
+    """
+    Move arquivos escolhendo o caminho mais barato para cada par origem/destino.
+
+    - Mesmo dispositivo: os.replace (renomeação atômica, sem cópia de dados).
+    - Dispositivos diferentes: cópia em blocos grandes (copy_file_range/sendfile quando
+      disponíveis), com fsync agrupado em lotes. As origens só são apagadas depois que o
+      lote de destinos foi gravado em disco, então uma queda no meio deixa, no máximo,
+      arquivos duplicados, nunca perdidos.
+
+    Quem precisa saber quando o movimento está garantido em disco (ex: o diário) passa
+    'on_complete' a move(): a função é chamada na hora para renomeações e, para cópias, só no
+    flush do lote, com False se o fsync falhar (a cópia é removida e a origem mantida). Um erro
+    da própria função é registrado no log e nunca desfaz um movimento já concluído.
+
+    O dispositivo (st_dev) de cada pasta é consultado uma única vez.
+    Métricas de arquivos, bytes e tempo são acumuladas por caminho ('rename' e 'copy').
+    Pode ser compartilhado entre threads.
+    """
+    def __init__(self, fsync_batch_files=LOTE_FSYNC_ARQUIVOS, fsync_batch_bytes=LOTE_FSYNC_BYTES):
+        self.fsync_batch_files = fsync_batch_files
+        self.fsync_batch_bytes = fsync_batch_bytes
+        self._dispositivos = {}
+        self._pendentes = [] # (fd do destino, destino, origem, on_complete)
+        self._bytes_pendentes = 0
+        self._lock = threading.Lock()
+        self.metrics = {
+            "rename": {"files": 0, "bytes": 0, "seconds": 0.0},
+            "copy": {"files": 0, "bytes": 0, "seconds": 0.0},
+        }
+
+    def _device_of(self, pasta):
+        dispositivo = self._dispositivos.get(pasta)
+        if dispositivo is None:
+            dispositivo = self._dispositivos[pasta] = os.stat(pasta).st_dev
+        return dispositivo
+
+    def _record(self, caminho, tamanho, segundos):
+        with self._lock:
+            metricas = self.metrics[caminho]
+            metricas["files"] += 1
+            metricas["bytes"] += tamanho
+            metricas["seconds"] += segundos
+
+    def move(self, origem, destino, on_complete=None):
+        """
+        Move 'origem' para 'destino' (que pode ser o arquivo vazio reservado pelo NameAllocator).
+        'on_complete(sucesso)' é chamada quando o resultado está em disco (veja a classe).
+        """
+        inicio = time.perf_counter()
+        if self._device_of(os.path.dirname(origem)) == self._device_of(os.path.dirname(destino)):
+            try:
+                os.replace(origem, destino)
+            except OSError as e:
+                # Pontos de montagem diferentes do mesmo sistema de arquivos também retornam EXDEV
+                if e.errno != errno.EXDEV:
+                    raise
+            else:
+                self._record("rename", 0, time.perf_counter() - inicio)
+                _notify(on_complete, True, destino)
+                return
+        self._copy(origem, destino, inicio, on_complete)
+
+    def _copy(self, origem, destino, inicio, on_complete):
+        fd_destino = os.open(destino, os.O_WRONLY | os.O_TRUNC | getattr(os, 'O_BINARY', 0))
+        try:
+            with open(origem, 'rb') as fsrc:
+                tamanho = _copy_data(fsrc.fileno(), fd_destino, fsrc)
+            import shutil # Só as cópias entre dispositivos precisam dele (shutil importa zlib, bz2, lzma)
+            shutil.copystat(origem, destino)
+        except BaseException:
+            os.close(fd_destino)
+            raise
+
+        self._record("copy", tamanho, time.perf_counter() - inicio)
+        with self._lock:
+            self._pendentes.append((fd_destino, destino, origem, on_complete))
+            self._bytes_pendentes += tamanho
+            lote_cheio = (len(self._pendentes) >= self.fsync_batch_files or
+                          self._bytes_pendentes >= self.fsync_batch_bytes)
+        if lote_cheio:
+            self.flush()
+
+    def flush(self):
+        """
+        Grava em disco o lote de cópias pendentes e só então remove os arquivos de origem.
+        Uma cópia cujo fsync falha é removida (a origem continua íntegra) e informada como falha.
+        """
+        with self._lock:
+            pendentes, self._pendentes = self._pendentes, []
+            self._bytes_pendentes = 0
+        if not pendentes:
+            return
+
+        inicio = time.perf_counter()
+        gravados = []
+        falhas = []
+        for fd_destino, destino, origem, on_complete in pendentes:
+            try:
+                os.fsync(fd_destino)
+                gravados.append((destino, origem, on_complete))
+            except OSError as e:
+                logger.error(f"  !!! Falha ao gravar '{destino}' em disco: {e}. A origem '{origem}' foi mantida.")
+                falhas.append((destino, on_complete))
+            finally:
+                os.close(fd_destino)
+        for destino, on_complete in falhas:
+            try:
+                os.remove(destino) # Depois de fechado (no Windows um arquivo aberto não é removido)
+            except OSError:
+                pass
+            _notify(on_complete, False, destino)
+        if sys.platform != 'win32':
+            for pasta in {os.path.dirname(destino) for destino, _, _ in gravados}:
+                try:
+                    fd_pasta = os.open(pasta, os.O_RDONLY)
+                    try:
+                        os.fsync(fd_pasta)
+                    finally:
+                        os.close(fd_pasta)
+                except OSError as e:
+                    logger.warning(f"Não foi possível sincronizar a pasta '{pasta}': {e}")
+        for destino, origem, on_complete in gravados:
+            try:
+                os.remove(origem)
+            except OSError as e:
+                logger.error(f"  !!! Copiado para '{destino}', mas não foi possível remover a origem '{origem}': {e}")
+            # O destino já está em disco: o movimento está concluído mesmo que a origem tenha ficado
+            _notify(on_complete, True, destino)
+        with self._lock:
+            self.metrics["copy"]["seconds"] += time.perf_counter() - inicio
+
+    def close(self):
+        """Conclui as cópias pendentes. Deve ser chamado ao fim de cada execução."""
+        self.flush()
+
+    def summary(self):
+        """Retorna as métricas por caminho com a vazão (arquivos/s e MB/s) calculada."""
+        resumo = {}
+        with self._lock:
+            for caminho, metricas in self.metrics.items():
+                segundos = metricas["seconds"]
+                resumo[caminho] = dict(metricas,
+                                       files_per_second=metricas["files"] / segundos if segundos else 0.0,
+                                       mb_per_second=metricas["bytes"] / segundos / 1e6 if segundos else 0.0)
+        return resumo
+
+
+def _notify(on_complete, sucesso, destino):
+    """
+    Chama 'on_complete(sucesso)'. Uma falha da função (ex: diário sem espaço) é apenas registrada:
+    o arquivo já está no destino e nunca pode ser removido por causa dela.
+    """
+    if on_complete is None:
+        return
+    try:
+        on_complete(sucesso)
+    except Exception as e:
+        logger.error(f"  !!! '{destino}' foi movido, mas o registro do resultado falhou: {e}")
+
+
+_buffers = threading.local()
+
+
+def _copy_data(fd_origem, fd_destino, fsrc):
+    """Copia o conteúdo de 'fd_origem' para 'fd_destino' e retorna o número de bytes copiados."""
+    total = 0
+    # copy_file_range permite cópias no próprio servidor/sistema de arquivos (NFS 4.2, reflink)
+    for funcao in ("copy_file_range", "sendfile"):
+        if not hasattr(os, funcao) or not sys.platform.startswith('linux'):
+            continue
+        try:
+            while True:
+                if funcao == "copy_file_range":
+                    copiados = os.copy_file_range(fd_origem, fd_destino, TAMANHO_BLOCO_COPIA)
+                else:
+                    copiados = os.sendfile(fd_destino, fd_origem, None, TAMANHO_BLOCO_COPIA)
+                if copiados == 0:
+                    return total
+                total += copiados
+        except OSError as e:
+            if total or e.errno not in _ERROS_SEM_SUPORTE:
+                raise
+    # Fallback portátil: leitura/escrita com um buffer grande reaproveitado por thread
+    buffer = getattr(_buffers, "buffer", None)
+    if buffer is None:
+        buffer = _buffers.buffer = bytearray(TAMANHO_BLOCO_COPIA)
+    view = memoryview(buffer)
+    while True:
+        lidos = fsrc.readinto(buffer)
+        if not lidos:
+            return total
+        escritos = 0
+        while escritos < lidos:
+            escritos += os.write(fd_destino, view[escritos:lidos])
+        total += lidos
@@ -0,0 +1,76 @@
+# src/core/name_allocator.py
+
+import os
+import logging
+
+logger = logging.getLogger('files_organizer_py')
+
+
+class NameAllocator:
+    """
+    Aloca nomes únicos dentro de uma pasta de destino sem sondar o disco a cada tentativa.
+
+    A pasta é listada uma única vez (snapshot); a partir daí os nomes ocupados ficam em um
+    conjunto em memória e, para cada nome base, é guardado o próximo contador livre.
+    Assim, mil arquivos 'IMG_0001.jpg' custam mil consultas em memória em vez de
+    1 + 2 + ... + 1000 chamadas a os.path.exists.
+
+    Segue a mesma convenção de get_unique_filename: 'foto.jpg' -> 'foto (1).jpg' -> 'foto (2).jpg'.
+    """
+    def __init__(self, destination_path):
+        self.destination_path = destination_path
+        self._ocupados = None # Preenchido no primeiro uso
+        self._proximo_contador = {}
+
+    def _snapshot(self):
+        """Lista a pasta de destino uma única vez, criando-a se ainda não existir."""
+        if self._ocupados is None:
+            try:
+                with os.scandir(self.destination_path) as iterator:
+                    self._ocupados = {os.path.normcase(entry.name) for entry in iterator}
+            except FileNotFoundError:
+                os.makedirs(self.destination_path, exist_ok=True)
+                self._ocupados = set()
+        return self._ocupados
+
+    def allocate(self, original_filename):
+        """Retorna um nome livre para 'original_filename' e o marca como ocupado em memória."""
+        ocupados = self._snapshot()
+        chave = os.path.normcase(original_filename) # Nomes são comparados como o SO compara (Windows ignora maiúsculas)
+        if chave not in ocupados:
+            ocupados.add(chave)
+            return original_filename
+
+        base, ext = os.path.splitext(original_filename)
+        counter = self._proximo_contador.get(chave, 1)
+        while True:
+            candidato = f"{base} ({counter}){ext}"
+            counter += 1
+            if os.path.normcase(candidato) not in ocupados:
+                break
+        self._proximo_contador[chave] = counter
+        ocupados.add(os.path.normcase(candidato))
+        return candidato
+
+    def release(self, filename):
+        """Libera um nome alocado cujo movimento não foi concluído."""
+        if self._ocupados is not None:
+            self._ocupados.discard(os.path.normcase(filename))
+
+    def reserve(self, original_filename):
+        """
+        Aloca um nome e o reserva no disco com criação exclusiva (O_CREAT | O_EXCL).
+        Se outro processo criou o mesmo nome depois do snapshot, a criação falha de forma
+        atômica e o próximo nome livre é tentado, então nenhum arquivo é sobrescrito.
+        O arquivo vazio reservado deve ser substituído pelo arquivo movido (os.replace).
+        """
+        while True:
+            nome = self.allocate(original_filename)
+            caminho = os.path.join(self.destination_path, nome)
+            try:
+                fd = os.open(caminho, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                logger.warning(f"  '{nome}' foi criado por outro processo em '{self.destination_path}'. Tentando outro nome.")
+                continue
+            os.close(fd)
+            return nome
@@ -1,11 +1,21 @@
 # src/core/organizer_logic.py
 
 import os
-import shutil
-import json
+import functools
 import logging
+import threading
+import time
 # Importa a nova utilidade para caminhos
 from utils.path_utils import get_resource_path
+from core.scanner import walk_directory, stat_path, TIPO_ARQUIVO, TIPO_PASTA
+from core.config import get_config, exclusion_sets, ConfigError
+from core.rules import rules_path_for, safe_relative_path
+from core.name_allocator import NameAllocator
+from core.mover import FileMover
+from core.journal import EVENTO_CONCLUIDO, EVENTO_ERRO
+from core.plan import Plan, PlannedMove, CompletedMoves, MOVIDO, FALHOU, NAO_TENTADO
+# Módulos opcionais (cache de análise, duplicatas, conteúdo, métricas, threads) são importados
+# apenas quando a opção correspondente é usada, para não pesar na inicialização
 
 logger = logging.getLogger('files_organizer_py')
 
@@ -27,46 +37,179 @@ def get_unique_filename(destination_path, original_filename):
 # --- Usa get_resource_path para definir os caminhos dos arquivos de configuração ---
 CATEGORIES_CONFIG_PATH = get_resource_path('config/categories.json')
 EXCLUDE_CONFIG_PATH = get_resource_path('config/exclude_list.json')
+# Diários de movimentos (um por execução), usados para desfazer e recuperar execuções
+JOURNAL_DIR = get_resource_path('config/journals')
 
 
-def load_exclusions(config_path):
-    """Carrega a lista de arquivos e pastas a serem excluídos do arquivo JSON."""
+def _planned_move(source_folder, nome_item, origem, pasta_destino_nome, tamanho=None):
+    """Monta o registro (PlannedMove) de um movimento planejado."""
+    logger.info("  Planejado: '%s' -> '%s%s%s'", nome_item, pasta_destino_nome, os.sep, nome_item)
+    return PlannedMove(nome_item, origem, os.path.join(source_folder, pasta_destino_nome), pasta_destino_nome,
+                       tamanho=tamanho)
+
+def _path_size(caminho):
+    """Tamanho atual do arquivo em 'caminho', ou None (usado ao reaproveitar o plano em cache)."""
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            exclusions = json.load(f)
-        logger.info(f"Lista de exclusão carregada de '{config_path}'.")
-        return exclusions
-    except FileNotFoundError:
-        logger.warning(f"Aviso: O arquivo de exclusão '{config_path}' não foi encontrado. Nenhuma exclusão será aplicada.")
-        return {"exclude_files": [], "exclude_folders": []} # Retorna vazio se não encontrado
-    except json.JSONDecodeError:
-        logger.error(f"Erro: O arquivo '{config_path}' não é um JSON válido. Lista de exclusão ignorada.")
-        return {"exclude_files": [], "exclude_folders": []}
-    except Exception as e:
-        logger.error(f"Erro inesperado ao carregar exclusões de '{config_path}': {e}. Lista de exclusão ignorada.")
-        return {"exclude_files": [], "exclude_folders": []}
+        return os.stat(caminho).st_size
+    except OSError:
+        return None
 
-def load_categories(config_path):
-    """Carrega as categorias de arquivo do arquivo JSON."""
+def _entry_size(entry):
+    """Tamanho do arquivo pelo stat do DirEntry (guardado em cache pelo próprio DirEntry), ou None."""
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            categories = json.load(f)
-        logger.info(f"Categorias carregadas de '{config_path}'.")
-        return categories
-    except FileNotFoundError:
-        logger.error(f"Erro: O arquivo de configurações de categorias '{config_path}' não foi encontrado.")
-        raise
-    except json.JSONDecodeError:
-        logger.error(f"Erro: O arquivo '{config_path}' não é um JSON válido. Verifique a sintaxe.")
-        raise
-    except Exception as e:
-        logger.error(f"Erro inesperado ao carregar categorias de '{config_path}': {e}")
-        raise
+        return entry.stat().st_size
+    except OSError:
+        return None
+
+def _ignore_reason(nome_item, tipo, profundidade, classifier, exclude_files_list, exclude_folders_list):
+    """
+    Retorna o modelo da mensagem de log (com '%s' para o nome do item) explicando por que
+    um item é ignorado, ou None se ele deve ser organizado.
+    """
+    if nome_item.lower() in exclude_files_list:
+        return "Ignorando arquivo por estar na lista de exclusão: '%s'"
+
+    if tipo == TIPO_PASTA:
+        if nome_item.lower() in exclude_folders_list:
+            return "Ignorando pasta por estar na lista de exclusão: '%s'"
+        if profundidade == 0 and classifier.is_category_folder(nome_item):
+            return "Ignorando pasta de categoria: '%s'"
+        if nome_item.startswith('.'):
+            return "Ignorando pasta oculta: '%s'"
+        return "Ignorando pasta: '%s'"
+
+    if nome_item.startswith('.'):
+        return "Ignorando arquivo oculto: '%s'"
+
+    if tipo != TIPO_ARQUIVO:
+        return "Ignorando item (não é um arquivo nem pasta de categoria): '%s'"
+    return None
+
+def iter_planned_moves(source_folder, classifier, exclusions, stats, recursive=False, max_depth=None,
+                       follow_symlinks=False, folder_cache=None, cancel_token=None, record_sizes=False):
+    """
+    Gera os movimentos planejados de forma preguiçosa, um por arquivo elegível.
+    A pasta é percorrida uma única vez com os.scandir e o tipo de cada item vem do
+    cache do DirEntry. Nenhum stat é feito por arquivo, a menos que uma regra de tamanho/data
+    precise dele ou que 'record_sizes' peça o tamanho no plano (progresso por bytes,
+    agendamento); nos dois casos é um único stat, em cache no DirEntry.
+    A categoria de cada arquivo é resolvida pelo 'classifier' (ExtensionClassifier).
+    'exclusions' é um core.config.Exclusions (ou o dicionário de exclude_list.json).
+    O dicionário 'stats' é atualizado com a contagem de itens ignorados ('ignored').
+
+    No modo recursivo as subpastas também são percorridas (até 'max_depth' níveis) e
+    todos os arquivos vão para as pastas de categoria na raiz de 'source_folder'.
+    Pastas excluídas, ocultas e as pastas de categoria da raiz são podadas antes de descer.
+
+    Com 'folder_cache' (FolderCache, apenas no modo não recursivo), só entradas novas ou
+    alteradas (tamanho ou mtime do arquivo) são classificadas. O plano anterior inteiro é
+    reaproveitado sem listar nem classificar a pasta se ela não mudou e a categoria depende só
+    do nome: alterar um arquivo no lugar não muda o mtime da pasta. Pelo mesmo motivo, com
+    'record_sizes' os tamanhos do plano reaproveitado vêm de um stat de cada arquivo, não do cache.
+
+    Com 'cancel_token' (CancelToken), o token é consultado antes de cada entrada: a pausa
+    bloqueia a varredura e o cancelamento a encerra (sem gravar o cache da pasta).
+    """
+    if recursive:
+        folder_cache = None
+    dir_mtime_ns = None
+    if folder_cache is not None:
+        dir_mtime_ns = os.stat(source_folder).st_mtime_ns
+        so_pelo_nome = not getattr(classifier, "stat_dependent", False)
+        if so_pelo_nome and folder_cache.is_unchanged(dir_mtime_ns):
+            logger.info("Pasta inalterada desde a última análise. Reutilizando plano em cache.")
+            for nome_item, pasta_destino_nome in folder_cache.planned():
+                caminho = os.path.join(source_folder, nome_item)
+                yield _planned_move(source_folder, nome_item, caminho, pasta_destino_nome,
+                                    _path_size(caminho) if record_sizes else None)
+            stats["ignored"] = stats.get("ignored", 0) + folder_cache.ignored
+            return
+
+    exclude_files_list, exclude_folders_list = exclusion_sets(exclusions)
+    stats.setdefault("ignored", 0)
+
+    def should_descend(entry, profundidade):
+        nome = entry.name
+        if nome.lower() in exclude_files_list or nome.lower() in exclude_folders_list:
+            return False
+        if nome.startswith('.'):
+            return False
+        # As pastas de categoria da raiz são o destino da organização
+        return not (profundidade == 0 and classifier.is_category_folder(nome))
+
+    walker = walk_directory(source_folder, should_descend,
+                            max_depth=max_depth if recursive else 0,
+                            follow_symlinks=follow_symlinks)
+    for entry, tipo, profundidade in walker:
+        if cancel_token is not None and cancel_token.checkpoint():
+            return
+        nome_item = entry.name
+        motivo = _ignore_reason(nome_item, tipo, profundidade, classifier, exclude_files_list, exclude_folders_list)
+        if motivo:
+            logger.info(motivo, nome_item)
+            stats["ignored"] += 1
+            continue
+
+        if folder_cache is not None:
+            st = entry.stat()
+            pasta_destino_nome = folder_cache.lookup(nome_item, st.st_size, st.st_mtime_ns)
+            if pasta_destino_nome is None:
+                pasta_destino_nome = classifier.classify(nome_item, stat=lambda: st)
+            folder_cache.record(nome_item, st.st_size, st.st_mtime_ns, pasta_destino_nome)
+            tamanho = st.st_size
+        else:
+            tamanho = _entry_size(entry) if record_sizes else None
+            pasta_destino_nome = classifier.classify(nome_item, stat=entry.stat)
+        yield _planned_move(source_folder, nome_item, entry.path, pasta_destino_nome, tamanho)
+
+    if folder_cache is not None:
+        folder_cache.commit(dir_mtime_ns, stats["ignored"])
 
-def organize_files(source_folder, categories_config_path):
+def plan_paths(source_folder, nomes, classifier, exclusions, stats):
+    """
+    Planeja apenas os itens 'nomes' (nomes de arquivos dentro de 'source_folder'), com as mesmas
+    regras de iter_planned_moves. Usado pelo modo de observação para processar só os arquivos
+    que chegaram, sem varrer a pasta inteira. Itens que já não existem são descartados.
+    """
+    exclude_files_list, exclude_folders_list = exclusion_sets(exclusions)
+    stats.setdefault("ignored", 0)
+
+    for nome_item in nomes:
+        caminho = os.path.join(source_folder, nome_item)
+        tipo, st = stat_path(caminho)
+        if tipo is None:
+            continue
+        motivo = _ignore_reason(nome_item, tipo, 0, classifier, exclude_files_list, exclude_folders_list)
+        if motivo:
+            logger.info(motivo, nome_item)
+            stats["ignored"] += 1
+            continue
+        categoria = classifier.classify(nome_item, stat=lambda: st)
+        yield _planned_move(source_folder, nome_item, caminho, categoria, st.st_size)
+
+def organize_files(source_folder, categories_config_path, classifier=None, recursive=False, max_depth=None,
+                   follow_symlinks=False, scan_cache=None, dedup=None, hash_cache=None, sniff_content=False,
+                   cancel_token=None, metrics=None, record_sizes=False):
     """
     Analisa e organiza arquivos em uma pasta.
-    Retorna um dicionário com o status da operação.
+    A configuração (categorias, regras e exclusões) vem de core.config.get_config: é compilada
+    uma vez e recarregada apenas quando algum arquivo muda; um arquivo inválido resulta no
+    status "error" com o arquivo e a posição do problema na mensagem.
+    Se 'classifier' (ExtensionClassifier) for fornecido, ele substitui o da configuração.
+    Com 'recursive', também organiza os arquivos das subpastas (veja iter_planned_moves).
+    Com 'scan_cache' (ScanCache), re-análises da mesma pasta são incrementais (exceto com um
+    'classifier' próprio, que a assinatura da configuração não identifica).
+    Com 'dedup' (DEDUP_REPORT, DEDUP_SKIP ou DEDUP_HARDLINK), arquivos de conteúdo idêntico são
+    detectados (veja core.dedup); 'hash_cache' (HashCache) evita recalcular hashes entre execuções.
+    Com 'sniff_content', arquivos que cairiam em "Outros" são reclassificados pelo conteúdo (magic bytes).
+    Com 'cancel_token' (CancelToken), a análise pode ser pausada ou cancelada; se cancelada,
+    retorna o status "cancelled" (nenhum arquivo foi movido).
+    Com 'metrics' (core.metrics.MetricsHook), o tempo de cada fase (carga da configuração,
+    varredura, classificação, conteúdo, duplicatas) é informado ao gancho.
+    Com 'record_sizes', o tamanho de cada arquivo é registrado no plano durante a varredura
+    (para o resumo por categoria, o progresso por bytes ou o agendamento); sem ele, a execução
+    consulta os tamanhos só se precisar deles.
+    Retorna um dicionário com o status da operação; o plano ("planned_moves") é um core.plan.Plan.
     """
     if not os.path.isdir(source_folder):
         logger.error(f"Erro: A pasta de origem '{source_folder}' não existe.")
@@ -74,118 +217,408 @@ def organize_files(source_folder, categories_config_path):
 
     logger.info(f"Iniciando análise da pasta: {source_folder}")
 
+    inicio = time.perf_counter() if metrics is not None else None
     try:
-        # Usa o caminho correto para o categories.json
-        categorias = load_categories(categories_config_path)
-    except Exception:
-        return {"status": "error", "message": "Falha ao carregar categorias."}
-
-    categoria_outros = "Outros"
-    if categoria_outros not in categorias:
-        categorias[categoria_outros] = []
-
-    # Carregar a lista de exclusões usando o caminho correto
-    exclusions = load_exclusions(EXCLUDE_CONFIG_PATH)
-    exclude_files_list = [f.lower() for f in exclusions.get("exclude_files", [])]
-    exclude_folders_list = [f.lower() for f in exclusions.get("exclude_folders", [])]
-
-    movimentos_planejados = []
-    arquivos_ignorados = 0
-
-    for nome_item in os.listdir(source_folder):
-        if nome_item.lower() in exclude_files_list:
-            logger.info(f"Ignorando arquivo por estar na lista de exclusão: '{nome_item}'")
-            arquivos_ignorados += 1
-            continue
-        
-        caminho_completo_item = os.path.join(source_folder, nome_item)
-
-        if os.path.isdir(caminho_completo_item):
-            if nome_item.lower() in exclude_folders_list:
-                logger.info(f"Ignorando pasta por estar na lista de exclusão: '{nome_item}'")
-                arquivos_ignorados += 1
-                continue
-
-            if nome_item in categorias:
-                logger.info(f"Ignorando pasta de categoria: '{nome_item}'")
-            else:
-                logger.info(f"Ignorando pasta: '{nome_item}'")
-            arquivos_ignorados += 1
-            continue
-        
-        if nome_item.startswith('.'):
-            logger.info(f"Ignorando arquivo oculto: '{nome_item}'")
-            arquivos_ignorados += 1
-            continue
+        config = get_config(categories_config_path, EXCLUDE_CONFIG_PATH, rules_path_for(categories_config_path))
+    except ConfigError as e:
+        logger.error(f"Erro na configuração: {e}")
+        return {"status": "error", "message": f"Configuração inválida: {e}"}
+    # O cache de análise é indexado pela assinatura da configuração: não vale para outro classificador
+    classificador_proprio = classifier is not None
+    if classifier is None:
+        classifier = config.classifier
+    exclusions = config.exclusions
+    if metrics is not None:
+        metrics.add_time("load_config", time.perf_counter() - inicio)
+        # Separa o tempo de classificação do tempo de varredura
+        from core.metrics import TimedClassifier
+        classifier = TimedClassifier(classifier)
+        inicio = time.perf_counter()
 
-        if os.path.isfile(caminho_completo_item):
-            _, extensao = os.path.splitext(nome_item)
-            extensao = extensao.lower()
-
-            pasta_destino_nome = categoria_outros
-            encontrado = False
-            for categoria, extensoes_lista in categorias.items():
-                if extensao in extensoes_lista:
-                    pasta_destino_nome = categoria
-                    encontrado = True
-                    break
-            
-            caminho_pasta_destino = os.path.join(source_folder, pasta_destino_nome)
-            
-            movimentos_planejados.append({
-                "arquivo": nome_item,
-                "origem": caminho_completo_item,
-                "destino_pasta": caminho_pasta_destino,
-                "destino_nome_curto": pasta_destino_nome
-            })
-            logger.info(f"  Planejado: '{nome_item}' -> '{pasta_destino_nome}{os.sep}{nome_item}'")
+    folder_cache = None
+    cache_stats_antes = scan_cache.stats() if scan_cache is not None else None
+    # Regras por idade mudam com o tempo, sem que a pasta mude: o plano em cache não vale
+    if (scan_cache is not None and not recursive and not classificador_proprio
+            and not getattr(classifier, "time_dependent", False)):
+        # Assinatura calculada na carga da configuração, sem reler os arquivos
+        folder_cache = scan_cache.folder(source_folder, config.signature)
+
+    stats = {"ignored": 0}
+    # Plano em colunas compactas (veja core.plan): os registros gerados não são mantidos
+    movimentos_planejados = Plan()
+    try:
+        movimentos_planejados.extend(iter_planned_moves(source_folder, classifier, exclusions, stats,
+                                                        recursive=recursive, max_depth=max_depth,
+                                                        follow_symlinks=follow_symlinks,
+                                                        folder_cache=folder_cache,
+                                                        cancel_token=cancel_token,
+                                                        record_sizes=record_sizes))
+    except OSError as e:
+        logger.error(f"Erro ao ler a pasta de origem '{source_folder}': {e}")
+        return {"status": "error", "message": "Falha ao ler a pasta de origem."}
+    arquivos_ignorados = stats["ignored"]
+    if metrics is not None:
+        metrics.add_time("scan", time.perf_counter() - inicio - classifier.seconds)
+        metrics.add_time("classify", classifier.seconds)
+
+    def analise_cancelada():
+        if cancel_token is not None and cancel_token.checkpoint():
+            logger.warning("Análise cancelada. Nenhum arquivo foi movido.")
+            return True
+        return False
+
+    if analise_cancelada():
+        return {"status": "cancelled", "message": "Análise cancelada.", "moved": 0, "errors": 0,
+                "ignored": arquivos_ignorados}
+
+    if sniff_content and movimentos_planejados:
+        inicio = time.perf_counter() if metrics is not None else None
+        from core.content_sniffer import reclassify_by_content, get_sniffer
+        reclassificados = reclassify_by_content(movimentos_planejados, classifier, get_sniffer())
+        if metrics is not None:
+            metrics.add_time("sniff", time.perf_counter() - inicio)
+        logger.info(f"Arquivos reclassificados pelo conteúdo: {reclassificados}.")
+
+    if analise_cancelada():
+        return {"status": "cancelled", "message": "Análise cancelada.", "moved": 0, "errors": 0,
+                "ignored": arquivos_ignorados}
+
+    duplicatas = []
+    if dedup and movimentos_planejados:
+        inicio = time.perf_counter() if metrics is not None else None
+        from core.dedup import mark_duplicates
+        if hash_cache is not None:
+            with hash_cache:
+                movimentos_planejados, duplicatas = mark_duplicates(movimentos_planejados, dedup, hash_cache)
         else:
-            logger.info(f"Ignorando item (não é um arquivo nem pasta de categoria): '{nome_item}'")
-            arquivos_ignorados += 1
+            movimentos_planejados, duplicatas = mark_duplicates(movimentos_planejados, dedup)
+        if metrics is not None:
+            metrics.add_time("dedup", time.perf_counter() - inicio)
+        logger.info(f"Duplicatas encontradas: {len(duplicatas)}.")
+
+    if scan_cache is not None:
+        cache_stats = {chave: valor - cache_stats_antes[chave] for chave, valor in scan_cache.stats().items()}
+        logger.info(f"Cache de análise: {cache_stats['hits']} acerto(s), {cache_stats['misses']} falha(s).")
 
     if not movimentos_planejados:
         logger.info("\nNenhum arquivo elegível para organização foi encontrado.")
-        return {"status": "info", "message": "Nenhum arquivo para organizar.", "moved": 0, "errors": 0, "ignored": arquivos_ignorados}
+        return {"status": "info", "message": "Nenhum arquivo para organizar.", "moved": 0, "errors": 0,
+                "ignored": arquivos_ignorados, "duplicates": duplicatas}
     
-    return {"status": "planned", "planned_moves": movimentos_planejados, "ignored": arquivos_ignorados}
+    return {"status": "planned", "planned_moves": movimentos_planejados, "ignored": arquivos_ignorados,
+            "duplicates": duplicatas}
 
-def execute_moves(planned_moves, progress_callback=None):
+def summarize_plan(planned_moves):
     """
-    Executa os movimentos de arquivo planejados.
-    Args:
-        planned_moves (list): Lista de movimentos planejados.
-        progress_callback (callable, optional): Função a ser chamada com (current, total) progresso.
+    Agrega o plano por categoria: {categoria: {"files": quantidade, "bytes": tamanho total}}.
+    Usado pela janela de revisão para mostrar os totais antes da lista detalhada.
+    Usa os tamanhos registrados na varredura; só os desconhecidos são consultados com os.stat.
     """
-    arquivos_movidos = 0
-    arquivos_com_erro = 0
-    total_moves = len(planned_moves)
+    plano = Plan.from_moves(planned_moves)
+    resumo = {}
+    for indice in range(len(plano)):
+        tamanho = plano.size(indice)
+        if tamanho is None:
+            tamanho = _source_size(plano.source_path(indice))
+        totais = resumo.setdefault(plano.category(indice), {"files": 0, "bytes": 0})
+        totais["files"] += 1
+        totais["bytes"] += tamanho
+    return resumo
 
-    for i, movimento in enumerate(planned_moves):
-        arquivo = movimento["arquivo"]
-        origem = movimento["origem"]
-        destino_pasta = movimento["destino_pasta"]
-        destino_nome_curto = movimento["destino_nome_curto"]
+def _move_one(plano, indice, total_moves, allocator, mover, journal=None, metrics=None):
+    """
+    Move um único arquivo planejado (o movimento 'indice' do Plan) para a pasta de destino.
+    'allocator' é o NameAllocator da pasta de destino do movimento e 'mover' o FileMover da execução.
+    Com 'journal' (MoveJournal), o movimento é registrado antes de acontecer e o resultado depois.
+    Com 'metrics' (MetricsHook), o tempo de escolha do nome e do movimento é informado ao gancho.
+    Retorna o nome final do arquivo movido, ou None em caso de erro.
+    """
+    arquivo = plano.name(indice)
+    origem = None
 
-        # Gerar nome de arquivo único para o destino
-        final_filename = get_unique_filename(destino_pasta, arquivo)
-        final_destination_path = os.path.join(destino_pasta, final_filename)
+    try:
+        origem = plano.source_path(indice)
+        categoria = plano.category(indice)
+        # Última verificação antes de criar pastas: o destino relativo não pode sair da pasta organizada
+        if os.path.isabs(categoria) or safe_relative_path(categoria) is None:
+            logger.error("  !!! Destino '%s' de '%s' fora da pasta organizada. Arquivo não movido.", categoria, arquivo)
+            if metrics is not None:
+                metrics.record_error(categoria, origem, ValueError(f"destino inválido: {categoria}"))
+            return None
+        # Gerar (e reservar) nome de arquivo único para o destino
+        if metrics is not None:
+            inicio = time.perf_counter()
+            final_filename = allocator.reserve(arquivo)
+            metrics.add_time("naming", time.perf_counter() - inicio)
+        else:
+            final_filename = allocator.reserve(arquivo)
+        final_destination_path = os.path.join(plano.destination_folder(indice), final_filename)
 
-        logger.info(f"Executando ({i+1}/{total_moves}) '{arquivo}' -> '{destino_nome_curto}{os.sep}{final_filename}'...")
+        logger.info("Executando (%d/%d) '%s' -> '%s%s%s'...", indice + 1, total_moves, arquivo, plano.category(indice), os.sep, final_filename)
+        id_diario = journal.record_move(origem, final_destination_path) if journal else None
+        # O resultado vai para o diário quando está em disco: cópias entre dispositivos só no fsync do lote
+        concluir = functools.partial(_record_outcome, journal, id_diario) if journal else None
+        inicio = time.perf_counter()
+        movido = False
         try:
-            os.makedirs(destino_pasta, exist_ok=True)
-            shutil.move(origem, final_destination_path)
-            logger.info(f"  -> Movido com sucesso.")
+            mover.move(origem, final_destination_path, concluir)
+            movido = True
+        finally:
+            if not movido:
+                # Só a reserva vazia (o movimento falhou) é removida, para não deixar lixo na pasta de destino
+                try:
+                    os.remove(final_destination_path)
+                except OSError:
+                    pass
+                allocator.release(final_filename)
+                if journal:
+                    journal.record_outcome(id_diario, EVENTO_ERRO)
+        if metrics is not None:
+            segundos = time.perf_counter() - inicio
+            tamanho = plano.size(indice)
+            try:
+                if tamanho is None:
+                    tamanho = _source_size(final_destination_path)
+                metrics.record_move(plano.category(indice), origem, tamanho, segundos)
+            except Exception as e:
+                # O arquivo já está no destino: uma falha do gancho não desfaz o movimento
+                logger.warning(f"Falha ao registrar as métricas de '{arquivo}': {e}")
+        logger.info("  -> Movido com sucesso.")
+        return final_filename
+    except OSError as e:
+        logger.error("  !!! ERRO ao mover '%s'. Motivo: %s", arquivo, e)
+        logger.error("  (Verifique se o arquivo já existe no destino ou não há permissão.)")
+        if metrics is not None:
+            metrics.record_error(plano.category(indice), origem or arquivo, e)
+    except Exception as e:
+        logger.critical("  !!! ERRO CRÍTICO INESPERADO ao processar '%s': %s", arquivo, e)
+        if metrics is not None:
+            metrics.record_error(plano.category(indice), origem or arquivo, e)
+    return None
+
+def _record_outcome(journal, id_diario, sucesso):
+    """Registra no diário o resultado de um movimento, quando o FileMover o confirma em disco."""
+    journal.record_outcome(id_diario, EVENTO_CONCLUIDO if sucesso else EVENTO_ERRO)
+
+def _source_size(origem):
+    """Tamanho do arquivo de origem, quando o plano não o registrou (0 se não puder ser lido)."""
+    try:
+        return os.stat(origem).st_size
+    except OSError:
+        return 0
+
+def _group_by_destination(plano, ordem=None, custo=None):
+    """
+    Agrupa os índices do plano por destino, preservando a ordem de execução ('ordem', por padrão a
+    do plano) dentro de cada grupo. Com 'custo' (função de um grupo), os grupos mais caros vêm primeiro.
+    """
+    grupos = {}
+    for indice in (ordem if ordem is not None else range(len(plano))):
+        grupos.setdefault(plano.destination_index(indice), []).append(indice)
+    grupos = list(grupos.values())
+    if custo is not None:
+        # Os grupos mais longos começam primeiro, para não ficarem sozinhos no fim da execução
+        grupos.sort(key=custo, reverse=True)
+    return grupos
+
+def _schedule_execution(plano, schedule, byte_progress):
+    """
+    Prepara a ordem de execução e o progresso por bytes (veja core.scheduling), se pedidos.
+    Retorna (ordem dos índices, custo por grupo de destino ou None, TransferProgress ou None).
+    """
+    if not schedule and byte_progress is None:
+        return range(len(plano)), None, None
+    from core.scheduling import (fill_sizes, predict_copies, schedule_moves, estimated_seconds, TransferProgress,
+                                 SCHEDULE_PLAN, SCHEDULE_INTERLEAVE)
+    fill_sizes(plano)
+    copias = predict_copies(plano)
+    ordem = schedule_moves(plano, schedule or SCHEDULE_PLAN, copias)
+    if schedule == SCHEDULE_INTERLEAVE:
+        custo = functools.partial(estimated_seconds, plano, copias=copias)
+    else:
+        custo = None
+    progresso = TransferProgress(plano, copias, byte_progress) if byte_progress is not None else None
+    return ordem, custo, progresso
+
+def _record_result(plano, indice, nome_final, estados, renomeados):
+    """Registra o resultado de um movimento: um byte de estado e o nome final se mudou por colisão."""
+    if nome_final is None:
+        estados[indice] = FALHOU
+        return False
+    estados[indice] = MOVIDO
+    if nome_final != plano.name(indice):
+        renomeados[indice] = nome_final
+    return True
+
+def _execute_moves_concurrently(plano, grupos, progress_callback, max_workers, mover, cancel_token, estados, renomeados,
+                                journal, metrics, progresso):
+    """
+    Executa os movimentos com um pool de threads limitado a 'max_workers'.
+    Cada pasta de destino ('grupos', de _group_by_destination) é processada por uma única tarefa,
+    na ordem de execução, então as colisões de nome resolvidas pelo NameAllocator continuam determinísticas.
+    Cada tarefa consulta 'cancel_token' antes de cada arquivo; tarefas ainda na fila
+    encerram logo ao começar.
+    """
+    total_moves = len(plano)
+    lock = threading.Lock()
+    contadores = {"moved": 0, "errors": 0, "done": 0}
+
+    def process_group(grupo):
+        # O grupo inteiro tem o mesmo destino, então o alocador não é compartilhado entre threads
+        allocator = None
+        for indice in grupo:
+            if cancel_token is not None and cancel_token.checkpoint():
+                return
+            if allocator is None:
+                allocator = NameAllocator(plano.destination_folder(indice))
+            inicio = time.perf_counter()
+            nome_final = _move_one(plano, indice, total_moves, allocator, mover, journal, metrics)
+            segundos = time.perf_counter() - inicio
+            with lock:
+                sucesso = _record_result(plano, indice, nome_final, estados, renomeados)
+                contadores["moved" if sucesso else "errors"] += 1
+                contadores["done"] += 1
+                if progresso is not None:
+                    progresso.record(indice, segundos)
+                # Chamado dentro do lock para que 'current' seja sempre crescente
+                if progress_callback:
+                    progress_callback(contadores["done"], total_moves)
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(process_group, grupo) for grupo in grupos]
+        for future in futures:
+            future.result()
+
+    return {"status": "done", "moved": contadores["moved"], "errors": contadores["errors"]}
+
+def _execute_moves_serially(plano, ordem, progress_callback, mover, cancel_token, estados, renomeados, journal,
+                            metrics, progresso):
+    """Executa os movimentos um a um, na ordem 'ordem', consultando 'cancel_token' antes de cada um."""
+    arquivos_movidos = 0
+    arquivos_com_erro = 0
+    total_moves = len(plano)
+    allocators = {} # Um NameAllocator por destino
+
+    for posicao, indice in enumerate(ordem):
+        if cancel_token is not None and cancel_token.checkpoint():
+            break
+        destino = plano.destination_index(indice)
+        allocator = allocators.get(destino)
+        if allocator is None:
+            allocator = allocators[destino] = NameAllocator(plano.destination_folder(indice))
+        inicio = time.perf_counter()
+        nome_final = _move_one(plano, indice, total_moves, allocator, mover, journal, metrics)
+        if progresso is not None:
+            progresso.record(indice, time.perf_counter() - inicio)
+        if _record_result(plano, indice, nome_final, estados, renomeados):
             arquivos_movidos += 1
-        except shutil.Error as e:
-            logger.error(f"  !!! ERRO ao mover '{arquivo}'. Motivo: {e}")
-            logger.error(f"  (Verifique se o arquivo já existe no destino ou não há permissão.)")
-            arquivos_com_erro += 1
-        except Exception as e:
-            logger.critical(f"  !!! ERRO CRÍTICO INESPERADO ao processar '{arquivo}': {e}")
+        else:
             arquivos_com_erro += 1
         
         # Chamar o callback de progresso se fornecido
         if progress_callback:
-            progress_callback(i + 1, total_moves)
+            progress_callback(posicao + 1, total_moves)
     
-    return {"status": "done", "moved": arquivos_movidos, "errors": arquivos_com_erro}
\ No newline at end of file
+    return {"status": "done", "moved": arquivos_movidos, "errors": arquivos_com_erro}
+
+def execute_moves(planned_moves, progress_callback=None, max_workers=None, cancel_token=None, journal=None,
+                  metrics=None, byte_progress=None, schedule=None):
+    """
+    Executa os movimentos de arquivo planejados.
+    Args:
+        planned_moves (Plan ou list): Plano de organize_files (ou movimentos no formato de dicionário).
+        progress_callback (callable, optional): Função a ser chamada com (current, total) progresso.
+        max_workers (int, optional): Se maior que 1, move arquivos de pastas de destino
+                                     diferentes em paralelo com até 'max_workers' threads.
+                                     Útil em compartilhamentos de rede (SMB/NFS) com alta latência.
+        cancel_token (CancelToken, optional): Consultado antes de cada arquivo; permite pausar
+                                              e cancelar a execução sem interromper um movimento.
+        journal (MoveJournal, optional): Diário onde cada movimento (origem, destino final e
+                                         resultado) é registrado, para desfazer a execução
+                                         ou recuperá-la após uma queda (veja core.journal).
+        metrics (MetricsHook, optional): Recebe o tempo de escolha de nomes e de cada movimento,
+                                         com o tamanho e a categoria, e os erros (veja core.metrics).
+        byte_progress (callable, optional): Chamada com o dicionário de progresso por bytes
+                                            ("files_done", "files_total", "bytes_done", "bytes_total",
+                                            "bytes_per_second" suavizado e "eta_seconds", None enquanto
+                                            não há medidas), a cada meio segundo e no último movimento.
+        schedule (str, optional): Ordem de execução: SCHEDULE_PLAN (padrão), SCHEDULE_SMALL_FIRST ou
+                                  SCHEDULE_INTERLEAVE, que intercala as cópias grandes entre
+                                  dispositivos com os demais movimentos (veja core.scheduling).
+
+    Returns:
+        dict: "status" ("done" ou "cancelled"), "moved", "errors", "metrics", "completed"
+              (CompletedMoves: itera os pares (origem, destino final) dos arquivos movidos) e
+              "remaining", o Plan dos movimentos não tentados. Para retomar uma execução
+              cancelada, basta chamar execute_moves com "remaining", sem analisar a pasta de novo.
+    """
+    inicio = time.perf_counter() if metrics is not None else None
+    plano = Plan.from_moves(planned_moves)
+    # Duplicatas marcadas para link físico são tratadas antes de qualquer movimento
+    _prepare_execution(plano, journal)
+    ordem, custo, progresso = _schedule_execution(plano, schedule, byte_progress)
+
+    mover = FileMover()
+    estados = bytearray(len(plano)) # Um byte por movimento: NAO_TENTADO, MOVIDO ou FALHOU
+    renomeados = {} # índice -> nome final, só quando difere do original (colisão)
+    try:
+        if max_workers and max_workers > 1:
+            resultado = _execute_moves_concurrently(plano, _group_by_destination(plano, ordem, custo),
+                                                    progress_callback, max_workers, mover, cancel_token, estados,
+                                                    renomeados, journal, metrics, progresso)
+        else:
+            resultado = _execute_moves_serially(plano, ordem, progress_callback, mover, cancel_token, estados,
+                                                renomeados, journal, metrics, progresso)
+    finally:
+        # Conclui as cópias entre dispositivos ainda pendentes de fsync
+        inicio_flush = time.perf_counter() if metrics is not None else None
+        mover.close()
+        if journal:
+            journal.flush()
+        if metrics is not None:
+            metrics.add_time("flush", time.perf_counter() - inicio_flush)
+            metrics.add_time("execute", time.perf_counter() - inicio)
+
+    return _finish_execution(plano, resultado, mover, estados, renomeados)
+
+def _prepare_execution(plano, journal):
+    """
+    Cria os links físicos das duplicatas, registra no diário as pastas que a execução vai criar
+    e congela o plano (Plan.freeze), que passa a ser lido por várias threads.
+    """
+    plano.freeze()
+    if plano.hardlinks():
+        from core.dedup import link_duplicates
+        link_duplicates(plano, journal)
+
+    if journal:
+        # Pastas criadas por esta execução (incluindo as intermediárias de destinos como
+        # 'Antigos/2024-01') são removidas pelo undo, da mais interna para fora, se ficarem vazias
+        registradas = set()
+        for pasta in plano.destination_folders():
+            criadas = []
+            while pasta not in registradas and not os.path.isdir(pasta):
+                criadas.append(pasta)
+                pasta = os.path.dirname(pasta)
+            for criada in reversed(criadas):
+                registradas.add(criada)
+                journal.record_mkdir(criada)
+
+def _finish_execution(plano, resultado, mover, estados, renomeados):
+    """Completa o resultado de uma execução com os movimentos concluídos, os restantes e as métricas."""
+    resultado["completed"] = CompletedMoves(plano, estados, renomeados)
+    # O link físico já foi criado nesta execução; não é refeito ao retomar
+    resultado["remaining"] = plano.subset((indice for indice, estado in enumerate(estados) if estado == NAO_TENTADO),
+                                          keep_hardlinks=False)
+    if resultado["remaining"]:
+        resultado["status"] = "cancelled"
+        logger.warning("Execução cancelada. Movidos: %d, erros: %d, restantes: %d.",
+                       resultado["moved"], resultado["errors"], len(resultado["remaining"]))
+
+    resultado["metrics"] = mover.summary()
+    for caminho, metricas in resultado["metrics"].items():
+        if metricas["files"]:
+            logger.info(f"Métricas ({caminho}): {metricas['files']} arquivo(s), {metricas['bytes'] / 1e6:.1f} MB, "
+                        f"{metricas['files_per_second']:.1f} arquivos/s, {metricas['mb_per_second']:.1f} MB/s.")
+    return resultado
@@ -0,0 +1,349 @@
+# src/core/plan.py
+
+import os
+import mmap
+import tempfile
+from array import array
+
+# Acima deste volume de nomes (em bytes UTF-8) a coluna de nomes é transferida para um arquivo temporário
+LIMITE_NOMES_EM_MEMORIA = 64 * 1024 * 1024
+
+# Tamanho ainda não conhecido na coluna de tamanhos do Plan
+TAMANHO_DESCONHECIDO = -1
+
+# Estado de cada movimento em uma execução (veja CompletedMoves)
+NAO_TENTADO = 0
+MOVIDO = 1
+FALHOU = 2
+
+
+class PlannedMove:
+    """
+    Um movimento planejado, materializado sob demanda (ex: Plan[i]).
+    Aceita o acesso por chave do antigo formato em dicionário (movimento["arquivo"] etc.).
+    """
+    __slots__ = ("arquivo", "origem", "destino_pasta", "destino_nome_curto", "hardlink_de", "tamanho")
+
+    def __init__(self, arquivo, origem, destino_pasta, destino_nome_curto, hardlink_de=None, tamanho=None):
+        self.arquivo = arquivo
+        self.origem = origem
+        self.destino_pasta = destino_pasta
+        self.destino_nome_curto = destino_nome_curto
+        self.hardlink_de = hardlink_de
+        self.tamanho = tamanho # Tamanho em bytes registrado na varredura (None se desconhecido)
+
+    def __getitem__(self, chave):
+        try:
+            return getattr(self, chave)
+        except AttributeError:
+            raise KeyError(chave) from None
+
+    def get(self, chave, padrao=None):
+        valor = getattr(self, chave, None)
+        return padrao if valor is None else valor
+
+    def __repr__(self):
+        return f"PlannedMove({self.origem!r} -> {self.destino_pasta!r})"
+
+
+class _NameColumn:
+    """
+    Coluna de nomes de arquivo codificados em UTF-8, concatenados em um único buffer com um
+    array de deslocamentos (sem um objeto str por entrada). Com spill(), o buffer passa para
+    um arquivo temporário lido por mmap; novos nomes continuam sendo acrescentados ao arquivo.
+    A leitura de um nome ainda não gravado grava o buffer e reabre o mmap, o que não é seguro
+    entre threads: antes de ler em paralelo, freeze() deixa todos os nomes gravados e mapeados.
+    """
+    def __init__(self):
+        self._offsets = array('Q', [0])
+        self._dados = bytearray()
+        self._arquivo = None
+        self._mapa = None
+        self._gravados = 0 # Bytes já gravados no arquivo temporário
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    @property
+    def nbytes(self):
+        return self._offsets[-1]
+
+    @property
+    def spilled(self):
+        return self._arquivo is not None
+
+    def append(self, nome):
+        codificado = nome.encode('utf-8', 'surrogatepass') # Preserva nomes não decodificáveis (surrogateescape)
+        self._dados += codificado
+        self._offsets.append(self._offsets[-1] + len(codificado))
+        if self._arquivo is not None and len(self._dados) >= 1024 * 1024:
+            self._flush()
+
+    def _flush(self):
+        if self._dados:
+            self._arquivo.seek(0, os.SEEK_END)
+            self._arquivo.write(self._dados)
+            self._gravados += len(self._dados)
+            self._dados = bytearray()
+            self._fechar_mapa()
+
+    def _fechar_mapa(self):
+        if self._mapa is not None:
+            self._mapa.close()
+            self._mapa = None
+
+    def spill(self):
+        """Transfere os nomes para um arquivo temporário (apagado automaticamente ao fechar)."""
+        if self._arquivo is None:
+            self._arquivo = tempfile.TemporaryFile(prefix='organizer_plan_')
+            self._flush()
+
+    def _abrir_mapa(self):
+        if self._mapa is None and self._gravados:
+            self._arquivo.flush()
+            self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def freeze(self):
+        """Grava o restante do buffer e abre o mmap: daí em diante a leitura não altera o estado."""
+        if self._arquivo is not None:
+            self._flush()
+            self._abrir_mapa()
+
+    def __getitem__(self, indice):
+        inicio, fim = self._offsets[indice], self._offsets[indice + 1]
+        if self._arquivo is None:
+            return self._dados[inicio:fim].decode('utf-8', 'surrogatepass')
+        if fim > self._gravados:
+            self._flush()
+        self._abrir_mapa()
+        if self._mapa is None:
+            return ''
+        return self._mapa[inicio:fim].decode('utf-8', 'surrogatepass')
+
+    def close(self):
+        self._fechar_mapa()
+        if self._arquivo is not None:
+            self._arquivo.close()
+
+    def __getstate__(self):
+        """Serializa (ex: entre processos) os deslocamentos e os bytes dos nomes, sem o arquivo temporário."""
+        if self._arquivo is None:
+            dados = bytes(self._dados)
+        else:
+            self._flush()
+            self._arquivo.seek(0)
+            dados = self._arquivo.read()
+        return {"offsets": self._offsets, "dados": dados}
+
+    def __setstate__(self, estado):
+        self.__init__()
+        self._offsets = estado["offsets"]
+        self._dados = bytearray(estado["dados"])
+
+
+class Plan:
+    """
+    Plano de movimentos em colunas compactas, para execuções com milhões de arquivos.
+
+    Cada movimento ocupa poucos bytes além do próprio nome:
+    - o nome do arquivo (não o caminho completo) em uma coluna UTF-8 contígua (_NameColumn);
+    - o índice da pasta de origem, internada em uma tabela (uma entrada por pasta distinta);
+    - o índice do destino, internado como o par (pasta de destino, categoria);
+    - o tamanho do arquivo registrado na varredura (8 bytes; TAMANHO_DESCONHECIDO se não houver).
+    Marcações de link físico (deduplicação) ficam em um dicionário esparso.
+    Acima de 'spill_bytes' bytes de nomes, a coluna de nomes passa para um arquivo temporário.
+
+    A interface de sequência (len, índice, iteração) materializa PlannedMove sob demanda, para
+    compatibilidade; o núcleo (execute_moves, prévia da GUI) usa os acessores por índice.
+    """
+    def __init__(self, spill_bytes=LIMITE_NOMES_EM_MEMORIA):
+        self.spill_bytes = spill_bytes
+        self._nomes = _NameColumn()
+        self._pasta_origem = array('I')
+        self._destino = array('I')
+        self._tamanhos = array('q')
+        self._pastas_origem = [] # Pastas de origem internadas
+        self._indice_pasta_origem = {}
+        self._destinos = [] # Pares (pasta de destino, categoria) internados
+        self._indice_destino = {}
+        self._hardlinks = {} # índice -> caminho do original
+        self._hardlink_checks = {} # índice -> ((tamanho, mtime_ns) da origem, (tamanho, mtime_ns) do original)
+
+    @classmethod
+    def from_moves(cls, moves, spill_bytes=LIMITE_NOMES_EM_MEMORIA):
+        """Monta um Plan a partir de movimentos no formato de dicionário (ou PlannedMove)."""
+        if isinstance(moves, Plan):
+            return moves
+        plano = cls(spill_bytes)
+        plano.extend(moves)
+        return plano
+
+    def _intern_source(self, pasta):
+        indice = self._indice_pasta_origem.get(pasta)
+        if indice is None:
+            indice = self._indice_pasta_origem[pasta] = len(self._pastas_origem)
+            self._pastas_origem.append(pasta)
+        return indice
+
+    def _intern_destination(self, destino_pasta, categoria):
+        chave = (destino_pasta, categoria)
+        indice = self._indice_destino.get(chave)
+        if indice is None:
+            indice = self._indice_destino[chave] = len(self._destinos)
+            self._destinos.append(chave)
+        return indice
+
+    def add(self, origem, destino_pasta, categoria, hardlink_de=None, tamanho=None):
+        """Acrescenta o movimento de 'origem' (caminho completo) para 'destino_pasta'."""
+        pasta, nome = os.path.split(origem)
+        self._nomes.append(nome)
+        self._pasta_origem.append(self._intern_source(pasta))
+        self._destino.append(self._intern_destination(destino_pasta, categoria))
+        self._tamanhos.append(TAMANHO_DESCONHECIDO if tamanho is None else tamanho)
+        if hardlink_de:
+            self._hardlinks[len(self._destino) - 1] = hardlink_de
+        if self.spill_bytes is not None and not self._nomes.spilled and self._nomes.nbytes > self.spill_bytes:
+            self._nomes.spill()
+
+    def append(self, movimento):
+        self.add(movimento["origem"], movimento["destino_pasta"], movimento["destino_nome_curto"],
+                 movimento.get("hardlink_de"), movimento.get("tamanho"))
+
+    def extend(self, movimentos):
+        for movimento in movimentos:
+            self.append(movimento)
+
+    def __len__(self):
+        return len(self._destino)
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError(indice)
+        destino_pasta, categoria = self._destinos[self._destino[indice]]
+        return PlannedMove(self.name(indice), self.source_path(indice), destino_pasta, categoria,
+                           self._hardlinks.get(indice), self.size(indice))
+
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield self[indice]
+
+    # --- Acessores por índice (não materializam o movimento) ---
+
+    def name(self, indice):
+        return self._nomes[indice]
+
+    def source_path(self, indice):
+        return os.path.join(self._pastas_origem[self._pasta_origem[indice]], self._nomes[indice])
+
+    def source_folder(self, indice):
+        return self._pastas_origem[self._pasta_origem[indice]]
+
+    def destination_index(self, indice):
+        """Índice internado do destino; movimentos com o mesmo índice vão para a mesma pasta."""
+        return self._destino[indice]
+
+    def destination_folder(self, indice):
+        return self._destinos[self._destino[indice]][0]
+
+    def category(self, indice):
+        return self._destinos[self._destino[indice]][1]
+
+    def destination_folders(self):
+        """Pastas de destino distintas do plano, na ordem em que aparecem."""
+        return list(dict.fromkeys(pasta for pasta, _ in self._destinos))
+
+    def set_destination(self, indice, destino_pasta, categoria):
+        self._destino[indice] = self._intern_destination(destino_pasta, categoria)
+
+    def size(self, indice):
+        """Tamanho em bytes registrado na varredura, ou None se desconhecido."""
+        tamanho = self._tamanhos[indice]
+        return None if tamanho == TAMANHO_DESCONHECIDO else tamanho
+
+    def set_size(self, indice, tamanho):
+        self._tamanhos[indice] = TAMANHO_DESCONHECIDO if tamanho is None else tamanho
+
+    def total_bytes(self):
+        """Soma dos tamanhos conhecidos."""
+        return sum(tamanho for tamanho in self._tamanhos if tamanho != TAMANHO_DESCONHECIDO)
+
+    def hardlink_of(self, indice):
+        return self._hardlinks.get(indice)
+
+    def set_hardlink(self, indice, original, check=None):
+        """
+        Marca o movimento 'indice' para link físico com 'original'. 'check' guarda o tamanho e o
+        mtime dos dois arquivos quando o conteúdo foi comparado (veja hardlink_check).
+        """
+        self._hardlinks[indice] = original
+        if check is not None:
+            self._hardlink_checks[indice] = check
+
+    def hardlink_check(self, indice):
+        """((tamanho, mtime_ns) da origem, (tamanho, mtime_ns) do original) da comparação, ou None."""
+        return self._hardlink_checks.get(indice)
+
+    def hardlinks(self):
+        """Pares (índice, original) dos movimentos marcados para link físico."""
+        return sorted(self._hardlinks.items())
+
+    def subset(self, indices, keep_hardlinks=True):
+        """Novo Plan apenas com os movimentos de 'indices', na ordem dada."""
+        plano = Plan(self.spill_bytes)
+        for indice in indices:
+            destino_pasta, categoria = self._destinos[self._destino[indice]]
+            plano.add(self.source_path(indice), destino_pasta, categoria,
+                      self._hardlinks.get(indice) if keep_hardlinks else None, self.size(indice))
+            if keep_hardlinks and indice in self._hardlink_checks:
+                plano._hardlink_checks[len(plano) - 1] = self._hardlink_checks[indice]
+        return plano
+
+    def spill(self):
+        """Transfere a coluna de nomes para um arquivo temporário."""
+        self._nomes.spill()
+
+    def freeze(self):
+        """
+        Prepara o plano para leitura concorrente (execução com várias threads): grava os nomes
+        ainda em buffer e mapeia o arquivo temporário. Acrescentar movimentos depois desfaz isso.
+        """
+        self._nomes.freeze()
+
+    @property
+    def spilled(self):
+        return self._nomes.spilled
+
+    def close(self):
+        """Libera o arquivo temporário da coluna de nomes, se houver."""
+        self._nomes.close()
+
+    def __setstate__(self, estado):
+        # A coluna de nomes chega em memória (veja _NameColumn.__getstate__) e volta ao disco se for grande
+        self.__dict__.update(estado)
+        if self.spill_bytes is not None and self._nomes.nbytes > self.spill_bytes:
+            self._nomes.spill()
+
+
+class CompletedMoves:
+    """
+    Visão preguiçosa dos movimentos concluídos de uma execução sobre um Plan.
+    Guarda apenas um byte de estado por movimento e os nomes finais que mudaram por colisão;
+    a iteração produz os pares (origem, destino final).
+    """
+    def __init__(self, plan, status, renomeados):
+        self._plan = plan
+        self._status = status
+        self._renomeados = renomeados
+        self._total = status.count(MOVIDO)
+
+    def __len__(self):
+        return self._total
+
+    def __iter__(self):
+        plano = self._plan
+        for indice, estado in enumerate(self._status):
+            if estado == MOVIDO:
+                nome_final = self._renomeados.get(indice) or plano.name(indice)
+                yield plano.source_path(indice), os.path.join(plano.destination_folder(indice), nome_final)
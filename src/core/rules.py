@@ -0,0 +1,294 @@
+# src/core/rules.py
+
+import os
+import re
+import time
+import string
+import fnmatch
+import logging
+from datetime import datetime
+
+from core.classifier import ExtensionClassifier, normalize_extension
+
+logger = logging.getLogger('files_organizer_py')
+
+RULES_FILENAME = 'rules.json' # Fica na mesma pasta do categories.json
+
+_UNIDADES = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4}
+_TAMANHO_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([KMGT]?B?)\s*$', re.IGNORECASE)
+_CAMPOS = {"name", "enabled", "category", "extensions", "glob", "regex", "min_size", "max_size",
+           "older_than_days", "newer_than_days", "destination"}
+# Marcadores aceitos em 'destination': {category} sem acesso a atributos/índices e {mtime} (ex: {mtime.year})
+_MARCADOR_MTIME_RE = re.compile(r'^mtime(\.[A-Za-z]\w*)?$')
+
+
+def rules_path_for(categories_config_path):
+    """Caminho do rules.json ao lado do categories.json informado."""
+    return os.path.join(os.path.dirname(os.path.abspath(categories_config_path)), RULES_FILENAME)
+
+
+def safe_relative_path(destino):
+    """
+    Normaliza um destino relativo à pasta organizada ('/' ou '\\' como separador).
+    Retorna None se ele estiver vazio ou puder sair da pasta (partes '.' ou '..', unidade do Windows).
+    """
+    partes = [parte for parte in destino.replace('\\', '/').split('/') if parte]
+    if not partes or any(parte in ('.', '..') or os.path.splitdrive(parte)[0] for parte in partes):
+        return None
+    return os.path.join(*partes)
+
+
+def parse_size(valor):
+    """Converte um tamanho (número de bytes ou texto como '2GB', '500 MB', '1.5G') em bytes."""
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return int(valor)
+    encontrado = _TAMANHO_RE.match(str(valor))
+    if not encontrado:
+        raise ValueError(f"tamanho inválido: {valor!r}")
+    unidade = encontrado.group(2).upper()
+    if unidade and not unidade.endswith('B'):
+        unidade += 'B'
+    return int(float(encontrado.group(1)) * _UNIDADES[unidade or "B"])
+
+
+class _Rule:
+    """Uma regra compilada. Todas as condições presentes precisam ser satisfeitas."""
+    __slots__ = ("nome", "categorias", "extensoes", "padrao", "min_size", "max_size",
+                 "min_idade", "max_idade", "destino", "destino_dinamico", "precisa_stat")
+
+    def __init__(self, nome, categorias, extensoes, padrao, min_size, max_size, min_idade, max_idade, destino):
+        self.nome = nome
+        self.categorias = categorias
+        self.extensoes = extensoes
+        self.padrao = padrao
+        self.min_size = min_size
+        self.max_size = max_size
+        self.min_idade = min_idade
+        self.max_idade = max_idade
+        self.destino = destino
+        self.destino_dinamico = '{' in destino
+        self.precisa_stat = (min_size is not None or max_size is not None or min_idade is not None
+                             or max_idade is not None or 'mtime' in destino)
+
+    def matches_stat(self, st, agora):
+        tamanho = st.st_size
+        if self.min_size is not None and tamanho < self.min_size:
+            return False
+        if self.max_size is not None and tamanho > self.max_size:
+            return False
+        idade = agora - st.st_mtime
+        if self.min_idade is not None and idade < self.min_idade:
+            return False
+        if self.max_idade is not None and idade > self.max_idade:
+            return False
+        return True
+
+    def destination(self, categoria_base, st):
+        if not self.destino_dinamico:
+            return self.destino
+        mtime = datetime.fromtimestamp(st.st_mtime) if st is not None else None
+        # O resultado formatado é conferido de novo: o nome da categoria e o mtime variam por arquivo
+        destino = safe_relative_path(self.destino.format(category=categoria_base, mtime=mtime))
+        if destino is None:
+            logger.warning(f"Regra '{self.nome}': destino fora da pasta organizada. Usando '{categoria_base}'.")
+            return categoria_base
+        return destino
+
+
+def _compile_rule(posicao, regra):
+    """Valida e compila uma regra do rules.json. Retorna (_Rule, padrão de nome para o matcher combinado)."""
+    nome = regra.get("name") or f"regra {posicao}"
+    erro = f"Regra {posicao} ('{nome}')"
+    desconhecidos = set(regra) - _CAMPOS
+    if desconhecidos:
+        raise ValueError(f"{erro}: campo(s) desconhecido(s): {', '.join(sorted(desconhecidos))}.")
+    destino = regra.get("destination")
+    if not destino or not isinstance(destino, str):
+        raise ValueError(f"{erro}: 'destination' é obrigatório.")
+    # Caminho relativo à pasta organizada, com o separador do sistema
+    partes = [parte for parte in destino.replace('\\', '/').split('/') if parte]
+    destino = os.path.join(*partes) if partes else ""
+    try:
+        for _, campo, especificacao, _ in string.Formatter().parse(destino):
+            if campo is None:
+                continue
+            if campo != "category" and not _MARCADOR_MTIME_RE.match(campo):
+                raise ValueError(f"marcador {{{campo}}} não permitido")
+            if especificacao and '{' in especificacao:
+                raise ValueError(f"marcador aninhado em {{{campo}:{especificacao}}}")
+        formatado = destino.format(category="x", mtime=datetime.now())
+    except (KeyError, IndexError, ValueError, AttributeError, TypeError) as e:
+        raise ValueError(f"{erro}: 'destination' tem um marcador inválido ({e}). Use {{category}} ou {{mtime:%Y-%m}}.")
+    # A segurança do caminho vale para o resultado: '{mtime:..}' também sairia da pasta
+    if safe_relative_path(formatado) is None:
+        raise ValueError(f"{erro}: 'destination' deve ser um caminho relativo dentro da pasta organizada.")
+
+    def lista(campo):
+        valor = regra.get(campo)
+        if valor is None:
+            return None
+        return [valor] if isinstance(valor, str) else list(valor)
+
+    categorias = lista("category")
+    extensoes = lista("extensions")
+    padroes = [] # Envolvidos em um grupo, para o padrão combinado
+    originais = [] # Como escritos, para compilar separadamente
+    for glob in lista("glob") or []:
+        traduzido = f"(?i:^{fnmatch.translate(glob)})" # Glob casa o nome inteiro, sem diferenciar maiúsculas
+        padroes.append(traduzido)
+        originais.append(traduzido)
+    for expressao in lista("regex") or []:
+        try:
+            re.compile(expressao)
+        except re.error as e:
+            raise ValueError(f"{erro}: 'regex' inválida {expressao!r}: {e}.")
+        padroes.append(f"(?:{expressao})")
+        originais.append(expressao)
+    padrao = None
+    if padroes:
+        combinado = '|'.join(padroes)
+        try:
+            padrao = re.compile(combinado)
+        except re.error:
+            # Flags globais (ex: '(?i)') só valem no início: compila cada padrão, sem o grupo, separadamente
+            try:
+                padrao = _AnyPattern([re.compile(expressao) for expressao in originais])
+            except re.error as e:
+                raise ValueError(f"{erro}: padrão de nome inválido: {e}.")
+            combinado = None
+
+    try:
+        min_size = parse_size(regra["min_size"]) if "min_size" in regra else None
+        max_size = parse_size(regra["max_size"]) if "max_size" in regra else None
+        min_idade = float(regra["older_than_days"]) * 86400 if "older_than_days" in regra else None
+        max_idade = float(regra["newer_than_days"]) * 86400 if "newer_than_days" in regra else None
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"{erro}: {e}.")
+
+    compilada = _Rule(nome, frozenset(categorias) if categorias is not None else None,
+                      frozenset(normalize_extension(extensao) for extensao in extensoes) if extensoes is not None else None,
+                      padrao, min_size, max_size, min_idade, max_idade, destino)
+    return compilada, (combinado if padroes else None)
+
+
+class _AnyPattern:
+    """Substituto de um padrão combinado quando as expressões não podem ser unidas em uma só."""
+    def __init__(self, padroes):
+        self._padroes = padroes
+
+    def search(self, texto):
+        for padrao in self._padroes:
+            encontrado = padrao.search(texto)
+            if encontrado:
+                return encontrado
+        return None
+
+
+class RuleClassifier:
+    """
+    Classificador por regras (tamanho, idade, glob/regex de nome e categoria/extensão), com o
+    ExtensionClassifier como alternativa quando nenhuma regra casa. Mesma interface do
+    ExtensionClassifier (classify, is_category_folder, categoria_padrao, categorias).
+
+    As regras são compiladas uma única vez:
+    - os padrões de nome de todas as regras formam um único matcher combinado; um nome que
+      não casa com ele descarta de uma vez todas as regras com padrão;
+    - as regras candidatas de cada categoria base (resultado do índice de extensões) ficam
+      pré-calculadas, então uma regra de 'Videos' nem é avaliada para um '.pdf';
+    - o stat só é consultado se uma regra candidata precisar de tamanho ou data, e vem do
+      DirEntry da varredura (classify recebe a função 'stat' do item).
+    A primeira regra (na ordem do rules.json) que casar define a pasta de destino.
+    """
+    def __init__(self, categorias, regras):
+        self._extensoes = ExtensionClassifier(categorias)
+        self.categoria_padrao = self._extensoes.categoria_padrao
+        self.categorias = list(self._extensoes.categorias)
+
+        self._regras = []
+        padroes = []
+        combinavel = True
+        for posicao, regra in enumerate(regras, start=1):
+            if not isinstance(regra, dict):
+                raise ValueError(f"Regra {posicao}: deve ser um objeto JSON.")
+            if not regra.get("enabled", True):
+                continue
+            compilada, padrao = _compile_rule(posicao, regra)
+            self._regras.append(compilada)
+            if padrao:
+                padroes.append(padrao)
+            elif compilada.padrao is not None:
+                combinavel = False
+        try:
+            self._combinado = re.compile('|'.join(padroes)) if padroes and combinavel else None
+        except re.error:
+            self._combinado = None # Sem pré-filtro: cada regra usa o próprio padrão
+        self._candidatos = {}
+        self.time_dependent = any(regra.min_idade is not None or regra.max_idade is not None
+                                  for regra in self._regras)
+        # O destino pode mudar com o tamanho/mtime do arquivo, sem que o nome mude (veja core.scan_cache)
+        self.stat_dependent = any(regra.precisa_stat for regra in self._regras)
+
+        # Pastas de primeiro nível criadas pelas regras também são pastas de destino
+        nomes = set(self._extensoes.categorias)
+        for regra in self._regras:
+            primeira = regra.destino.split(os.sep)[0]
+            if '{' not in primeira:
+                nomes.add(primeira)
+                if primeira not in self.categorias:
+                    self.categorias.append(primeira)
+        self._nomes_categorias = frozenset(nomes)
+
+    def __len__(self):
+        return len(self._regras)
+
+    def is_category_folder(self, nome):
+        return nome in self._nomes_categorias
+
+    def _candidates(self, categoria_base):
+        candidatos = self._candidatos.get(categoria_base)
+        if candidatos is None:
+            candidatos = self._candidatos[categoria_base] = tuple(
+                regra for regra in self._regras if regra.categorias is None or categoria_base in regra.categorias)
+        return candidatos
+
+    def classify(self, nome_arquivo, stat=None):
+        """
+        Retorna a pasta de destino (categoria ou caminho relativo de uma regra) de um arquivo.
+        'stat' é uma função sem argumentos que retorna o os.stat_result do arquivo (ex: entry.stat);
+        sem ela, as regras de tamanho e data são ignoradas.
+        """
+        categoria_base = self._extensoes.classify(nome_arquivo)
+        candidatos = self._candidates(categoria_base)
+        if not candidatos:
+            return categoria_base
+
+        nome_casa = None
+        st = None
+        sufixos = None
+        agora = None
+        for regra in candidatos:
+            if regra.extensoes is not None:
+                if sufixos is None:
+                    partes = nome_arquivo.casefold().split('.')
+                    sufixos = {'.' + '.'.join(partes[i:]) for i in range(1 if partes[0] else 2, len(partes))}
+                if sufixos.isdisjoint(regra.extensoes):
+                    continue
+            if regra.padrao is not None:
+                if nome_casa is None:
+                    nome_casa = self._combinado is None or self._combinado.search(nome_arquivo) is not None
+                if not nome_casa or not regra.padrao.search(nome_arquivo):
+                    continue
+            if regra.precisa_stat:
+                if st is None:
+                    if stat is None:
+                        continue
+                    try:
+                        st = stat()
+                    except OSError:
+                        stat = None
+                        continue
+                    agora = time.time()
+                if not regra.matches_stat(st, agora):
+                    continue
+            return regra.destination(categoria_base, st)
+        return categoria_base
@@ -0,0 +1,144 @@
+# src/core/scan_cache.py
+
+import os
+import time
+import sqlite3
+import logging
+
+logger = logging.getLogger('files_organizer_py')
+
+# Uma pasta só é considerada "inalterada" pelo mtime se ele for mais antigo que esta margem
+# no momento em que foi gravado. Evita confiar em mtimes de baixa resolução (ex: FAT, 2s)
+# quando arquivos chegam no mesmo "tique" da varredura.
+MARGEM_MTIME_NS = 2_000_000_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS folders (
+    folder TEXT PRIMARY KEY,
+    dir_mtime_ns INTEGER,
+    signature TEXT NOT NULL,
+    ignored INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS entries (
+    folder TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    PRIMARY KEY (folder, name)
+) WITHOUT ROWID;
+"""
+
+
+class FolderCache:
+    """Estado em cache de uma única pasta durante uma análise. Criado por ScanCache.folder."""
+    def __init__(self, scan_cache, folder, signature, dir_mtime_ns, ignored, entries):
+        self._scan_cache = scan_cache
+        self.folder = folder
+        self.signature = signature
+        self.dir_mtime_ns = dir_mtime_ns
+        self.ignored = ignored
+        self._entries = entries # {nome: (tamanho, mtime_ns, categoria)}
+        self._novas_entradas = {}
+
+    def is_unchanged(self, dir_mtime_ns):
+        """Indica se a listagem da pasta não mudou desde a última análise (mesmo mtime da pasta)."""
+        return self.dir_mtime_ns is not None and self.dir_mtime_ns == dir_mtime_ns
+
+    def planned(self):
+        """
+        Retorna os pares (nome, categoria) registrados na última análise. Os tamanhos não são
+        devolvidos: um arquivo alterado no lugar não muda o mtime da pasta (quem precisa deles
+        consulta o arquivo).
+        """
+        self._scan_cache.folder_hits += 1
+        self._scan_cache.hits += len(self._entries)
+        return [(nome, dados[2]) for nome, dados in self._entries.items()]
+
+    def lookup(self, nome, tamanho, mtime_ns):
+        """Retorna a categoria em cache se a impressão digital (tamanho, mtime) bater, ou None."""
+        dados = self._entries.get(nome)
+        if dados is not None and dados[0] == tamanho and dados[1] == mtime_ns:
+            self._scan_cache.hits += 1
+            return dados[2]
+        self._scan_cache.misses += 1
+        return None
+
+    def record(self, nome, tamanho, mtime_ns, categoria):
+        """Registra a entrada classificada nesta análise."""
+        self._novas_entradas[nome] = (tamanho, mtime_ns, categoria)
+
+    def commit(self, dir_mtime_ns, ignored):
+        """Grava o resultado da análise, substituindo o estado anterior da pasta."""
+        if dir_mtime_ns is not None and dir_mtime_ns > time.time_ns() - MARGEM_MTIME_NS:
+            dir_mtime_ns = None # mtime recente demais para ser confiável
+        self._scan_cache._save(self.folder, self.signature, dir_mtime_ns, ignored, self._novas_entradas)
+
+
+class ScanCache:
+    """
+    Índice persistente (SQLite) das análises de pastas, usado para re-organizações incrementais.
+
+    Para cada pasta guarda o mtime da própria pasta e a impressão digital (tamanho, mtime)
+    de cada arquivo planejado com sua categoria. Na próxima análise:
+    - se o mtime da pasta não mudou, o plano anterior é reaproveitado sem listar a pasta, desde
+      que a categoria dependa só do nome (um arquivo alterado no lugar não muda o mtime da pasta;
+      se os tamanhos forem pedidos, vêm de um stat de cada arquivo);
+    - caso contrário, só as entradas novas ou alteradas (tamanho ou mtime do próprio arquivo)
+      são classificadas novamente.
+    Mudanças em categories.json/exclude_list.json (assinatura) invalidam o cache da pasta.
+
+    Cada operação abre sua própria conexão, então a instância pode ser usada a partir
+    de threads diferentes (ex: a thread de trabalho da GUI em execuções sucessivas).
+    """
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self.folder_hits = 0
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def folder(self, folder, signature):
+        """Carrega o estado em cache de 'folder'. Estados com assinatura diferente são descartados."""
+        folder = os.path.abspath(folder)
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute("SELECT dir_mtime_ns, signature, ignored FROM folders WHERE folder = ?",
+                                   (folder,)).fetchone()
+                if row is None or row[1] != signature:
+                    if row is not None:
+                        logger.info(f"Configuração alterada desde a última análise de '{folder}'. Cache invalidado.")
+                    return FolderCache(self, folder, signature, None, 0, {})
+                entries = {nome: (tamanho, mtime_ns, categoria) for nome, tamanho, mtime_ns, categoria in
+                           conn.execute("SELECT name, size, mtime_ns, category FROM entries WHERE folder = ?", (folder,))}
+                return FolderCache(self, folder, signature, row[0], row[2], entries)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Não foi possível ler o cache de análise '{self.db_path}': {e}")
+            return FolderCache(self, folder, signature, None, 0, {})
+
+    def _save(self, folder, signature, dir_mtime_ns, ignored, entries):
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute("DELETE FROM entries WHERE folder = ?", (folder,))
+                    conn.execute("INSERT OR REPLACE INTO folders (folder, dir_mtime_ns, signature, ignored) VALUES (?, ?, ?, ?)",
+                                 (folder, dir_mtime_ns, signature, ignored))
+                    conn.executemany("INSERT INTO entries (folder, name, size, mtime_ns, category) VALUES (?, ?, ?, ?, ?)",
+                                     ((folder, nome, *dados) for nome, dados in entries.items()))
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Não foi possível gravar o cache de análise '{self.db_path}': {e}")
+
+    def stats(self):
+        """Retorna as estatísticas acumuladas de acertos (hits) e falhas (misses) do cache."""
+        return {"hits": self.hits, "misses": self.misses, "folder_hits": self.folder_hits}
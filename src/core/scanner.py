@@ -0,0 +1,123 @@
+# src/core/scanner.py
+
+import os
+import stat
+import logging
+
+logger = logging.getLogger('files_organizer_py')
+
+# Tipos possíveis de uma entrada de diretório
+TIPO_ARQUIVO = "arquivo"
+TIPO_PASTA = "pasta"
+TIPO_OUTRO = "outro"
+
+
+def classify_entry(entry):
+    """
+    Classifica um os.DirEntry como arquivo, pasta ou outro tipo.
+    Usa as informações de tipo já retornadas pelo sistema operacional (d_type),
+    então na maioria dos sistemas de arquivos nenhuma chamada 'stat' extra é feita.
+    """
+    try:
+        if entry.is_dir():
+            return TIPO_PASTA
+        if entry.is_file():
+            return TIPO_ARQUIVO
+    except OSError as e:
+        logger.warning(f"Não foi possível determinar o tipo de '{entry.path}': {e}")
+    return TIPO_OUTRO
+
+
+def stat_path(path):
+    """
+    Classifica um caminho avulso (sem DirEntry) como arquivo, pasta ou outro tipo, com um único stat.
+    Retorna (tipo, stat), ou (None, None) se o caminho não existir mais.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None, None
+    except OSError as e:
+        logger.warning(f"Não foi possível determinar o tipo de '{path}': {e}")
+        return TIPO_OUTRO, None
+    if stat.S_ISDIR(st.st_mode):
+        return TIPO_PASTA, st
+    if stat.S_ISREG(st.st_mode):
+        return TIPO_ARQUIVO, st
+    return TIPO_OUTRO, st
+
+
+def walk_directory(root, should_descend=None, max_depth=None, follow_symlinks=False):
+    """
+    Percorre uma árvore de pastas com os.scandir e uma pilha explícita (sem recursão).
+    Gera tuplas (entry, tipo, profundidade) de forma preguiçosa: arquivos e outros itens,
+    além das pastas nas quais o walker NÃO desce (podadas), para que quem chama possa
+    registrá-las. Pastas percorridas não são geradas.
+
+    Apenas um os.scandir fica aberto por vez: as subpastas encontradas são empilhadas
+    e só são lidas depois que a pasta atual termina.
+
+    Args:
+        root (str): Pasta inicial (profundidade 0 são os itens dela).
+        should_descend (callable, optional): Recebe (entry, profundidade) e retorna False
+                                             para podar a pasta antes de descer nela.
+        max_depth (int, optional): Quantos níveis de subpastas percorrer. 0 lê apenas 'root';
+                                   None não impõe limite.
+        follow_symlinks (bool): Se True, desce em links simbólicos para pastas, protegendo
+                                contra ciclos pelo par (st_dev, st_ino) já visitado.
+    """
+    visitados = set()
+    if follow_symlinks:
+        st = os.stat(root)
+        visitados.add((st.st_dev, st.st_ino))
+
+    pilha = [(root, 0)]
+    while pilha:
+        pasta, profundidade = pilha.pop()
+        try:
+            iterator = os.scandir(pasta)
+        except OSError as e:
+            if profundidade == 0:
+                raise
+            logger.warning(f"Não foi possível ler a pasta '{pasta}': {e}")
+            continue
+
+        with iterator:
+            for entry in iterator:
+                tipo = classify_entry(entry)
+                if tipo != TIPO_PASTA:
+                    yield entry, tipo, profundidade
+                    continue
+
+                if max_depth is not None and profundidade >= max_depth:
+                    yield entry, tipo, profundidade
+                    continue
+                if should_descend is not None and not should_descend(entry, profundidade):
+                    yield entry, tipo, profundidade
+                    continue
+
+                if entry.is_symlink():
+                    if not follow_symlinks:
+                        yield entry, tipo, profundidade
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError as e:
+                        logger.warning(f"Não foi possível seguir o link '{entry.path}': {e}")
+                        yield entry, tipo, profundidade
+                        continue
+                    chave = (st.st_dev, st.st_ino)
+                    if chave in visitados:
+                        logger.warning(f"Ciclo de links simbólicos detectado em '{entry.path}'. Pasta ignorada.")
+                        yield entry, tipo, profundidade
+                        continue
+                    visitados.add(chave)
+                elif follow_symlinks:
+                    # Pastas reais também entram no conjunto para detectar links que apontam para elas
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                        visitados.add((st.st_dev, st.st_ino))
+                    except OSError:
+                        pass
+
+                pilha.append((entry.path, profundidade + 1))
@@ -0,0 +1,197 @@
+# src/core/scheduling.py
+
+import os
+import time
+from array import array
+
+# Políticas de ordem de execução (veja schedule_moves)
+SCHEDULE_PLAN = "plan"
+SCHEDULE_SMALL_FIRST = "small-first"
+SCHEDULE_INTERLEAVE = "interleave"
+SCHEDULE_POLICIES = (SCHEDULE_PLAN, SCHEDULE_SMALL_FIRST, SCHEDULE_INTERLEAVE)
+
+LIMITE_COPIA_GRANDE = 64 * 1024 * 1024 # Cópias acima deste tamanho são intercaladas com os movimentos leves
+# Custos estimados antes de qualquer medida, usados apenas para ordenar os grupos de destino
+SEGUNDOS_RENOMEACAO = 0.001
+VAZAO_COPIA = 100 * 1024 * 1024 # bytes/s
+INTERVALO_PROGRESSO = 0.5 # Segundos entre atualizações do progresso por bytes
+ALFA_SUAVIZACAO = 0.3 # Peso da medida mais recente na média móvel exponencial
+
+
+def fill_sizes(plano):
+    """Completa com os.stat os tamanhos que a varredura não registrou (arquivos inacessíveis ficam com 0)."""
+    for indice in range(len(plano)):
+        if plano.size(indice) is None:
+            try:
+                tamanho = os.stat(plano.source_path(indice)).st_size
+            except OSError:
+                tamanho = 0
+            plano.set_size(indice, tamanho)
+
+
+def _device_of(pasta, dispositivos):
+    """st_dev da pasta ou, se ela ainda não existe (destino a criar), do ancestral existente mais próximo."""
+    dispositivo = dispositivos.get(pasta)
+    if dispositivo is None:
+        atual = pasta
+        while True:
+            try:
+                dispositivo = os.stat(atual).st_dev
+                break
+            except OSError:
+                pai = os.path.dirname(atual)
+                if pai == atual:
+                    dispositivo = -1
+                    break
+                atual = pai
+        dispositivos[pasta] = dispositivo
+    return dispositivo
+
+
+def predict_copies(plano):
+    """
+    Indica, para cada movimento, se ele será uma cópia entre dispositivos (1) ou uma renomeação (0),
+    com a mesma regra do FileMover (st_dev da pasta de origem e da de destino). Faz um stat por pasta
+    distinta, não por arquivo.
+    """
+    dispositivos = {}
+    por_par = {}
+    copias = bytearray(len(plano))
+    for indice in range(len(plano)):
+        par = (plano.source_folder(indice), plano.destination_index(indice))
+        copia = por_par.get(par)
+        if copia is None:
+            copia = por_par[par] = (_device_of(par[0], dispositivos) !=
+                                    _device_of(plano.destination_folder(indice), dispositivos))
+        copias[indice] = copia
+    return copias
+
+
+def estimated_seconds(plano, indices, copias):
+    """Custo estimado (em segundos) dos movimentos 'indices', antes de haver medidas da execução."""
+    return sum(plano.size(indice) / VAZAO_COPIA if copias[indice] else SEGUNDOS_RENOMEACAO for indice in indices)
+
+
+def schedule_moves(plano, policy, copias):
+    """
+    Retorna a ordem de execução (índices do plano) para a política 'policy':
+    - SCHEDULE_PLAN: a ordem do plano;
+    - SCHEDULE_SMALL_FIRST: os movimentos mais baratos primeiro (renomeações, depois as cópias da
+      menor para a maior), para concluir o maior número de arquivos o quanto antes;
+    - SCHEDULE_INTERLEAVE: cada cópia grande (acima de LIMITE_COPIA_GRANDE) seguida de uma parte
+      igual dos demais movimentos, em vez de as cópias bloquearem um trecho inteiro da execução.
+    Os tamanhos devem ser conhecidos (veja fill_sizes). A ordem define qual arquivo recebe o sufixo
+    numérico em colisões de nome, mas continua determinística para o mesmo plano.
+    """
+    if policy not in SCHEDULE_POLICIES:
+        raise ValueError(f"Política de agendamento desconhecida: {policy!r} (use {', '.join(SCHEDULE_POLICIES)}).")
+    total = len(plano)
+    if policy == SCHEDULE_SMALL_FIRST:
+        return array('Q', sorted(range(total), key=lambda indice: (copias[indice], plano.size(indice))))
+    if policy == SCHEDULE_INTERLEAVE:
+        pesadas = [indice for indice in range(total) if copias[indice] and plano.size(indice) > LIMITE_COPIA_GRANDE]
+        if pesadas and len(pesadas) < total:
+            marcadas = set(pesadas)
+            leves = [indice for indice in range(total) if indice not in marcadas]
+            passo = len(leves) / len(pesadas)
+            ordem = array('Q')
+            for k, indice in enumerate(pesadas):
+                ordem.append(indice)
+                ordem.extend(leves[round(k * passo):round((k + 1) * passo)])
+            return ordem
+    return range(total)
+
+
+class TransferProgress:
+    """
+    Progresso de uma execução em bytes, com vazão suavizada e tempo restante estimado.
+
+    As renomeações custam quase o mesmo por arquivo e as cópias entre dispositivos custam pelo
+    tamanho, então um único "arquivos por segundo" não serve para estimar o tempo restante.
+    O custo de cada tipo é medido separadamente (bytes/s das cópias, arquivos/s das renomeações),
+    com médias móveis exponenciais atualizadas a cada 'interval' segundos. O tempo restante soma
+    os dois custos pendentes e o divide pelo paralelismo observado (tempo ocupado das threads
+    sobre o tempo decorrido).
+
+    'callback' recebe o dicionário de snapshot() a cada atualização e no último movimento.
+    record() não é thread-safe: as execuções concorrentes o chamam sob o próprio lock.
+    """
+    def __init__(self, plano, copias, callback, interval=INTERVALO_PROGRESSO, alpha=ALFA_SUAVIZACAO):
+        self._plano = plano
+        self._copias = copias
+        self._callback = callback
+        self.interval = interval
+        self.alpha = alpha
+        self.files_total = len(plano)
+        self.bytes_total = 0
+        self._bytes_copia_restantes = 0
+        self._renomeacoes_restantes = 0
+        for indice in range(len(plano)):
+            tamanho = plano.size(indice) or 0
+            self.bytes_total += tamanho
+            if copias[indice]:
+                self._bytes_copia_restantes += tamanho
+            else:
+                self._renomeacoes_restantes += 1
+        self.files_done = 0
+        self.bytes_done = 0
+        self.bytes_per_second = None # Vazão suavizada (bytes concluídos por segundo de relógio)
+        self._vazao_copia = None # bytes/s de cópia, por segundo ocupado
+        self._vazao_renomeacao = None # renomeações/s, por segundo ocupado
+        self._inicio = self._ultima = time.monotonic()
+        self._ocupado = 0.0 # Soma da duração dos movimentos (todas as threads)
+        self._janela = [0, 0, 0.0, 0, 0.0] # bytes concluídos, bytes copiados, s de cópia, renomeações, s de renomeação
+
+    def _smooth(self, anterior, medida):
+        return medida if anterior is None else self.alpha * medida + (1 - self.alpha) * anterior
+
+    def record(self, indice, segundos):
+        """Registra o movimento 'indice' (concluído ou com erro), que levou 'segundos'."""
+        tamanho = self._plano.size(indice) or 0
+        self.files_done += 1
+        self.bytes_done += tamanho
+        self._ocupado += segundos
+        janela = self._janela
+        janela[0] += tamanho
+        if self._copias[indice]:
+            self._bytes_copia_restantes -= tamanho
+            janela[1] += tamanho
+            janela[2] += segundos
+        else:
+            self._renomeacoes_restantes -= 1
+            janela[3] += 1
+            janela[4] += segundos
+
+        agora = time.monotonic()
+        if agora - self._ultima < self.interval and self.files_done < self.files_total:
+            return
+        self.bytes_per_second = self._smooth(self.bytes_per_second, janela[0] / max(agora - self._ultima, 1e-6))
+        if janela[1] and janela[2] > 0:
+            self._vazao_copia = self._smooth(self._vazao_copia, janela[1] / janela[2])
+        if janela[3] and janela[4] > 0:
+            self._vazao_renomeacao = self._smooth(self._vazao_renomeacao, janela[3] / janela[4])
+        self._janela = [0, 0, 0.0, 0, 0.0]
+        self._ultima = agora
+        self._callback(self.snapshot())
+
+    def eta_seconds(self):
+        """Tempo restante estimado, ou None enquanto um tipo de movimento pendente não foi medido."""
+        if self.files_done >= self.files_total:
+            return 0.0
+        restante = 0.0
+        if self._bytes_copia_restantes > 0:
+            if not self._vazao_copia:
+                return None
+            restante += self._bytes_copia_restantes / self._vazao_copia
+        if self._renomeacoes_restantes > 0:
+            if not self._vazao_renomeacao:
+                return None
+            restante += self._renomeacoes_restantes / self._vazao_renomeacao
+        decorrido = time.monotonic() - self._inicio
+        paralelismo = max(1.0, self._ocupado / decorrido) if decorrido > 0 else 1.0
+        return restante / paralelismo
+
+    def snapshot(self):
+        return {"files_done": self.files_done, "files_total": self.files_total,
+                "bytes_done": self.bytes_done, "bytes_total": self.bytes_total,
+                "bytes_per_second": self.bytes_per_second, "eta_seconds": self.eta_seconds()}
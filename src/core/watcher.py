@@ -0,0 +1,299 @@
+# src/core/watcher.py
+
+import os
+import sys
+import time
+import errno
+import select
+import stat
+import struct
+import logging
+import threading
+
+from core.organizer_logic import plan_paths, execute_moves, EXCLUDE_CONFIG_PATH
+from core.config import get_config, ConfigError
+from core.rules import rules_path_for
+from core.journal import MoveJournal
+from core.plan import Plan
+
+logger = logging.getLogger('files_organizer_py')
+
+# Constantes de inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+_EVENT_HEADER = struct.Struct('iIII') # wd, mask, cookie, len
+
+# Arquivos temporários de downloads e cópias em andamento: só o nome final é organizado
+SUFIXOS_PARCIAIS = ('.part', '.partial', '.crdownload', '.download', '.tmp')
+
+
+class InotifyEventSource:
+    """
+    Fonte de eventos baseada em inotify (Linux), acessada via ctypes sem dependências externas.
+    read() retorna (prontos, criados, overflow): os nomes concluídos (IN_CLOSE_WRITE ou
+    IN_MOVED_TO), os apenas criados (IN_CREATE, ainda podem estar sendo gravados) e se a fila
+    do kernel transbordou (nesse caso quem chama deve fazer uma nova varredura completa).
+    Eventos de pastas (IN_ISDIR), como as pastas de categoria criadas pela organização, são ignorados.
+    """
+    def __init__(self, folder):
+        import ctypes
+        import ctypes.util
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if self._libc.inotify_add_watch(self._fd, os.fsencode(folder), mask) < 0:
+            err = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(err, os.strerror(err), folder)
+
+    def read(self, timeout):
+        legiveis, _, _ = select.select([self._fd], [], [], timeout)
+        if not legiveis:
+            return [], [], False
+        try:
+            dados = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return [], [], False
+
+        prontos = []
+        criados = []
+        overflow = False
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(dados):
+            _, mask, _, tamanho = _EVENT_HEADER.unpack_from(dados, offset)
+            offset += _EVENT_HEADER.size
+            nome = dados[offset:offset + tamanho].rstrip(b'\0')
+            offset += tamanho
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+            elif not mask & (IN_IGNORED | IN_ISDIR) and nome:
+                (prontos if mask & (IN_CLOSE_WRITE | IN_MOVED_TO) else criados).append(os.fsdecode(nome))
+        return prontos, criados, overflow
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingEventSource:
+    """
+    Fonte de eventos por varredura periódica, usada quando inotify não está disponível.
+    Compara a listagem atual (nome -> tamanho, mtime) com a anterior e retorna os nomes novos ou alterados
+    (como prontos: sem eventos, só a estabilidade indica que a gravação terminou).
+    """
+    def __init__(self, folder, interval=2.0):
+        self.folder = folder
+        self.interval = interval
+        self._anterior = self._listar()
+
+    def _listar(self):
+        listagem = {}
+        try:
+            with os.scandir(self.folder) as iterator:
+                for entry in iterator:
+                    try:
+                        if entry.is_dir():
+                            continue # Pastas (inclusive as de categoria) não são organizadas
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    listagem[entry.name] = (st.st_size, st.st_mtime_ns)
+        except OSError as e:
+            logger.warning(f"Não foi possível listar '{self.folder}': {e}")
+        return listagem
+
+    def read(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        atual = self._listar()
+        nomes = [nome for nome, assinatura in atual.items() if self._anterior.get(nome) != assinatura]
+        self._anterior = atual
+        return nomes, [], False
+
+    def close(self):
+        pass
+
+
+def create_event_source(folder, use_inotify=True, poll_interval=2.0):
+    """Cria a fonte de eventos: inotify no Linux, quando possível; caso contrário, varredura periódica."""
+    if use_inotify and sys.platform.startswith('linux'):
+        try:
+            return InotifyEventSource(folder)
+        except (OSError, AttributeError) as e:
+            logger.warning(f"inotify indisponível ({e}). Usando varredura periódica.")
+    return PollingEventSource(folder, poll_interval)
+
+
+class FolderWatcher:
+    """
+    Organiza continuamente uma pasta à medida que os arquivos chegam.
+
+    Os nomes recebidos da fonte de eventos ficam pendentes até que o tamanho e o mtime
+    permaneçam estáveis por 'stable_seconds'. Com inotify, um arquivo apenas criado também
+    precisa ter a gravação concluída (IN_CLOSE_WRITE ou IN_MOVED_TO): um download parado por
+    mais de 'stable_seconds' não é movido com o arquivo ainda aberto. Nomes de downloads
+    parciais (SUFIXOS_PARCIAIS, ex: '.crdownload') são ignorados; o arquivo é organizado quando
+    recebe o nome final. Os arquivos
+    estáveis são planejados com plan_paths e movidos em lotes de até 'batch_size' com
+    execute_moves, reaproveitando a mesma classificação e lógica de movimento da GUI.
+
+    A memória é limitada: no máximo 'max_pending' nomes ficam pendentes. Se chegarem mais
+    (ou a fila do kernel transbordar), os excedentes são descartados e uma nova varredura
+    da pasta é agendada para quando houver espaço.
+
+    Com 'journal_dir', todos os movimentos da sessão de observação são registrados em um
+    único diário (veja core.journal), que pode ser desfeito depois.
+    """
+    def __init__(self, source_folder, categories_config_path, stable_seconds=2.0, batch_size=500,
+                 batch_window=1.0, max_pending=10000, use_inotify=True, poll_interval=2.0, max_workers=None,
+                 journal_dir=None):
+        self.source_folder = os.path.abspath(source_folder)
+        self.categories_config_path = categories_config_path
+        self.stable_seconds = stable_seconds
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.max_pending = max_pending
+        self.use_inotify = use_inotify
+        self.poll_interval = poll_interval
+        self.max_workers = max_workers
+        self.journal_dir = journal_dir
+        self._journal = None
+
+        self._pendentes = {} # nome -> [tamanho, mtime_ns, instante da última mudança, gravação concluída]
+        self._rescan_pendente = False
+        self.totals = {"moved": 0, "errors": 0, "ignored": 0}
+
+    def _enqueue(self, nomes, concluido=True):
+        """
+        Acompanha os nomes recebidos. 'concluido' indica que a gravação terminou (evento de conclusão,
+        varredura ou polling); um nome apenas criado fica pendente, sem ser movido, até ser concluído.
+        """
+        agora = time.monotonic()
+        for nome in nomes:
+            if nome.lower().endswith(SUFIXOS_PARCIAIS):
+                continue
+            pendente = self._pendentes.get(nome)
+            if pendente is not None:
+                pendente[3] = pendente[3] or concluido
+                continue
+            if len(self._pendentes) >= self.max_pending:
+                if not self._rescan_pendente:
+                    logger.warning(f"Fila de arquivos pendentes cheia ({self.max_pending}). Nova varredura agendada.")
+                self._rescan_pendente = True
+                return
+            self._pendentes[nome] = [None, None, agora, concluido]
+
+    def _rescan(self):
+        """Enfileira os itens atuais da pasta (chegadas perdidas por transbordo e arquivos já existentes)."""
+        self._rescan_pendente = False
+        try:
+            with os.scandir(self.source_folder) as iterator:
+                self._enqueue(entry.name for entry in iterator if not entry.is_dir())
+        except OSError as e:
+            logger.error(f"Erro ao varrer '{self.source_folder}': {e}")
+
+    def _collect_stable(self):
+        """
+        Retorna os nomes concluídos cujo tamanho e mtime não mudaram por 'stable_seconds',
+        removendo-os dos pendentes. Pastas são descartadas: nunca são organizadas.
+        """
+        agora = time.monotonic()
+        estaveis = []
+        for nome, pendente in list(self._pendentes.items()):
+            tamanho, mtime_ns, desde, concluido = pendente
+            try:
+                st = os.stat(os.path.join(self.source_folder, nome))
+            except FileNotFoundError:
+                del self._pendentes[nome] # Arquivo removido ou renomeado antes de estabilizar
+                continue
+            except OSError as e:
+                logger.warning(f"Não foi possível verificar '{nome}': {e}")
+                continue
+            if stat.S_ISDIR(st.st_mode):
+                del self._pendentes[nome]
+                continue
+            if (st.st_size, st.st_mtime_ns) != (tamanho, mtime_ns):
+                pendente[:3] = (st.st_size, st.st_mtime_ns, agora)
+            elif concluido and agora - desde >= self.stable_seconds:
+                estaveis.append(nome)
+                del self._pendentes[nome]
+                if len(estaveis) >= self.batch_size:
+                    break
+        return estaveis
+
+    def _process_batch(self, nomes):
+        # A configuração é consultada a cada lote: edições nos arquivos valem sem reiniciar a observação
+        try:
+            config = get_config(self.categories_config_path, EXCLUDE_CONFIG_PATH,
+                                rules_path_for(self.categories_config_path))
+        except ConfigError as e:
+            logger.error(f"Erro na configuração: {e}. Lote adiado.")
+            self._enqueue(nomes)
+            return
+        stats = {"ignored": 0}
+        planejados = Plan()
+        planejados.extend(plan_paths(self.source_folder, nomes, config.classifier, config.exclusions, stats))
+        self.totals["ignored"] += stats["ignored"]
+        if not planejados:
+            return
+        logger.info(f"Observação: organizando lote de {len(planejados)} arquivo(s).")
+        resultado = execute_moves(planejados, max_workers=self.max_workers, journal=self._journal)
+        self.totals["moved"] += resultado["moved"]
+        self.totals["errors"] += resultado["errors"]
+
+    def run(self, stop_event=None, initial_scan=True):
+        """
+        Executa o laço de observação até que 'stop_event' (threading.Event) seja sinalizado.
+        Com 'initial_scan', os arquivos já presentes na pasta também são organizados.
+        Retorna os totais acumulados de movidos, erros e ignorados.
+        """
+        stop_event = stop_event or threading.Event()
+        source = create_event_source(self.source_folder, self.use_inotify, self.poll_interval)
+        if self.journal_dir:
+            self._journal = MoveJournal.create(self.journal_dir, self.source_folder)
+        logger.info(f"Observando a pasta '{self.source_folder}' ({type(source).__name__}).")
+        if initial_scan:
+            self._rescan()
+
+        ultimo_lote = time.monotonic()
+        lote = []
+        try:
+            while not stop_event.is_set():
+                # Com pendentes, acorda com frequência para verificar a estabilidade
+                timeout = min(self.stable_seconds / 2, self.batch_window) if self._pendentes or lote else 1.0
+                try:
+                    nomes, criados, overflow = source.read(timeout)
+                except OSError as e:
+                    if e.errno != errno.EINTR:
+                        raise
+                    nomes, criados, overflow = [], [], False
+                if overflow:
+                    logger.warning("Fila de eventos do sistema transbordou. Nova varredura agendada.")
+                    self._rescan_pendente = True
+                self._enqueue(criados, concluido=False)
+                self._enqueue(nomes)
+
+                lote.extend(self._collect_stable())
+                agora = time.monotonic()
+                if lote and (len(lote) >= self.batch_size or agora - ultimo_lote >= self.batch_window):
+                    self._process_batch(lote[:self.batch_size])
+                    lote = lote[self.batch_size:]
+                    ultimo_lote = agora
+
+                if self._rescan_pendente and len(self._pendentes) < self.max_pending // 2:
+                    self._rescan()
+        finally:
+            source.close()
+            if lote:
+                self._process_batch(lote)
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+        logger.info(f"Observação encerrada. Movidos: {self.totals['moved']}, erros: {self.totals['errors']}, "
+                    f"ignorados: {self.totals['ignored']}.")
+        return self.totals
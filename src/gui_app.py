@@ -1,20 +1,113 @@
 # src/gui_app.py
 
 import tkinter as tk
-from tkinter import filedialog, messagebox, scrolledtext, ttk
+from tkinter import messagebox, scrolledtext, ttk
 import os
 import threading
-import json
 import logging
 
-# Importa as lógicas de outros módulos
-from core.organizer_logic import organize_files, execute_moves
-from utils.logger_config import setup_logging
+# O núcleo (core.organizer_logic, core.journal, ...), o logging em arquivo e os diálogos de
+# arquivo são importados apenas no primeiro uso: a janela aparece antes de qualquer I/O
+from core.cancellation import CancelToken
 from utils.path_utils import get_resource_path # Importa a nova utilidade de caminho
 
 # --- Caminho para as configurações do aplicativo ---
 # Usa get_resource_path para garantir que o caminho funcione no executável
 APP_SETTINGS_PATH = get_resource_path('config/app_settings.json')
+# Índice persistente das análises, fica ao lado das configurações do app
+SCAN_CACHE_PATH = get_resource_path('config/scan_cache.sqlite3')
+
+
+def format_size(num_bytes):
+    """Formata um tamanho em bytes para exibição (ex: 1.5 MB)."""
+    for unidade in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.0f} {unidade}" if unidade == "B" else f"{num_bytes:.1f} {unidade}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} TB"
+
+
+def format_duration(segundos):
+    """Formata um tempo restante para exibição (ex: 45 s, 3 min, 1 h 20 min)."""
+    segundos = int(segundos)
+    if segundos < 60:
+        return f"{segundos} s"
+    if segundos < 3600:
+        return f"{segundos // 60} min"
+    return f"{segundos // 3600} h {segundos % 3600 // 60} min"
+
+
+class VirtualPlanList:
+    """
+    Lista virtualizada dos movimentos planejados.
+    O ttk.Treeview contém apenas as linhas visíveis; a barra de rolagem e a roda do mouse
+    alteram o deslocamento e as linhas são redesenhadas. Assim, planos com centenas de
+    milhares de arquivos abrem instantaneamente e sem consumir memória do Tk por linha.
+    Lê o plano (core.plan.Plan) pelos acessores por índice, sem materializar os movimentos.
+    """
+    def __init__(self, parent, planned_moves):
+        self.planned_moves = planned_moves
+        self.indices = range(len(planned_moves)) # Índices visíveis após o filtro
+        self.offset = 0
+
+        self.tree = ttk.Treeview(parent, columns=("Original File", "Destination Folder"), show="headings")
+        self.tree.heading("Original File", text="Arquivo Original")
+        self.tree.heading("Destination Folder", text="Pasta de Destino")
+        self.tree.column("Original File", width=250, anchor=tk.W)
+        self.tree.column("Destination Folder", width=250, anchor=tk.W)
+
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+        self.row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        self.tree.bind("<Configure>", lambda event: self.render())
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll(-1 if event.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda event: self.scroll(-1, "units")) # Linux
+        self.tree.bind("<Button-5>", lambda event: self.scroll(1, "units"))
+
+    def visible_rows(self):
+        # Desconta a linha do cabeçalho
+        return max(1, self.tree.winfo_height() // self.row_height - 1)
+
+    def render(self):
+        """Redesenha apenas as linhas do deslocamento atual."""
+        visiveis = self.visible_rows()
+        total = len(self.indices)
+        self.offset = max(0, min(self.offset, total - visiveis))
+        self.tree.delete(*self.tree.get_children())
+        for indice in self.indices[self.offset:self.offset + visiveis]:
+            self.tree.insert("", tk.END, values=(self.planned_moves.name(indice), self.planned_moves.category(indice)))
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + visiveis) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll(self, quantidade, unidade):
+        passo = self.visible_rows() if unidade == "pages" else 1
+        self.offset += int(quantidade) * passo
+        self.render()
+        return "break"
+
+    def _on_scrollbar(self, acao, *args):
+        if acao == "moveto":
+            self.offset = int(float(args[0]) * len(self.indices))
+            self.render()
+        elif acao == "scroll":
+            self.scroll(args[0], args[1])
+
+    def set_filter(self, texto):
+        """Mostra apenas os movimentos cujo arquivo ou pasta de destino contém 'texto'."""
+        texto = texto.strip().lower()
+        if not texto:
+            self.indices = range(len(self.planned_moves))
+        else:
+            plano = self.planned_moves
+            self.indices = [i for i in range(len(plano))
+                            if texto in plano.name(i).lower() or texto in plano.category(i).lower()]
+        self.offset = 0
+        self.render()
+        return len(self.indices)
 
 
 class FileOrganizerApp:
@@ -29,18 +122,50 @@ class FileOrganizerApp:
         # Categoria config path também usará get_resource_path
         self.categories_config_path = get_resource_path('config/categories.json')
         self.app_settings_path = APP_SETTINGS_PATH
+        self._scan_cache = None # ScanCache, aberto na primeira análise
+        self.cancel_token = None # CancelToken da organização em andamento
+        self.resume_state = None # (pasta, movimentos restantes) de uma execução cancelada
+        self.closing = threading.Event() # Sinalizado ao fechar a janela: libera a thread de trabalho
 
         self.create_widgets()
+        # Até setup_logging, as mensagens não têm destino (nada é registrado antes disso)
+        self.logger = logging.getLogger('files_organizer_py')
+        self.gui_log_handler = None
+
+        self.master.protocol("WM_DELETE_WINDOW", self.on_closing)
+        # O restante da inicialização (arquivo de log, configurações, recuperação) roda depois
+        # que a janela é desenhada: after_idle espera o primeiro desenho, after(0) vem em seguida
+        self.master.after_idle(lambda: self.master.after(0, self.finish_startup))
 
+    def finish_startup(self):
+        """Inicialização adiada: logging, última pasta usada e, em segundo plano, recuperação e pré-carga do núcleo."""
+        from utils.logger_config import setup_logging
         # Configura o logger para a GUI, passando o widget de texto
         self.logger, self.gui_log_handler = setup_logging(self.base_dir, self.log_text)
         self.logger.info("Aplicação File Organizer Py iniciada.")
         self.logger.info("-" * 40)
-        
+
         self.load_app_settings()
+        threading.Thread(target=self._startup_background, daemon=True).start()
+
+    def _startup_background(self):
+        # Importar o núcleo aqui deixa o primeiro clique em "Iniciar Organização" sem espera
+        from core.organizer_logic import JOURNAL_DIR
+        from core.journal import recover_interrupted
+        # Execuções interrompidas (queda, encerramento forçado) são concluídas ou revertidas
+        if recover_interrupted(JOURNAL_DIR):
+            self.call_in_ui(messagebox.showwarning, "Recuperação",
+                            "Uma organização anterior foi interrompida e foi recuperada.\n"
+                            "Os arquivos já movidos podem ser devolvidos com 'Desfazer Última'.")
         self.logger.info("Selecione a pasta para organizar e clique em 'Iniciar Organização'.")
 
-        self.master.protocol("WM_DELETE_WINDOW", self.on_closing)
+    @property
+    def scan_cache(self):
+        """Índice persistente das análises (SQLite), aberto no primeiro uso."""
+        if self._scan_cache is None:
+            from core.scan_cache import ScanCache
+            self._scan_cache = ScanCache(SCAN_CACHE_PATH)
+        return self._scan_cache
 
 
     def create_widgets(self):
@@ -71,6 +196,11 @@ class FileOrganizerApp:
         self.log_level_combobox.pack(side=tk.LEFT, padx=(0, 15))
         self.log_level_combobox.bind("<<ComboboxSelected>>", self.change_gui_log_level)
 
+        # Organização recursiva (inclui subpastas)
+        self.recursive_var = tk.BooleanVar(value=False)
+        self.recursive_checkbutton = tk.Checkbutton(options_frame, text="Incluir subpastas", variable=self.recursive_var)
+        self.recursive_checkbutton.pack(side=tk.LEFT, padx=(0, 15))
+
         # Barra de Progresso
         self.progress_bar = ttk.Progressbar(options_frame, orient="horizontal", length=200, mode="determinate")
         self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
@@ -84,6 +214,12 @@ class FileOrganizerApp:
         self.start_button = tk.Button(action_frame, text="Iniciar Organização", command=self.start_organization_thread, state=tk.DISABLED)
         self.start_button.pack(side=tk.LEFT, expand=True, padx=(0, 5))
 
+        self.pause_button = tk.Button(action_frame, text="Pausar", command=self.toggle_pause, state=tk.DISABLED)
+        self.pause_button.pack(side=tk.LEFT, expand=True, padx=5)
+
+        self.undo_button = tk.Button(action_frame, text="Desfazer Última", command=self.start_undo_thread)
+        self.undo_button.pack(side=tk.LEFT, expand=True, padx=5)
+
         self.cancel_button = tk.Button(action_frame, text="Cancelar", command=self.cancel_organization, state=tk.DISABLED)
         self.cancel_button.pack(side=tk.RIGHT, expand=True, padx=(5, 0))
 
@@ -107,6 +243,7 @@ class FileOrganizerApp:
 
     def load_app_settings(self):
         """Carrega as configurações do aplicativo, incluindo a última pasta usada."""
+        import json
         try:
             with open(self.app_settings_path, 'r', encoding='utf-8') as f:
                 settings = json.load(f)
@@ -128,6 +265,7 @@ class FileOrganizerApp:
 
     def save_app_settings(self, last_folder_path):
         """Salva as configurações do aplicativo, incluindo a última pasta usada."""
+        import json
         settings = {"last_folder": last_folder_path}
         try:
             # Garante que a pasta config exista antes de tentar escrever nela
@@ -140,12 +278,16 @@ class FileOrganizerApp:
 
     def on_closing(self):
         """Chamado quando a janela é fechada, para salvar configurações."""
+        self.closing.set() # Diálogos pendentes deixam de ser esperados pela thread de trabalho
+        if self.cancel_token is not None:
+            self.cancel_token.cancel() # A thread de trabalho para após o arquivo atual
         current_folder = self.folder_path_var.get()
         self.save_app_settings(current_folder)
         self.master.destroy()
 
 
     def browse_folder(self):
+        from tkinter import filedialog
         folder_selected = filedialog.askdirectory()
         if folder_selected:
             normalized_path = os.path.normpath(folder_selected)
@@ -157,10 +299,23 @@ class FileOrganizerApp:
             self.start_button.config(state=tk.DISABLED)
 
     def start_organization_thread(self):
+        # Uma execução cancelada nesta pasta pode ser retomada sem nova análise
+        resume_moves = None
+        if self.resume_state and self.resume_state[0] == self.folder_path_var.get():
+            restantes = self.resume_state[1]
+            if messagebox.askyesno("Retomar Organização",
+                                   f"A última organização desta pasta foi cancelada com {len(restantes)} "
+                                   f"arquivo(s) restante(s).\n\nRetomar de onde parou?"):
+                resume_moves = restantes
+        self.resume_state = None
+
         # Desabilita botões para evitar cliques múltiplos
         self.start_button.config(state=tk.DISABLED)
         self.browse_button.config(state=tk.DISABLED)
+        self.undo_button.config(state=tk.DISABLED)
         self.cancel_button.config(state=tk.NORMAL)
+        self.pause_button.config(state=tk.NORMAL, text="Pausar")
+        self.cancel_token = CancelToken()
 
         # Limpa o log de atividade anterior na GUI
         self.log_text.config(state='normal')
@@ -172,27 +327,41 @@ class FileOrganizerApp:
         self.progress_label.config(text="0/0")
 
         self.logger.info("Iniciando processo de organização em segundo plano...")
-        # Cria uma nova thread para a organização para não travar a GUI
-        self.organization_thread = threading.Thread(target=self.run_organization)
+        # Cria uma nova thread para a organização para não travar a GUI.
+        # As variáveis do Tkinter são lidas aqui: a thread de trabalho não acessa a interface
+        self.organization_thread = threading.Thread(target=self.run_organization,
+                                                    args=(self.folder_path_var.get(), self.recursive_var.get(),
+                                                          self.cancel_token, resume_moves))
         self.organization_thread.start()
 
-    def run_organization(self):
-        source_folder = self.folder_path_var.get()
+    def run_organization(self, source_folder, recursive, cancel_token, resume_moves=None):
         if not source_folder:
             self.logger.error("Nenhuma pasta selecionada para organizar.")
-            messagebox.showerror("Erro", "Por favor, selecione uma pasta para organizar.")
+            self.show_message("showerror", "Erro", "Por favor, selecione uma pasta para organizar.")
             self.reset_buttons()
             return
 
+        if resume_moves:
+            self.logger.info(f"Retomando a organização de '{source_folder}': {len(resume_moves)} arquivo(s) restante(s).")
+            self.execute_plan(source_folder, resume_moves, 0, cancel_token)
+            self.reset_buttons()
+            return
+
+        from core.organizer_logic import organize_files, summarize_plan
         self.logger.info(f"Analisando arquivos na pasta: {source_folder}")
-        result_analysis = organize_files(source_folder, self.categories_config_path)
+        # Os tamanhos são registrados na varredura: o resumo por categoria e a barra por bytes os usam
+        result_analysis = organize_files(source_folder, self.categories_config_path,
+                                         recursive=recursive, scan_cache=self.scan_cache,
+                                         cancel_token=cancel_token, record_sizes=True)
 
         if result_analysis["status"] == "error":
-            messagebox.showerror("Erro de Análise", result_analysis["message"])
+            self.show_message("showerror", "Erro de Análise", result_analysis["message"])
             self.reset_buttons()
             return
-        elif result_analysis["status"] == "info": # Nenhum arquivo para organizar
-            messagebox.showinfo("Organização Concluída", result_analysis["message"])
+        elif result_analysis["status"] in ("info", "cancelled"): # Nada para organizar ou análise cancelada
+            self.show_message("showinfo",
+                              "Organização Concluída" if result_analysis["status"] == "info" else "Organização Cancelada",
+                              result_analysis["message"])
             self.reset_buttons()
             return
 
@@ -200,74 +369,202 @@ class FileOrganizerApp:
         planned_moves = result_analysis["planned_moves"]
         ignored_files = result_analysis["ignored"]
         
-        # --- Abre a janela de pré-organização ---
-        confirm_proceed = self.show_pre_organization_dialog(planned_moves, ignored_files)
+        # Totais por categoria são calculados aqui, fora da thread da interface
+        plan_summary = summarize_plan(planned_moves)
+
+        # --- Abre a janela de pré-organização (na thread principal) e aguarda a resposta ---
+        confirm_proceed = self.ask_pre_organization(planned_moves, ignored_files, plan_summary)
 
         if confirm_proceed:
             self.logger.info("Confirmação recebida. Executando movimentos...")
-            # Define o total para a barra de progresso
-            self.progress_bar['maximum'] = len(planned_moves)
+            self.execute_plan(source_folder, planned_moves, ignored_files, cancel_token)
+        else:
+            self.logger.info("Organização cancelada pelo usuário.")
+            self.show_message("showinfo", "Organização Cancelada", "A organização foi cancelada.")
+            self.save_app_settings(source_folder)
 
-            result_execution = execute_moves(planned_moves, self.update_progress_callback)
-            
+        self.reset_buttons()
+
+    def execute_plan(self, source_folder, planned_moves, ignored_files, cancel_token):
+        """Executa os movimentos (thread de trabalho) e guarda os restantes se a execução for cancelada."""
+        # A barra avança pelos bytes (em milésimos do total), não pelo número de arquivos
+        self.call_in_ui(self.progress_bar.config, maximum=1000)
+
+        from core.organizer_logic import execute_moves, JOURNAL_DIR
+        from core.journal import MoveJournal
+        with MoveJournal.create(JOURNAL_DIR, source_folder) as journal:
+            result_execution = execute_moves(planned_moves, cancel_token=cancel_token, journal=journal,
+                                             byte_progress=self.update_progress_callback)
+
+        if result_execution["status"] == "cancelled":
+            self.resume_state = (source_folder, result_execution["remaining"])
+            final_message = (
+                f"Organização Cancelada.\n\n"
+                f"Arquivos Movidos: {result_execution['moved']}\n"
+                f"Arquivos com Erro: {result_execution['errors']}\n"
+                f"Arquivos Restantes: {len(result_execution['remaining'])}\n\n"
+                f"Clique em 'Iniciar Organização' para retomar de onde parou."
+            )
+            self.show_message("showinfo", "Organização Cancelada", final_message)
+        else:
             final_message = (
                 f"Organização Concluída!\n\n"
                 f"Arquivos Movidos: {result_execution['moved']}\n"
                 f"Arquivos com Erro: {result_execution['errors']}\n"
                 f"Itens Ignorados: {ignored_files}"
             )
-            messagebox.showinfo("Organização Concluída", final_message)
-            self.logger.info(final_message)
-            self.save_app_settings(source_folder)
-        else:
-            self.logger.info("Organização cancelada pelo usuário.")
-            messagebox.showinfo("Organização Cancelada", "A organização foi cancelada.")
-            self.save_app_settings(self.folder_path_var.get())
-
+            self.show_message("showinfo", "Organização Concluída", final_message)
+        self.logger.info(final_message)
+        self.save_app_settings(source_folder)
+
+    def start_undo_thread(self):
+        """Desfaz a última organização da pasta selecionada, em segundo plano."""
+        from core.organizer_logic import JOURNAL_DIR
+        from core.journal import list_journals
+        source_folder = self.folder_path_var.get()
+        diarios = list_journals(JOURNAL_DIR, source_folder) if source_folder else []
+        if not diarios:
+            messagebox.showinfo("Desfazer", "Nenhuma organização registrada para esta pasta.")
+            return
+        if not messagebox.askyesno("Desfazer", "Devolver os arquivos da última organização desta pasta aos locais de origem?"):
+            return
+        self.start_button.config(state=tk.DISABLED)
+        self.browse_button.config(state=tk.DISABLED)
+        self.undo_button.config(state=tk.DISABLED)
+        self.resume_state = None
+        threading.Thread(target=self.run_undo, args=(diarios[0],)).start()
+
+    def run_undo(self, journal_path):
+        from core.journal import undo_journal
+        resultado = undo_journal(journal_path)
+        self.show_message("showinfo", "Desfazer Concluído",
+                          f"Arquivos Devolvidos: {resultado['restored']}\n"
+                          f"Arquivos com Erro: {resultado['errors']}\n"
+                          f"Arquivos Mantidos: {resultado['skipped']}")
         self.reset_buttons()
 
-    def update_progress_callback(self, current, total):
-        """Callback para atualizar a barra de progresso e o rótulo."""
-        self.master.after(0, self._update_progress_ui, current, total)
+    def update_progress_callback(self, progresso):
+        """Callback (progresso por bytes de execute_moves) para atualizar a barra de progresso e o rótulo."""
+        self.call_in_ui(self._update_progress_ui, progresso)
 
-    def _update_progress_ui(self, current, total):
+    def _update_progress_ui(self, progresso):
         """Função interna para atualizar a UI do progresso na thread principal."""
-        self.progress_bar['value'] = current
-        self.progress_label.config(text=f"{current}/{total}")
-
-
-    def show_pre_organization_dialog(self, planned_moves, ignored_files):
-        """Mostra uma janela com a lista de arquivos a serem organizados e pede confirmação."""
+        if progresso["bytes_total"]:
+            fracao = progresso["bytes_done"] / progresso["bytes_total"]
+        else:
+            fracao = progresso["files_done"] / max(progresso["files_total"], 1)
+        self.progress_bar['value'] = fracao * 1000
+        texto = (f"{progresso['files_done']}/{progresso['files_total']} · "
+                 f"{format_size(progresso['bytes_done'])} de {format_size(progresso['bytes_total'])}")
+        if progresso["bytes_per_second"]:
+            texto += f" · {format_size(progresso['bytes_per_second'])}/s"
+        if progresso["eta_seconds"] is not None and progresso["files_done"] < progresso["files_total"]:
+            texto += f" · ~{format_duration(progresso['eta_seconds'])} restante(s)"
+        self.progress_label.config(text=texto)
+
+
+    def call_in_ui(self, funcao, *args, **kwargs):
+        """
+        Agenda funcao(*args, **kwargs) na thread principal do Tk, sem esperar. Pode ser chamado
+        pela thread de trabalho; depois que a janela é fechada, a chamada é descartada.
+        """
+        if self.closing.is_set():
+            return
+        try:
+            self.master.after(0, lambda: funcao(*args, **kwargs))
+        except (RuntimeError, tk.TclError): # A janela foi destruída entre a verificação e o agendamento
+            pass
+
+    def wait_in_ui(self, funcao, padrao=None):
+        """
+        Chamado pela thread de trabalho: executa funcao() na thread principal do Tk (diálogos só
+        podem ser abertos nela) e bloqueia até o retorno. Se a janela for fechada antes da resposta,
+        retorna 'padrao' em vez de esperar para sempre.
+        """
+        resposta = {"valor": padrao}
+        respondido = threading.Event()
+
+        def executar():
+            try:
+                if not self.closing.is_set():
+                    resposta["valor"] = funcao()
+            finally:
+                respondido.set()
+
+        self.call_in_ui(executar)
+        while not respondido.wait(0.2):
+            if self.closing.is_set():
+                return padrao
+        return resposta["valor"]
+
+    def show_message(self, tipo, titulo, mensagem):
+        """Mostra messagebox.<tipo> a partir da thread de trabalho (veja wait_in_ui)."""
+        self.wait_in_ui(lambda: getattr(messagebox, tipo)(titulo, mensagem, parent=self.master))
+
+    def ask_pre_organization(self, planned_moves, ignored_files, plan_summary):
+        """
+        Chamado pela thread de trabalho: abre a janela de revisão na thread principal do Tk e
+        bloqueia até o usuário responder. Fechar a janela principal equivale a cancelar.
+        """
+        return self.wait_in_ui(lambda: self.show_pre_organization_dialog(planned_moves, ignored_files, plan_summary),
+                               padrao=False)
+
+    def show_pre_organization_dialog(self, planned_moves, ignored_files, plan_summary):
+        """Mostra uma janela com a lista de arquivos a serem organizados e pede confirmação. Executa na thread principal."""
+        self.dialog_result = False # Se a janela for fechada sem resposta
         dialog = tk.Toplevel(self.master)
         dialog.title("Revisar Organização")
-        dialog.geometry("600x450")
+        dialog.geometry("600x550")
         dialog.transient(self.master) # Torna a janela um popup modal
         dialog.grab_set() # Bloqueia a interação com a janela principal
 
-        tk.Label(dialog, text=f"Total de {len(planned_moves)} arquivo(s) planejado(s) para organização.").pack(pady=5)
+        tamanho_total = sum(totais["bytes"] for totais in plan_summary.values())
+        tk.Label(dialog, text=f"Total de {len(planned_moves)} arquivo(s) planejado(s) para organização "
+                              f"({format_size(tamanho_total)}).").pack(pady=5)
         tk.Label(dialog, text=f"Serão ignorados {ignored_files} item(s) (pastas/ocultos).").pack()
-        tk.Label(dialog, text="Revisar os movimentos propostos:").pack(pady=5)
 
-        # Treeview para exibir os movimentos
+        # Resumo por categoria, exibido antes da lista detalhada
+        summary_frame = tk.Frame(dialog)
+        summary_frame.pack(fill=tk.X, padx=10, pady=5)
+        summary_tree = ttk.Treeview(summary_frame, columns=("Category", "Files", "Size"), show="headings",
+                                    height=min(len(plan_summary), 6))
+        summary_tree.heading("Category", text="Pasta de Destino")
+        summary_tree.heading("Files", text="Arquivos")
+        summary_tree.heading("Size", text="Tamanho")
+        summary_tree.column("Files", width=80, anchor=tk.E)
+        summary_tree.column("Size", width=100, anchor=tk.E)
+        summary_tree.pack(fill=tk.X)
+        for categoria, totais in sorted(plan_summary.items(), key=lambda item: -item[1]["files"]):
+            summary_tree.insert("", tk.END, values=(categoria, totais["files"], format_size(totais["bytes"])))
+
+        # Filtro da lista detalhada
+        filter_frame = tk.Frame(dialog)
+        filter_frame.pack(fill=tk.X, padx=10)
+        tk.Label(filter_frame, text="Filtrar:").pack(side=tk.LEFT)
+        filter_var = tk.StringVar()
+        tk.Entry(filter_frame, textvariable=filter_var).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        filter_count_label = tk.Label(filter_frame, text=f"{len(planned_moves)} arquivo(s)")
+        filter_count_label.pack(side=tk.RIGHT)
+
+        # Lista virtualizada para exibir os movimentos
         tree_frame = tk.Frame(dialog)
         tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        plan_list = VirtualPlanList(tree_frame, planned_moves)
+
+        filtro_agendado = {"id": None}
 
-        tree = ttk.Treeview(tree_frame, columns=("Original File", "Destination Folder"), show="headings")
-        tree.heading("Original File", text="Arquivo Original")
-        tree.heading("Destination Folder", text="Pasta de Destino")
-        tree.column("Original File", width=250, anchor=tk.W)
-        tree.column("Destination Folder", width=250, anchor=tk.W)
+        def aplicar_filtro():
+            filtro_agendado["id"] = None
+            quantidade = plan_list.set_filter(filter_var.get())
+            filter_count_label.config(text=f"{quantidade} arquivo(s)")
 
-        # Adiciona scrollbars
-        vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview)
-        hsb = ttk.Scrollbar(tree_frame, orient="horizontal", command=tree.xview)
-        tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
-        vsb.pack(side="right", fill="y")
-        hsb.pack(side="bottom", fill="x")
-        tree.pack(fill=tk.BOTH, expand=True)
+        def on_filter_change(*args):
+            # Aguarda uma pausa na digitação antes de filtrar listas grandes
+            if filtro_agendado["id"] is not None:
+                dialog.after_cancel(filtro_agendado["id"])
+            filtro_agendado["id"] = dialog.after(250, aplicar_filtro)
 
-        for move in planned_moves:
-            tree.insert("", tk.END, values=(move["arquivo"], move["destino_nome_curto"]))
+        filter_var.trace_add("write", on_filter_change)
 
         # Botões de Confirmação na janela de diálogo
         button_frame = tk.Frame(dialog, pady=10)
@@ -294,14 +591,38 @@ class FileOrganizerApp:
 
 
     def cancel_organization(self):
-        self.logger.warning("Solicitação de cancelamento. A organização pode levar um tempo para parar.")
-        messagebox.showinfo("Cancelamento", "O cancelamento é limitado no momento. Por favor, aguarde a conclusão da operação atual ou feche o aplicativo.")
-        self.reset_buttons()
+        """Sinaliza o cancelamento; a thread de trabalho para após o arquivo atual e reabilita os botões."""
+        if self.cancel_token is None:
+            return
+        self.logger.warning("Solicitação de cancelamento. A organização para após o arquivo atual.")
+        self.cancel_token.cancel()
+        self.cancel_button.config(state=tk.DISABLED)
+        self.pause_button.config(state=tk.DISABLED)
+
+    def toggle_pause(self):
+        """Pausa ou continua a organização em andamento (a pausa acontece entre um arquivo e outro)."""
+        if self.cancel_token is None:
+            return
+        if self.cancel_token.paused:
+            self.cancel_token.resume()
+            self.pause_button.config(text="Pausar")
+            self.logger.info("Organização retomada.")
+        else:
+            self.cancel_token.pause()
+            self.pause_button.config(text="Continuar")
+            self.logger.info("Organização pausada.")
 
     def reset_buttons(self):
+        # Pode ser chamado pela thread de trabalho: a atualização dos botões é feita na thread principal
+        self.call_in_ui(self._reset_buttons_ui)
+
+    def _reset_buttons_ui(self):
+        self.cancel_token = None
         self.start_button.config(state=tk.NORMAL if self.folder_path_var.get() and os.path.isdir(self.folder_path_var.get()) else tk.DISABLED)
         self.browse_button.config(state=tk.NORMAL)
+        self.undo_button.config(state=tk.NORMAL)
         self.cancel_button.config(state=tk.DISABLED)
+        self.pause_button.config(state=tk.DISABLED, text="Pausar")
 
 # Ponto de entrada da aplicação
 if __name__ == "__main__":
@@ -1,76 +1,201 @@
 import logging
+import logging.handlers
 import os
 import sys
+import json
+import queue
+import atexit
+from collections import deque
 from datetime import datetime
-import tkinter.scrolledtext as scrolledtext
-import tkinter as tk # Importar para usar tk.END, tk.NORMAL etc.
+# tkinter é importado apenas por TextWidgetHandler, para que a CLI não carregue Tk
+
+LOG_MAX_BYTES = 10 * 1024 * 1024 # Tamanho máximo de cada arquivo de log antes da rotação
+LOG_BACKUP_COUNT = 3 # Arquivos rotacionados mantidos por sessão
+LOG_MAX_SESSIONS = 20 # Sessões (arquivos organizer_*) mantidas na pasta logs/
+
+_listener = None # QueueListener ativo e o pid do processo que o criou
+_listener_pid = None
 
 class TextWidgetHandler(logging.Handler):
     """
     Um handler de log que envia mensagens para um widget tkinter.scrolledtext.ScrolledText.
+
+    emit() apenas enfileira a mensagem (pode ser chamado de qualquer thread). Um laço na thread
+    principal do Tk esvazia a fila em lotes a cada 'flush_interval_ms', com uma única inserção
+    e uma única rolagem por lote, em vez de um after(0, ...) por registro.
+    - Até 'max_pending' mensagens aguardam na fila; sob pressão as mais antigas são descartadas
+      e substituídas por um aviso com a quantidade omitida.
+    - O widget mantém no máximo 'max_lines' linhas (as mais antigas são removidas).
     """
-    def __init__(self, text_widget):
+    def __init__(self, text_widget, flush_interval_ms=50, max_batch=500, max_lines=5000, max_pending=10000):
+        import tkinter as tk # Importar para usar tk.END, tk.NORMAL etc.
         super().__init__()
         self.text_widget = text_widget
         self.text_widget.config(state=tk.DISABLED) # Desabilita edição direta pelo usuário
+        self.flush_interval_ms = flush_interval_ms
+        self.max_batch = max_batch
+        self.max_lines = max_lines
+        self._pending = deque(maxlen=max_pending)
+        self._dropped = 0
+        # Deve ser criado na thread principal (setup_logging é chamado pela GUI)
+        self.text_widget.after(self.flush_interval_ms, self._drain)
 
     def emit(self, record):
-        msg = self.format(record)
-        # Usamos master.after para garantir que a atualização da GUI seja thread-safe
-        # e ocorra na thread principal do Tkinter.
-        if self.text_widget.winfo_exists(): # Verifica se o widget ainda existe
-            # after(0, ...) agenda a função para ser executada na próxima iteração do mainloop
-            self.text_widget.after(0, self._update_text_widget, msg)
+        try:
+            msg = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self._pending) == self._pending.maxlen:
+            self._dropped += 1 # A deque descarta a mensagem mais antiga
+        self._pending.append(msg)
+
+    def _drain(self):
+        """Executa na thread principal: insere um lote de mensagens e se reagenda."""
+        import tkinter as tk
+        try:
+            if not self.text_widget.winfo_exists():
+                return # Widget destruído: encerra o laço
+            linhas = []
+            if self._dropped:
+                linhas.append(f"... {self._dropped} mensagem(ns) omitida(s) na interface (veja o arquivo de log) ...")
+                self._dropped = 0
+            while self._pending and len(linhas) < self.max_batch:
+                linhas.append(self._pending.popleft())
+            if linhas:
+                self._update_text_widget('\n'.join(linhas))
+            self.text_widget.after(self.flush_interval_ms, self._drain)
+        except tk.TclError:
+            pass # Widget pode ter sido destruído durante o lote
 
     def _update_text_widget(self, msg):
         """Função interna para atualizar o widget na thread principal."""
+        import tkinter as tk
         try:
             self.text_widget.config(state='normal') # Habilita para escrita
             self.text_widget.insert(tk.END, msg + '\n') # Insere a mensagem no final
+            # Mantém apenas as últimas 'max_lines' linhas (a última linha do Text é sempre vazia)
+            excesso = int(self.text_widget.index('end-1c').split('.')[0]) - 1 - self.max_lines
+            if excesso > 0:
+                self.text_widget.delete('1.0', f'{excesso + 1}.0')
             self.text_widget.see(tk.END) # Rola para o final
             self.text_widget.config(state='disabled') # Desabilita novamente
         except tk.TclError:
             # Widget pode ter sido destruído enquanto a thread de log tentava atualizar
             pass # Ignora silenciosamente
 
-def setup_logging(base_dir, gui_text_widget=None):
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que não formata o registro na thread que fez o log: a mensagem (%-style)
+    só é montada pela thread do QueueListener, pelos handlers de destino.
+    """
+    def prepare(self, record):
+        return record
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formata cada registro como uma linha JSON compacta (ts, level, msg, thread e exceção, se houver)."""
+    def format(self, record):
+        dados = {"ts": round(record.created, 3), "level": record.levelname, "msg": record.getMessage(),
+                 "thread": record.threadName}
+        if record.exc_info:
+            dados["exc"] = self.formatException(record.exc_info)
+        return json.dumps(dados, ensure_ascii=False, separators=(',', ':'))
+
+
+def _prune_old_logs(logs_dir, keep):
+    """Remove os arquivos de sessões antigas (incluindo os rotacionados), mantendo os 'keep' mais recentes."""
+    try:
+        with os.scandir(logs_dir) as iterator:
+            arquivos = [(entry.stat().st_mtime, entry.path) for entry in iterator
+                        if entry.name.startswith('organizer_') and entry.is_file()]
+    except OSError:
+        return
+    arquivos.sort(reverse=True)
+    for _, caminho in arquivos[keep:]:
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
+
+
+def stop_logging():
+    """Esvazia a fila de logs e encerra a thread do QueueListener. Registrado com atexit."""
+    global _listener, _listener_pid
+    # Em um processo filho (fork) a thread do listener herdado não existe: apenas o descarta
+    if _listener is not None and _listener_pid == os.getpid():
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+    _listener = None
+    _listener_pid = None
+
+
+atexit.register(stop_logging)
+
+
+def setup_logging(base_dir, gui_text_widget=None, console_stream=None, console_level=logging.WARNING,
+                  json_log=False):
     """
     Configura o sistema de logging do projeto.
     Os logs detalhados serão salvos em um arquivo na pasta 'logs/'.
     Apenas logs de advertência (WARNING) e erros (ERROR/CRITICAL) serão exibidos no console.
     Se um widget de texto da GUI for fornecido, ele também receberá logs.
 
+    O logger recebe apenas um QueueHandler: quem faz o log só enfileira o registro, e a
+    formatação e a escrita (arquivo, console, GUI) acontecem na thread de um QueueListener.
+    Cada arquivo é rotacionado em LOG_MAX_BYTES e apenas as LOG_MAX_SESSIONS sessões mais
+    recentes são mantidas em 'logs/'.
+
     Args:
         base_dir (str): O diretório base do script que chama (ex: src/gui_app.py)
                         Usado para derivar o caminho da pasta de logs.
         gui_text_widget (tkinter.scrolledtext.ScrolledText, optional): Widget de texto da GUI para logs.
+        console_stream (file, optional): Destino do handler de console (padrão: sys.stdout).
+                                         A CLI usa sys.stderr para manter o stdout livre para o JSON.
+        console_level (int, optional): Nível mínimo do handler de console (padrão: WARNING).
+        json_log (bool, optional): Também grava um log estruturado (JSON lines) da execução.
     """
+    global _listener, _listener_pid
     logger = logging.getLogger('files_organizer_py') # Dê um nome específico ao seu logger
     logger.setLevel(logging.INFO) # O logger principal deve processar todos os níveis a partir de INFO
 
     # Limpa handlers existentes para evitar duplicação em múltiplas chamadas (importante para testes ou reconfigurações)
     if (logger.hasHandlers()):
         logger.handlers.clear()
+    stop_logging()
 
     # Formatter para ambos os handlers
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    handlers = []
 
     # Handler para arquivo (grava TUDO a partir de INFO)
     # A pasta de logs será relativa ao BASE_DIR do gui_app.py
     logs_dir = os.path.join(base_dir, '..', 'logs')
     os.makedirs(logs_dir, exist_ok=True) # Garante que a pasta de logs exista
-    log_filename = datetime.now().strftime("organizer_%Y%m%d_%H%M%S.log")
-    log_filepath = os.path.join(logs_dir, log_filename)
-    file_handler = logging.FileHandler(log_filepath, encoding='utf-8')
+    _prune_old_logs(logs_dir, LOG_MAX_SESSIONS - 1)
+    # O pid evita que processos paralelos (CLI --jobs) escrevam e rotacionem o mesmo arquivo
+    log_basename = datetime.now().strftime("organizer_%Y%m%d_%H%M%S") + f"_{os.getpid()}"
+    file_handler = logging.handlers.RotatingFileHandler(os.path.join(logs_dir, log_basename + '.log'),
+                                                        maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                                                        encoding='utf-8')
     file_handler.setLevel(logging.INFO) # Nível INFO para o arquivo (tudo detalhado)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    handlers.append(file_handler)
+
+    if json_log:
+        json_handler = logging.handlers.RotatingFileHandler(os.path.join(logs_dir, log_basename + '.jsonl'),
+                                                            maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                                                            encoding='utf-8')
+        json_handler.setLevel(logging.INFO)
+        json_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(json_handler)
 
     # Handler para console (grava apenas WARNING, ERROR, CRITICAL)
-    console_handler = logging.StreamHandler(sys.stdout) # sys.stdout para garantir que vá para a saída padrão
-    console_handler.setLevel(logging.WARNING) # Nível WARNING para o console (apenas avisos e erros)
+    console_handler = logging.StreamHandler(console_stream or sys.stdout) # sys.stdout para garantir que vá para a saída padrão
+    console_handler.setLevel(console_level) # Nível WARNING para o console (apenas avisos e erros)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
 
     # Handler para o widget de texto da GUI (se fornecido)
     gui_handler_instance = None # Para retornar a instância
@@ -78,6 +203,13 @@ def setup_logging(base_dir, gui_text_widget=None):
         gui_handler_instance = TextWidgetHandler(gui_text_widget)
         gui_handler_instance.setLevel(logging.INFO) # Nível inicial da GUI: INFO (detalhado)
         gui_handler_instance.setFormatter(formatter)
-        logger.addHandler(gui_handler_instance)
-    
-    return logger, gui_handler_instance
\ No newline at end of file
+        handlers.append(gui_handler_instance)
+
+    # respect_handler_level: cada destino continua filtrando pelo próprio nível (a GUI o altera em tempo de execução)
+    fila = queue.SimpleQueue()
+    logger.addHandler(_DeferredQueueHandler(fila))
+    _listener = logging.handlers.QueueListener(fila, *handlers, respect_handler_level=True)
+    _listener_pid = os.getpid()
+    _listener.start()
+
+    return logger, gui_handler_instance
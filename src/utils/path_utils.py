@@ -23,8 +23,7 @@ def get_resource_path(relative_path):
     else:
         # Se estiver executando como script Python normal (ex: 'python src/gui_app.py')
         # A pasta base é a raiz do projeto 'files-organizer-py/'
-        # __file__ está em src/gui_app.py
-        # os.path.dirname(__file__) -> src/
-        # os.path.abspath(...) -> C:/caminho/para/projeto/src/
-        # os.path.join(..., '..') -> C:/caminho/para/projeto/
-        return os.path.join(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')), relative_path)
\ No newline at end of file
+        # __file__ está em src/utils/path_utils.py
+        # os.path.dirname(__file__) -> src/utils/
+        # os.path.join(..., '..', '..') -> C:/caminho/para/projeto/
+        return os.path.join(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')), relative_path)
\ No newline at end of file
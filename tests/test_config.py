@@ -0,0 +1,56 @@
+# tests/test_config.py
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.config import ConfigManager, ConfigError  # noqa: E402
+
+
+class ConfigManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp()
+        self.categorias = os.path.join(self.pasta, "categories.json")
+        self.exclusoes = os.path.join(self.pasta, "exclude_list.json")
+        self.regras = os.path.join(self.pasta, "rules.json")
+        self._grava(self.categorias, {"Documentos": [".pdf"]})
+        self.manager = ConfigManager(self.categorias, self.exclusoes, self.regras)
+
+    def tearDown(self):
+        shutil.rmtree(self.pasta)
+
+    def _grava(self, caminho, dados):
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(dados, f)
+
+    def test_regra_com_flag_inicial(self):
+        self._grava(self.regras, {"rules": [{"regex": "(?i)^nf", "destination": "Notas"}]})
+        self.assertEqual(self.manager.get().classifier.classify("NF-1.pdf"), "Notas")
+
+    def test_regex_invalida_gera_config_error(self):
+        self._grava(self.regras, {"rules": [{"regex": "(x", "destination": "X"}]})
+        with self.assertRaises(ConfigError) as contexto:
+            self.manager.get()
+        self.assertEqual(contexto.exception.path, self.regras)
+
+    def test_chave_desconhecida_nas_exclusoes(self):
+        self._grava(self.exclusoes, {"exclude_file": ["Thumbs.db"]})
+        with self.assertRaises(ConfigError) as contexto:
+            self.manager.get()
+        self.assertEqual(contexto.exception.field, '"exclude_file"')
+
+    def test_valor_de_tipo_inesperado_gera_config_error(self):
+        for regra in ({"glob": 5, "destination": "X"}, {"extensions": [1], "destination": "X"},
+                      {"older_than_days": "x", "destination": "X"}):
+            self._grava(self.regras, {"rules": [regra]})
+            with self.subTest(regra=regra), self.assertRaises(ConfigError):
+                self.manager.get()
+
+
+if __name__ == "__main__":
+    unittest.main()
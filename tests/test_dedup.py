@@ -0,0 +1,57 @@
+# tests/test_dedup.py
+
+import os
+import sys
+import shutil
+import logging
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.organizer_logic import organize_files, execute_moves, CATEGORIES_CONFIG_PATH  # noqa: E402
+from core.journal import MoveJournal, undo_journal  # noqa: E402
+from core.dedup import DEDUP_HARDLINK, link_duplicates  # noqa: E402
+
+
+class LinkDuplicatesTest(unittest.TestCase):
+    def setUp(self):
+        logging.getLogger('files_organizer_py').disabled = True
+        self.pasta = tempfile.mkdtemp()
+        self.diarios = tempfile.mkdtemp()
+        for nome in ("a.pdf", "b.pdf"):
+            with open(os.path.join(self.pasta, nome), 'wb') as f:
+                f.write(b"x" * 4096)
+
+    def tearDown(self):
+        logging.getLogger('files_organizer_py').disabled = False
+        shutil.rmtree(self.pasta)
+        shutil.rmtree(self.diarios)
+
+    def _planeja(self):
+        analise = organize_files(self.pasta, CATEGORIES_CONFIG_PATH, dedup=DEDUP_HARDLINK)
+        self.assertEqual(analise["status"], "planned")
+        return analise["planned_moves"]
+
+    def test_undo_devolve_copias_independentes(self):
+        with MoveJournal.create(self.diarios, self.pasta) as journal:
+            execucao = execute_moves(self._planeja(), journal=journal)
+        self.assertEqual(execucao["moved"], 2)
+        undo_journal(journal.path)
+        for nome in ("a.pdf", "b.pdf"):
+            caminho = os.path.join(self.pasta, nome)
+            self.assertEqual(os.stat(caminho).st_nlink, 1)
+            with open(caminho, 'rb') as f:
+                self.assertEqual(f.read(), b"x" * 4096)
+
+    def test_arquivo_alterado_depois_do_hash_nao_vira_link(self):
+        plano = self._planeja()
+        indice, _ = plano.hardlinks()[0]
+        with open(plano.source_path(indice), 'ab') as f:
+            f.write(b"alterado")
+        link_duplicates(plano)
+        self.assertEqual(os.stat(plano.source_path(indice)).st_nlink, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+# tests/test_execute.py
+
+import os
+import sys
+import shutil
+import logging
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.organizer_logic import execute_moves  # noqa: E402
+from core.cancellation import CancelToken  # noqa: E402
+from core.metrics import MetricsHook  # noqa: E402
+from core.plan import Plan  # noqa: E402
+
+
+class ExecucaoTest(unittest.TestCase):
+    def setUp(self):
+        logging.getLogger('files_organizer_py').disabled = True
+        self.pasta = tempfile.mkdtemp()
+        self.destino = os.path.join(self.pasta, "Documentos")
+
+    def tearDown(self):
+        logging.getLogger('files_organizer_py').disabled = False
+        shutil.rmtree(self.pasta)
+
+    def _plano(self, quantidade, destinos=1):
+        # Com mais de um destino, os movimentos se dividem entre as pastas Documentos, Documentos_1...
+        plano = Plan()
+        for i in range(quantidade):
+            origem = os.path.join(self.pasta, f"arquivo_{i:03d}.txt")
+            with open(origem, 'w') as f:
+                f.write(str(i))
+            categoria = "Documentos" if i % destinos == 0 else f"Documentos_{i % destinos}"
+            plano.add(origem, os.path.join(self.pasta, categoria), categoria)
+        return plano
+
+
+class GanchoDeMetricasTest(ExecucaoTest):
+    def test_falha_do_gancho_nao_desfaz_o_movimento(self):
+        class GanchoComFalha(MetricsHook):
+            def record_move(self, categoria, origem, tamanho, segundos):
+                raise RuntimeError("falha no gancho")
+
+        resultado = execute_moves(self._plano(1), metrics=GanchoComFalha())
+        self.assertEqual((resultado["moved"], resultado["errors"]), (1, 0))
+        self.assertTrue(os.path.exists(os.path.join(self.destino, "arquivo_000.txt")))
+
+
+class DestinoForaDaPastaTest(ExecucaoTest):
+    def test_destino_com_ponto_ponto_nao_e_movido(self):
+        origem = os.path.join(self.pasta, "a.txt")
+        with open(origem, 'w') as f:
+            f.write("a")
+        plano = Plan()
+        plano.add(origem, os.path.join(self.pasta, "..", "Fora"), os.path.join("..", "Fora"))
+        resultado = execute_moves(plano)
+        self.assertEqual((resultado["moved"], resultado["errors"]), (0, 1))
+        self.assertTrue(os.path.exists(origem))
+        self.assertFalse(os.path.exists(os.path.join(self.pasta, "..", "Fora")))
+
+
+class CancelamentoTest(ExecucaoTest):
+    """Cancelar no meio do plano deixa os arquivos restantes intactos, e o plano restante conclui a execução."""
+    TOTAL = 24
+
+    def _cancela_depois_de(self, token, quantidade):
+        def progresso(atual, total):
+            if atual == quantidade:
+                token.cancel()
+        return progresso
+
+    def _assert_restantes_intactos(self, restante):
+        for movimento in restante:
+            self.assertTrue(os.path.exists(movimento.origem))
+            self.assertFalse(os.path.exists(os.path.join(movimento.destino_pasta, movimento.arquivo)))
+
+    def _assert_todos_movidos(self, plano):
+        for movimento in plano:
+            self.assertFalse(os.path.exists(movimento.origem))
+            with open(os.path.join(movimento.destino_pasta, movimento.arquivo)) as f:
+                self.assertEqual(f.read(), str(int(movimento.arquivo[8:11])))
+
+    def test_cancela_e_retoma_em_serie(self):
+        plano = self._plano(self.TOTAL, destinos=3)
+        token = CancelToken()
+        resultado = execute_moves(plano, progress_callback=self._cancela_depois_de(token, 5), cancel_token=token)
+        self.assertEqual(resultado["status"], "cancelled")
+        self.assertEqual((resultado["moved"], len(resultado["remaining"])), (5, self.TOTAL - 5))
+        self.assertEqual([movimento.arquivo for movimento in resultado["remaining"]],
+                         [f"arquivo_{i:03d}.txt" for i in range(5, self.TOTAL)])
+        self._assert_restantes_intactos(resultado["remaining"])
+
+        retomada = execute_moves(resultado["remaining"], cancel_token=CancelToken())
+        self.assertEqual((retomada["status"], retomada["moved"], retomada["errors"]), ("done", self.TOTAL - 5, 0))
+        self.assertEqual(len(retomada["remaining"]), 0)
+        self._assert_todos_movidos(plano)
+
+    def test_cancela_e_retoma_com_threads(self):
+        plano = self._plano(self.TOTAL, destinos=4)
+        token = CancelToken()
+        resultado = execute_moves(plano, progress_callback=self._cancela_depois_de(token, 6), max_workers=4,
+                                  cancel_token=token)
+        self.assertEqual(resultado["status"], "cancelled")
+        # Cada thread termina o arquivo em andamento: pelo menos 6 movidos, e nenhum perdido
+        self.assertGreaterEqual(resultado["moved"], 6)
+        self.assertLess(resultado["moved"], self.TOTAL)
+        self.assertEqual(resultado["moved"] + len(resultado["remaining"]), self.TOTAL)
+        self.assertEqual(len(list(resultado["completed"])), resultado["moved"])
+        self._assert_restantes_intactos(resultado["remaining"])
+
+        retomada = execute_moves(resultado["remaining"], max_workers=4, cancel_token=CancelToken())
+        self.assertEqual((retomada["status"], retomada["errors"]), ("done", 0))
+        self.assertEqual(resultado["moved"] + retomada["moved"], self.TOTAL)
+        self._assert_todos_movidos(plano)
+
+    def _pausa_e_continua(self, max_workers):
+        plano = self._plano(self.TOTAL, destinos=4)
+        token = CancelToken()
+        token.pause()
+        self.addCleanup(token.cancel) # Não deixa a thread parada se uma verificação falhar
+        resultados = []
+        thread = threading.Thread(target=lambda: resultados.append(
+            execute_moves(plano, max_workers=max_workers, cancel_token=token)), daemon=True)
+        thread.start()
+        thread.join(0.2)
+        self.assertTrue(thread.is_alive()) # Parada no primeiro checkpoint
+        self._assert_restantes_intactos(plano)
+        token.resume()
+        thread.join(10)
+        self.assertEqual((resultados[0]["status"], resultados[0]["moved"]), ("done", self.TOTAL))
+        self._assert_todos_movidos(plano)
+
+    def test_pausa_e_continua_em_serie(self):
+        self._pausa_e_continua(None)
+
+    def test_pausa_e_continua_com_threads(self):
+        self._pausa_e_continua(4)
+
+    def test_cancelar_durante_a_pausa(self):
+        plano = self._plano(self.TOTAL)
+        token = CancelToken()
+        token.pause()
+        resultados = []
+        thread = threading.Thread(target=lambda: resultados.append(execute_moves(plano, cancel_token=token)),
+                                  daemon=True)
+        thread.start()
+        token.cancel()
+        thread.join(10)
+        self.assertEqual((resultados[0]["status"], resultados[0]["moved"]), ("cancelled", 0))
+        self.assertEqual(len(resultados[0]["remaining"]), self.TOTAL)
+        self._assert_restantes_intactos(plano)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,207 @@
+# tests/test_journal.py
+
+import os
+import sys
+import shutil
+import logging
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.journal import (MoveJournal, list_journals, peek_journal, read_journal, recover_interrupted,  # noqa: E402
+                          undo_journal, EVENTO_CONCLUIDO, EVENTO_ERRO, EVENTO_DESFEITO)
+from core.mover import FileMover  # noqa: E402
+from core.organizer_logic import execute_moves  # noqa: E402
+from core.plan import Plan  # noqa: E402
+
+
+class LeituraDoDiarioTest(unittest.TestCase):
+    """peek_journal lê só o início e o fim e precisa concordar com read_journal."""
+
+    def setUp(self):
+        logging.getLogger('files_organizer_py').disabled = True
+        self.diarios = tempfile.mkdtemp()
+
+    def tearDown(self):
+        logging.getLogger('files_organizer_py').disabled = False
+        shutil.rmtree(self.diarios)
+
+    def _diario(self, movimentos, fechar=True):
+        journal = MoveJournal.create(self.diarios, "/pasta/origem")
+        for i in range(movimentos):
+            journal.record_move(f"/pasta/origem/arquivo_{i}.txt", f"/pasta/origem/Documentos/arquivo_{i}.txt")
+        if fechar:
+            journal.close()
+        else:
+            journal.flush()
+            os.close(journal._fd)
+        return journal.path
+
+    def test_diario_concluido(self):
+        caminho = self._diario(500)
+        self.assertEqual(peek_journal(caminho), {"folder": "/pasta/origem", "pid": os.getpid(), "ended": True})
+        self.assertTrue(read_journal(caminho)["ended"])
+
+    def test_diario_sem_registro_de_fim(self):
+        caminho = self._diario(500, fechar=False)
+        self.assertFalse(peek_journal(caminho)["ended"])
+
+    def test_ultima_linha_incompleta(self):
+        caminho = self._diario(3)
+        with open(caminho, 'ab') as f:
+            f.write(b'{"event":"end","t')
+        self.assertFalse(peek_journal(caminho)["ended"])
+
+    def test_lista_por_pasta(self):
+        caminho = self._diario(1)
+        self.assertEqual(list_journals(self.diarios, "/pasta/origem"), [caminho])
+        self.assertEqual(list_journals(self.diarios, "/outra"), [])
+
+
+class DiarioComArquivosTest(unittest.TestCase):
+    """Base: uma pasta com arquivos de origem e uma pasta de diários."""
+
+    def setUp(self):
+        logging.getLogger('files_organizer_py').disabled = True
+        self.pasta = tempfile.mkdtemp()
+        self.diarios = tempfile.mkdtemp()
+        self.destino = os.path.join(self.pasta, "Documentos")
+
+    def tearDown(self):
+        logging.getLogger('files_organizer_py').disabled = False
+        shutil.rmtree(self.pasta)
+        shutil.rmtree(self.diarios)
+
+    def _origem(self, nome):
+        return os.path.join(self.pasta, nome)
+
+    def _cria(self, caminho, conteudo):
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        with open(caminho, 'w') as f:
+            f.write(conteudo)
+
+    def _conteudo(self, caminho):
+        with open(caminho) as f:
+            return f.read()
+
+    def _organiza(self, nomes, **kwargs):
+        plano = Plan()
+        for nome in nomes:
+            self._cria(self._origem(nome), nome)
+            plano.add(self._origem(nome), self.destino, "Documentos")
+        with MoveJournal.create(self.diarios, self.pasta) as journal:
+            resultado = execute_moves(plano, journal=journal, **kwargs)
+        return journal.path, resultado
+
+    def _assert_restaurados(self, nomes):
+        for nome in nomes:
+            self.assertEqual(self._conteudo(self._origem(nome)), nome)
+            self.assertFalse(os.path.exists(os.path.join(self.destino, nome)))
+
+
+class RecuperacaoTest(DiarioComArquivosTest):
+    """Uma execução interrompida (diário sem registro de fim) é concluída ou revertida pelo estado do disco."""
+
+    def _diario_interrompido(self):
+        # a.txt: movido e registrado; b.txt: renomeado sem o resultado no diário;
+        # c.txt: só a reserva vazia foi criada no destino
+        journal = MoveJournal.create(self.diarios, self.pasta)
+        journal.record_mkdir(self.destino)
+        for nome in ("a.txt", "b.txt", "c.txt"):
+            self._cria(self._origem(nome), nome)
+        os.makedirs(self.destino)
+        ids = {nome: journal.record_move(self._origem(nome), os.path.join(self.destino, nome))
+               for nome in ("a.txt", "b.txt", "c.txt")}
+        for nome in ("a.txt", "b.txt"):
+            os.replace(self._origem(nome), os.path.join(self.destino, nome))
+        journal.record_outcome(ids["a.txt"], EVENTO_CONCLUIDO)
+        open(os.path.join(self.destino, "c.txt"), 'w').close()
+        # Interrompido: o descritor é fechado sem o registro de fim
+        journal.flush()
+        os.close(journal._fd)
+        return journal.path, ids
+
+    def test_recupera_e_desfaz(self):
+        caminho, ids = self._diario_interrompido()
+        with mock.patch("core.journal._process_alive", return_value=False):
+            self.assertEqual(recover_interrupted(self.diarios), [caminho])
+        estado = read_journal(caminho)
+        self.assertTrue(estado["ended"])
+        self.assertEqual({nome: estado["moves"][id_movimento]["status"] for nome, id_movimento in ids.items()},
+                         {"a.txt": EVENTO_CONCLUIDO, "b.txt": EVENTO_CONCLUIDO, "c.txt": EVENTO_ERRO})
+        self.assertEqual(self._conteudo(self._origem("c.txt")), "c.txt")
+        self.assertFalse(os.path.exists(os.path.join(self.destino, "c.txt")))
+        # Uma segunda inicialização não recupera de novo
+        self.assertEqual(recover_interrupted(self.diarios), [])
+
+        resultado = undo_journal(caminho)
+        self.assertEqual((resultado["restored"], resultado["errors"], resultado["skipped"]), (2, 0, 0))
+        self._assert_restaurados(["a.txt", "b.txt", "c.txt"])
+        self.assertFalse(os.path.exists(self.destino))
+
+    def test_undo_resolve_movimentos_pendentes(self):
+        caminho, _ = self._diario_interrompido()
+        with mock.patch("core.journal._process_alive", return_value=False):
+            resultado = undo_journal(caminho)
+        self.assertEqual(resultado["restored"], 2)
+        self._assert_restaurados(["a.txt", "b.txt", "c.txt"])
+
+    def test_execucao_em_andamento_nao_e_recuperada(self):
+        caminho, _ = self._diario_interrompido()
+        self.assertEqual(recover_interrupted(self.diarios), []) # O pid do diário é o deste processo
+        self.assertEqual(undo_journal(caminho)["status"], "error")
+        self.assertFalse(peek_journal(caminho)["ended"])
+
+
+class DesfazerTest(DiarioComArquivosTest):
+    NOMES = ["a.txt", "b.txt", "c.txt"]
+
+    def test_desfaz_copias_entre_dispositivos(self):
+        # Cada pasta parece estar em um dispositivo diferente: a execução e o undo copiam
+        with mock.patch.object(FileMover, "_device_of", lambda self, pasta: pasta):
+            caminho, resultado = self._organiza(self.NOMES)
+            self.assertEqual(resultado["moved"], 3)
+            desfeito = undo_journal(caminho, max_workers=2)
+        self.assertEqual(desfeito["restored"], 3)
+        self._assert_restaurados(self.NOMES)
+        estado = read_journal(caminho)
+        self.assertEqual({movimento["status"] for movimento in estado["moves"].values()}, {EVENTO_DESFEITO})
+
+    def test_undo_repetido_nao_duplica(self):
+        caminho, _ = self._organiza(self.NOMES)
+        self.assertEqual(undo_journal(caminho)["restored"], 3)
+        self.assertEqual(undo_journal(caminho)["restored"], 0)
+        self._assert_restaurados(self.NOMES)
+
+    def test_origem_ocupada_mantem_o_destino(self):
+        caminho, _ = self._organiza(self.NOMES)
+        self._cria(self._origem("a.txt"), "novo")
+        resultado = undo_journal(caminho)
+        self.assertEqual((resultado["restored"], resultado["skipped"]), (2, 1))
+        self.assertEqual(self._conteudo(self._origem("a.txt")), "novo")
+        self.assertEqual(self._conteudo(os.path.join(self.destino, "a.txt")), "a.txt")
+
+    def test_destino_removido_e_ignorado(self):
+        caminho, _ = self._organiza(self.NOMES)
+        os.remove(os.path.join(self.destino, "b.txt"))
+        resultado = undo_journal(caminho)
+        self.assertEqual((resultado["restored"], resultado["skipped"]), (2, 1))
+
+    def test_falha_ao_devolver(self):
+        caminho, _ = self._organiza(self.NOMES)
+        with mock.patch.object(FileMover, "move", side_effect=OSError(13, "Permission denied")):
+            resultado = undo_journal(caminho)
+        self.assertEqual((resultado["restored"], resultado["errors"]), (0, 3))
+        for nome in self.NOMES:
+            # A reserva da origem é removida e o arquivo continua no destino
+            self.assertFalse(os.path.exists(self._origem(nome)))
+            self.assertEqual(self._conteudo(os.path.join(self.destino, nome)), nome)
+        # Depois da falha, o undo pode ser repetido
+        self.assertEqual(undo_journal(caminho)["restored"], 3)
+        self._assert_restaurados(self.NOMES)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+# tests/test_mover.py
+
+import os
+import sys
+import shutil
+import logging
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.mover import FileMover  # noqa: E402
+from core.journal import MoveJournal, read_journal, EVENTO_CONCLUIDO, EVENTO_ERRO  # noqa: E402
+from core.organizer_logic import execute_moves, _record_outcome  # noqa: E402
+from core.plan import Plan  # noqa: E402
+
+
+class CopiaEntreDispositivosTest(unittest.TestCase):
+    """O diário só registra uma cópia entre dispositivos depois do fsync do lote."""
+
+    def setUp(self):
+        logging.getLogger('files_organizer_py').disabled = True
+        self.pasta = tempfile.mkdtemp()
+        self.origem = os.path.join(self.pasta, "a.txt")
+        self.destino = os.path.join(self.pasta, "destino.txt")
+        with open(self.origem, 'wb') as f:
+            f.write(b"conteudo")
+        open(self.destino, 'wb').close() # Reserva, como a do NameAllocator
+        self.mover = FileMover()
+        # Força o caminho de cópia: cada pasta parece estar em um dispositivo diferente
+        self.mover._device_of = lambda pasta, contador=iter(range(1000)): next(contador)
+        # Sem fsync automático do diário: o fsync simulado com falha vale só para as cópias
+        self.journal = MoveJournal(os.path.join(self.pasta, "journal.jsonl"), flush_every=10**6, flush_seconds=3600)
+        self.id_movimento = self.journal.record_move(self.origem, self.destino)
+
+    def tearDown(self):
+        logging.getLogger('files_organizer_py').disabled = False
+        self.journal.close()
+        shutil.rmtree(self.pasta)
+
+    def _status(self):
+        return read_journal(self.journal.path)["moves"][self.id_movimento]["status"]
+
+    def _move(self):
+        self.mover.move(self.origem, self.destino, lambda sucesso: _record_outcome(self.journal, self.id_movimento,
+                                                                                   sucesso))
+
+    def test_concluido_so_depois_do_flush(self):
+        self._move()
+        self.assertEqual(self._status(), "pending")
+        self.mover.flush()
+        self.assertEqual(self._status(), EVENTO_CONCLUIDO)
+        self.assertFalse(os.path.exists(self.origem))
+
+    def test_falha_no_fsync_registra_erro(self):
+        self._move()
+        with mock.patch("core.mover.os.fsync", side_effect=OSError(5, "Input/output error")):
+            self.mover.flush()
+        self.assertEqual(self._status(), EVENTO_ERRO)
+        self.assertTrue(os.path.exists(self.origem))
+        self.assertFalse(os.path.exists(self.destino))
+
+    def test_falha_do_diario_depois_do_flush_mantem_o_destino(self):
+        self._move()
+        with mock.patch.object(self.journal, "record_outcome", side_effect=OSError(28, "No space left on device")):
+            self.mover.flush()
+        self.assertFalse(os.path.exists(self.origem))
+        with open(self.destino, 'rb') as f:
+            self.assertEqual(f.read(), b"conteudo")
+
+
+class FalhaDoDiarioTest(unittest.TestCase):
+    """Uma falha ao registrar o resultado no diário não pode apagar um arquivo já movido."""
+
+    def setUp(self):
+        logging.getLogger('files_organizer_py').disabled = True
+        self.pasta = tempfile.mkdtemp()
+
+    def tearDown(self):
+        logging.getLogger('files_organizer_py').disabled = False
+        shutil.rmtree(self.pasta)
+
+    def test_renomeacao_com_diario_sem_espaco(self):
+        origem = os.path.join(self.pasta, "a.txt")
+        with open(origem, 'w') as f:
+            f.write("a")
+        plano = Plan()
+        plano.add(origem, os.path.join(self.pasta, "Documentos"), "Documentos")
+        journal = MoveJournal(os.path.join(self.pasta, "journal.jsonl"))
+        try:
+            with mock.patch.object(journal, "record_outcome", side_effect=OSError(28, "No space left on device")):
+                resultado = execute_moves(plano, journal=journal)
+        finally:
+            journal.close()
+        self.assertEqual(resultado["moved"], 1)
+        self.assertTrue(os.path.exists(os.path.join(self.pasta, "Documentos", "a.txt")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+# tests/test_name_allocator.py
+
+import os
+import sys
+import shutil
+import logging
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.name_allocator import NameAllocator  # noqa: E402
+
+
+class NameAllocatorTest(unittest.TestCase):
+    def setUp(self):
+        logging.getLogger('files_organizer_py').disabled = True
+        self.pasta = tempfile.mkdtemp()
+
+    def tearDown(self):
+        logging.getLogger('files_organizer_py').disabled = False
+        shutil.rmtree(self.pasta)
+
+    def _cria(self, nome, conteudo=b""):
+        with open(os.path.join(self.pasta, nome), 'wb') as f:
+            f.write(conteudo)
+
+    def test_nome_livre_e_reservado_no_disco(self):
+        allocator = NameAllocator(self.pasta)
+        self.assertEqual(allocator.reserve("foto.jpg"), "foto.jpg")
+        self.assertEqual(os.path.getsize(os.path.join(self.pasta, "foto.jpg")), 0)
+
+    def test_cria_a_pasta_de_destino(self):
+        destino = os.path.join(self.pasta, "Imagens", "2024")
+        self.assertEqual(NameAllocator(destino).reserve("foto.jpg"), "foto.jpg")
+        self.assertTrue(os.path.isfile(os.path.join(destino, "foto.jpg")))
+
+    def test_colisoes_recebem_sufixo(self):
+        self._cria("foto.jpg")
+        self._cria("foto (1).jpg")
+        allocator = NameAllocator(self.pasta)
+        self.assertEqual([allocator.reserve("foto.jpg") for _ in range(3)],
+                         ["foto (2).jpg", "foto (3).jpg", "foto (4).jpg"])
+        self.assertEqual(allocator.reserve("sem_extensao"), "sem_extensao")
+        self.assertEqual(allocator.reserve("sem_extensao"), "sem_extensao (1)")
+
+    def test_nome_criado_por_outro_processo_nao_e_sobrescrito(self):
+        allocator = NameAllocator(self.pasta)
+        allocator.allocate("outro.txt") # Tira o snapshot da pasta ainda vazia
+        self._cria("foto.jpg", b"de outro processo") # Criado depois do snapshot
+        self.assertEqual(allocator.reserve("foto.jpg"), "foto (1).jpg")
+        with open(os.path.join(self.pasta, "foto.jpg"), 'rb') as f:
+            self.assertEqual(f.read(), b"de outro processo")
+
+    def test_release_devolve_o_nome(self):
+        allocator = NameAllocator(self.pasta)
+        nome = allocator.allocate("foto.jpg")
+        allocator.release(nome)
+        self.assertEqual(allocator.allocate("foto.jpg"), "foto.jpg")
+
+    def test_release_antes_do_snapshot(self):
+        allocator = NameAllocator(self.pasta)
+        allocator.release("foto.jpg") # Não faz nada: a pasta ainda não foi listada
+        self.assertEqual(allocator.allocate("foto.jpg"), "foto.jpg")
+
+
+if __name__ == "__main__":
+    unittest.main()
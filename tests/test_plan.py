@@ -0,0 +1,43 @@
+# tests/test_plan.py
+
+import os
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.plan import Plan  # noqa: E402
+
+
+class PlanoCongeladoTest(unittest.TestCase):
+    """Depois de freeze(), ler nomes de um plano em disco não altera o buffer nem o mmap."""
+
+    def setUp(self):
+        self.plano = Plan(spill_bytes=0)
+        for i in range(2000):
+            self.plano.add(f"/origem/arquivo_{i:05d}_ção.txt", "/origem/Documentos", "Documentos")
+        self.addCleanup(self.plano.close)
+
+    def test_leitura_nao_reabre_o_mapa(self):
+        self.assertTrue(self.plano.spilled)
+        self.plano.freeze()
+        mapa = self.plano._nomes._mapa
+        self.assertEqual(self.plano.name(1999), "arquivo_01999_ção.txt")
+        self.assertIs(self.plano._nomes._mapa, mapa)
+        self.assertFalse(self.plano._nomes._dados)
+
+    def test_leitura_concorrente(self):
+        self.plano.freeze()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            nomes = list(executor.map(self.plano.name, range(len(self.plano))))
+        self.assertEqual(nomes, [f"arquivo_{i:05d}_ção.txt" for i in range(2000)])
+
+    def test_acrescimo_depois_de_congelar(self):
+        self.plano.freeze()
+        self.plano.add("/origem/novo.txt", "/origem/Documentos", "Documentos")
+        self.assertEqual(self.plano.name(len(self.plano) - 1), "novo.txt")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# tests/test_rules.py
+"""
+Testes do core.rules. Uso: python -m unittest discover -s tests (ou python -m pytest tests).
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.rules import RuleClassifier  # noqa: E402
+
+CATEGORIAS = {"Documentos": [".pdf", ".txt"], "Imagens": [".jpg"]}
+
+
+class RegexComFlagInicialTest(unittest.TestCase):
+    """Uma regex com flag global no início ('(?i)...') não pode ser unida às outras em um só padrão."""
+
+    def test_flag_inicial_sozinha(self):
+        classifier = RuleClassifier(CATEGORIAS, [{"regex": "(?i)^nf", "destination": "Notas"}])
+        self.assertEqual(classifier.classify("NF-123.pdf"), "Notas")
+        self.assertEqual(classifier.classify("nf.txt"), "Notas")
+        self.assertEqual(classifier.classify("relatorio.pdf"), "Documentos")
+
+    def test_flag_inicial_com_glob_na_mesma_regra(self):
+        classifier = RuleClassifier(CATEGORIAS, [{"glob": "*.tmp", "regex": "(?i)rascunho", "destination": "Lixo"}])
+        self.assertEqual(classifier.classify("a.TMP"), "Lixo")
+        self.assertEqual(classifier.classify("RASCUNHO.txt"), "Lixo")
+        self.assertEqual(classifier.classify("foto.jpg"), "Imagens")
+
+    def test_flag_inicial_com_outras_regras(self):
+        classifier = RuleClassifier(CATEGORIAS, [{"glob": "scan_*", "destination": "Scans"},
+                                                 {"regex": "(?i)^nf", "destination": "Notas"}])
+        self.assertEqual(classifier.classify("scan_01.jpg"), "Scans")
+        self.assertEqual(classifier.classify("Nf-9.pdf"), "Notas")
+
+    def test_regex_invalida_gera_value_error(self):
+        with self.assertRaises(ValueError):
+            RuleClassifier(CATEGORIAS, [{"regex": "(", "destination": "X"}])
+
+
+class DestinoDaRegraTest(unittest.TestCase):
+    """O destino de uma regra, depois de formatado, precisa continuar dentro da pasta organizada."""
+
+    def _regra(self, destino):
+        return RuleClassifier(CATEGORIAS, [{"glob": "*.pdf", "destination": destino}])
+
+    def test_marcadores_invalidos_geram_value_error(self):
+        for destino in ("{mtime.foo}", "{category.upper}", "{category[0]}", "{mtime.__class__}", "{outro}",
+                        "{}", "{mtime:{category}}"):
+            with self.subTest(destino=destino), self.assertRaises(ValueError):
+                self._regra(destino)
+
+    def test_destino_formatado_fora_da_pasta(self):
+        for destino in ("{mtime:..}", "Antigos/{mtime:..}", "../Fora", "{mtime:%Y/../..}"):
+            with self.subTest(destino=destino), self.assertRaises(ValueError):
+                self._regra(destino)
+
+    def test_marcadores_validos(self):
+        st = os.stat(__file__)
+        ano = str(datetime.fromtimestamp(st.st_mtime).year)
+        classifier = self._regra("Antigos/{mtime.year}/{category}")
+        self.assertEqual(classifier.classify("a.pdf", stat=lambda: st), os.path.join("Antigos", ano, "Documentos"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+# tests/test_scan_cache.py
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.organizer_logic import organize_files  # noqa: E402
+from core.classifier import ExtensionClassifier  # noqa: E402
+from core.scan_cache import ScanCache  # noqa: E402
+
+
+class ReaproveitamentoDoCacheTest(unittest.TestCase):
+    """O plano em cache não pode ser reaproveitado quando a pasta "parece" inalterada mas o resultado mudaria."""
+
+    def setUp(self):
+        logging.getLogger('files_organizer_py').disabled = True
+        self.config = tempfile.mkdtemp()
+        self.pasta = tempfile.mkdtemp()
+        self.categorias = os.path.join(self.config, "categories.json")
+        with open(self.categorias, 'w', encoding='utf-8') as f:
+            json.dump({"Documentos": [".pdf"]}, f)
+        self.cache = ScanCache(os.path.join(self.config, "scan_cache.sqlite3"))
+        self.arquivo = os.path.join(self.pasta, "relatorio.pdf")
+        with open(self.arquivo, 'wb') as f:
+            f.write(b"x" * 10)
+        self._envelhece_pasta()
+
+    def tearDown(self):
+        logging.getLogger('files_organizer_py').disabled = False
+        shutil.rmtree(self.config)
+        shutil.rmtree(self.pasta)
+
+    def _envelhece_pasta(self):
+        # O cache só confia em um mtime de pasta antigo o bastante (veja MARGEM_MTIME_NS)
+        antigo = time.time() - 60
+        os.utime(self.pasta, (antigo, antigo))
+
+    def _destinos(self, **kwargs):
+        analise = organize_files(self.pasta, self.categorias, scan_cache=self.cache, **kwargs)
+        return [movimento["destino_nome_curto"] for movimento in analise["planned_moves"]]
+
+    def test_arquivo_alterado_no_lugar_com_regra_de_tamanho(self):
+        with open(os.path.join(self.config, "rules.json"), 'w', encoding='utf-8') as f:
+            json.dump({"rules": [{"min_size": 100, "destination": "Grandes"}]}, f)
+        self.assertEqual(self._destinos(), ["Documentos"])
+        mtime_pasta = os.stat(self.pasta).st_mtime_ns
+        with open(self.arquivo, 'ab') as f:
+            f.write(b"x" * 200)
+        self.assertEqual(os.stat(self.pasta).st_mtime_ns, mtime_pasta)
+        self.assertEqual(self._destinos(), ["Grandes"])
+
+    def test_tamanho_pedido_vem_do_arquivo_atual(self):
+        self._destinos(record_sizes=True)
+        with open(self.arquivo, 'ab') as f:
+            f.write(b"x" * 5)
+        analise = organize_files(self.pasta, self.categorias, scan_cache=self.cache, record_sizes=True)
+        self.assertEqual(analise["planned_moves"][0]["tamanho"], 15)
+
+    def test_pasta_inalterada_reaproveitada_com_tamanhos(self):
+        self._destinos(record_sizes=True)
+        antes = self.cache.stats()["folder_hits"]
+        analise = organize_files(self.pasta, self.categorias, scan_cache=self.cache, record_sizes=True)
+        self.assertEqual(self.cache.stats()["folder_hits"], antes + 1)
+        self.assertEqual(analise["planned_moves"][0]["tamanho"], 10)
+
+    def test_classificador_proprio_ignora_o_cache(self):
+        self.assertEqual(self._destinos(), ["Documentos"])
+        proprio = ExtensionClassifier({"PDFs": [".pdf"]})
+        self.assertEqual(self._destinos(classifier=proprio), ["PDFs"])
+
+
+if __name__ == "__main__":
+    unittest.main()
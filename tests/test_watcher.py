@@ -0,0 +1,51 @@
+# tests/test_watcher.py
+
+import os
+import sys
+import shutil
+import logging
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.watcher import FolderWatcher, InotifyEventSource, PollingEventSource  # noqa: E402
+from core.organizer_logic import CATEGORIES_CONFIG_PATH  # noqa: E402
+
+
+class PastasNaoFicamPendentesTest(unittest.TestCase):
+    """Pastas criadas na pasta observada (como as de categoria) não podem ficar pendentes para sempre."""
+
+    def setUp(self):
+        logging.getLogger('files_organizer_py').disabled = True
+        self.pasta = tempfile.mkdtemp()
+
+    def tearDown(self):
+        logging.getLogger('files_organizer_py').disabled = False
+        shutil.rmtree(self.pasta)
+
+    def test_pendente_que_virou_pasta_e_descartado(self):
+        watcher = FolderWatcher(self.pasta, CATEGORIES_CONFIG_PATH, stable_seconds=0)
+        os.mkdir(os.path.join(self.pasta, "Documentos"))
+        watcher._enqueue(["Documentos"])
+        self.assertEqual(watcher._collect_stable(), [])
+        self.assertEqual(watcher._pendentes, {})
+
+    def test_varredura_periodica_ignora_pastas(self):
+        fonte = PollingEventSource(self.pasta, interval=0)
+        os.mkdir(os.path.join(self.pasta, "Documentos"))
+        self.assertEqual(fonte.read(0), ([], [], False))
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), "inotify só existe no Linux")
+    def test_inotify_ignora_pastas(self):
+        fonte = InotifyEventSource(self.pasta)
+        self.addCleanup(fonte.close)
+        os.mkdir(os.path.join(self.pasta, "Documentos"))
+        with open(os.path.join(self.pasta, "a.txt"), 'w') as f:
+            f.write("a")
+        prontos, criados, _ = fonte.read(1.0)
+        self.assertEqual((prontos, criados), (["a.txt"], ["a.txt"]))
+
+
+if __name__ == "__main__":
+    unittest.main()